@@ -1,34 +1,93 @@
-import requests
+import codecs
 import json
+import logging
 import re
 import base64
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
 from packaging import version
-import google.generativeai as genai
 from dotenv import load_dotenv
+import requests
+
+from github_client import GITHUB_API, github_get, github_stream
+from http_client import http_get
+from llm_gateway import COMBINED_KEYS, generate, generate_combined, is_available
+from lockfiles import LOCKFILE_TYPES
+from metrics import Counter, instrumented, propagate, timed
+from registry_index import get_registry_index
+from response_cache import token_scope
+from scan_store import get_scan_store
+from ttl_cache import TTLCache
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
 
-GITHUB_API = "https://api.github.com"
-GEMINI_MODEL_ID = "gemini-2.5-flash"
+logger = logging.getLogger(__name__)
+
+REGISTRY_CONCURRENCY = int(os.getenv("REGISTRY_CONCURRENCY", "16"))
+MANIFEST_CONCURRENCY = int(os.getenv("MANIFEST_CONCURRENCY", "8"))
+MAX_MANIFESTS = int(os.getenv("MAX_MANIFESTS", "100"))
+# How long per-manifest results are reused while every manifest blob SHA is unchanged.
+DEPENDENCY_REUSE_TTL = float(os.getenv("DEPENDENCY_REUSE_TTL", "3600"))
+# Lockfiles are streamed from GitHub in chunks of this many bytes.
+BLOB_CHUNK_SIZE = 64 * 1024
+# Manifests under these directories belong to vendored code, not the project.
+MANIFEST_SKIP_DIRS = {"node_modules", "vendor", "third_party", "bower_components"}
+# Registry endpoints; point them at a local mirror to sync or analyze without the public registries.
+PYPI_URL = os.getenv("PYPI_URL", "https://pypi.org/pypi").rstrip("/")
+NPM_REGISTRY_URL = os.getenv("NPM_REGISTRY_URL", "https://registry.npmjs.org").rstrip("/")
+MAVEN_REPO_URL = os.getenv("MAVEN_REPO_URL", "https://repo1.maven.org/maven2").rstrip("/")
+REGISTRY_TIMEOUT = float(os.getenv("REGISTRY_TIMEOUT", "5"))
+
+# Latest version per (ecosystem, package), shared across every analysis in the process.
+_latest_versions = TTLCache(
+    maxsize=int(os.getenv("REGISTRY_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("REGISTRY_CACHE_TTL", "3600")),
+)
+
+REGISTRY_INDEX_LOOKUPS = Counter(
+    "blink_registry_index_lookups_total",
+    "Registry index lookups: fresh hit, refreshed, stale fallback or miss.", ["ecosystem", "result"])
 
 def _get(url, token):
     """Local GET helper for this module."""
-    headers = {"Authorization": f"token {token}"}
-    r = requests.get(url, headers=headers)
-    if r.status_code == 200:
-        return r.json()
+    status, data = github_get(url, token)
+    if status == 200:
+        return data
     else:
-        print(f"{r.status_code} → {url}")
+        logger.warning("%s → %s", status, url)
         return None
 
-def _fetch_file_content(owner, repo, path, token):
-    """Fetch dependency file (like requirements.txt) from GitHub repo."""
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/contents/{path}"
+@instrumented("github.fetch_blob")
+def _fetch_blob(owner, repo, sha, token):
+    """Fetch a file's content by blob SHA."""
+    url = f"{GITHUB_API}/repos/{owner}/{repo}/git/blobs/{sha}"
     data = _get(url, token)
     if not data or "content" not in data:
         return None
-    return base64.b64decode(data["content"]).decode("utf-8")
+    return base64.b64decode(data["content"]).decode("utf-8", errors="replace")
+
+def _blob_chunks(response):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in response.iter_content(BLOB_CHUNK_SIZE):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+@instrumented("github.stream_blob")
+def _parse_blob_stream(owner, repo, sha, token, parser):
+    """Stream a (possibly very large) blob straight into `parser`.
+    Returns the parser's result, or None when the blob could not be fetched."""
+    response = github_stream(f"{GITHUB_API}/repos/{owner}/{repo}/git/blobs/{sha}", token)
+    if response is None:
+        return None
+    try:
+        if response.status_code != 200:
+            logger.warning("%s → blob %s", response.status_code, sha)
+            return None
+        return parser(_blob_chunks(response))
+    finally:
+        response.close()
 
 def _parse_requirements(content):
     deps = {}
@@ -60,53 +119,207 @@ def _parse_package_json(content):
             cleaned_deps[pkg] = ver_match.group(0) if ver_match else "any"
         return cleaned_deps
     except json.JSONDecodeError:
-        print("Could not parse package.json, file may be malformed.")
+        logger.warning("Could not parse package.json, file may be malformed.")
         return {}
 
-def _parse_pom_xml(content):
-    deps = re.findall(
-        r"<dependency>.*?<artifactId>(.*?)</artifactId>.*?<version>(.*?)</version>.*?</dependency>",
-        content,
-        re.DOTALL
-    )
-    return {a: v for a, v in deps}
+# POM element paths (namespace stripped) holding dependency declarations.
+_POM_DEPENDENCY_PATHS = {
+    ("project", "dependencies", "dependency"): "dependencies",
+    ("project", "dependencyManagement", "dependencies", "dependency"): "managed",
+}
+_POM_PROPERTY = re.compile(r"\$\{([^}]+)\}")
+
+def _resolve_pom_properties(value, properties):
+    # A few rounds for properties defined in terms of others, without looping on cycles.
+    for _ in range(10):
+        resolved = _POM_PROPERTY.sub(lambda m: properties.get(m.group(1), m.group(0)), value)
+        if resolved == value:
+            break
+        value = resolved
+    return value
+
+def _parse_pom_xml(chunks):
+    """Direct dependencies as {"groupId:artifactId": version}, parsed incrementally
+    from an iterable of text chunks (a plain string is a single chunk).
+    ${property} versions are resolved from <properties> and the project/parent
+    coordinates, missing versions from <dependencyManagement>. Versions defined
+    only in a parent POM or BOM, and version ranges, are reported as "any"."""
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    path = []
+    properties = {}
+    found = {"dependencies": [], "managed": []}
+    current = None
+    try:
+        for chunk in [chunks] if isinstance(chunks, str) else chunks:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                tag = elem.tag.rsplit("}", 1)[-1]
+                if event == "start":
+                    path.append(tag)
+                    if tuple(path) in _POM_DEPENDENCY_PATHS:
+                        current = {}
+                    continue
+                text = (elem.text or "").strip()
+                if tuple(path) in _POM_DEPENDENCY_PATHS:
+                    found[_POM_DEPENDENCY_PATHS[tuple(path)]].append(current)
+                    current = None
+                elif current is not None and tuple(path[:-1]) in _POM_DEPENDENCY_PATHS:
+                    current[tag] = text
+                elif len(path) == 3 and path[1] == "properties":
+                    properties[tag] = text
+                elif len(path) == 2 and tag in ("groupId", "artifactId", "version"):
+                    properties[f"project.{tag}"] = text
+                elif len(path) == 3 and path[1] == "parent" and tag in ("groupId", "artifactId", "version"):
+                    properties[f"project.parent.{tag}"] = text
+                path.pop()
+                elem.clear()
+        parser.close()
+    except ElementTree.ParseError as e:
+        logger.warning("Could not parse pom.xml (%s), file may be malformed.", e)
+        return {}
 
-def _check_latest_pypi(pkg_name):
-    url = f"https://pypi.org/pypi/{pkg_name}/json"
-    r = requests.get(url)
-    if r.status_code == 200:
-        return r.json()["info"]["version"]
-    return None
+    # A module inherits its coordinates from <parent> unless it overrides them.
+    for key in ("groupId", "version"):
+        if f"project.parent.{key}" in properties:
+            properties.setdefault(f"project.{key}", properties[f"project.parent.{key}"])
+    properties.setdefault("version", properties.get("project.version", "${version}"))
 
-def _check_latest_npm(pkg_name):
-    url = f"https://registry.npmjs.org/{pkg_name}/latest"
-    r = requests.get(url)
-    if r.status_code == 200:
-        return r.json()["version"]
-    return None
+    def coordinates(dep):
+        group = _resolve_pom_properties(dep.get("groupId", ""), properties)
+        return f"{group}:{dep.get('artifactId', '')}"
 
+    managed = {coordinates(dep): dep.get("version") for dep in found["managed"] if dep.get("version")}
+    deps = {}
+    for dep in found["dependencies"]:
+        key = coordinates(dep)
+        ver = _resolve_pom_properties(dep.get("version") or managed.get(key) or "", properties)
+        deps[key] = "any" if not ver or "${" in ver or ver[0] in "[(" else ver
+    return deps
 
-def _summarize_dependencies_gemini(deps):
-    """Summarize dependency health using Google Gemini API."""
-    
-    GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
-    if not GEMINI_API_KEY:
-        print("GOOGLE_API_KEY not found in .env. Skipping AI summary.")
+@instrumented("registry.pypi")
+def _check_latest_pypi(pkg_name):
+    url = f"{PYPI_URL}/{pkg_name}/json"
+    r = http_get(url, timeout=REGISTRY_TIMEOUT)
+    if r.status_code == 404:
         return None
+    r.raise_for_status()
+    return r.json()["info"]["version"]
 
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-    except Exception as e:
-        print(f"Failed to configure Gemini: {e}")
+@instrumented("registry.npm")
+def _check_latest_npm(pkg_name):
+    url = f"{NPM_REGISTRY_URL}/{pkg_name}/latest"
+    r = http_get(url, timeout=REGISTRY_TIMEOUT)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return r.json()["version"]
+
+@instrumented("registry.maven")
+def _check_latest_maven(pkg_name):
+    """Latest release of "groupId:artifactId" from the repository's maven-metadata.xml."""
+    group, _, artifact = pkg_name.partition(":")
+    url = f"{MAVEN_REPO_URL}/{group.replace('.', '/')}/{artifact}/maven-metadata.xml"
+    r = http_get(url, timeout=REGISTRY_TIMEOUT)
+    if r.status_code == 404:
         return None
+    r.raise_for_status()
+    versioning = ElementTree.fromstring(r.content).find("versioning")
+    if versioning is None:
+        return None
+    if versioning.findtext("release"):
+        return versioning.findtext("release")
+    versions = [v.text for v in versioning.iter("version") if v.text and not v.text.endswith("-SNAPSHOT")]
+    return max(versions, key=_maven_version_key) if versions else None
+
+LATEST_VERSION_FETCHERS = {
+    "pypi": _check_latest_pypi,
+    "npm": _check_latest_npm,
+    "maven": _check_latest_maven,
+}
+
+# Maven qualifier order; unknown qualifiers sort after the release, by name.
+_MAVEN_QUALIFIERS = {"alpha": 0, "a": 0, "beta": 1, "b": 1, "milestone": 2, "m": 2, "rc": 3, "cr": 3,
+                     "snapshot": 4, "ga": 5, "final": 5, "release": 5, "sp": 6}
+_MAVEN_RELEASE = (1, 5, "")
+
+def _maven_version_key(value):
+    """Sort key approximating Maven's ComparableVersion ("5.3.20.RELEASE", "31.1-jre",
+    "2.0-rc1" are not PEP 440 versions)."""
+    items = []
+    for token in re.findall(r"\d+|[a-z]+", value.lower()):
+        if token.isdigit():
+            items.append((2, int(token), ""))
+        elif token in _MAVEN_QUALIFIERS:
+            items.append((1, _MAVEN_QUALIFIERS[token], ""))
+        else:
+            items.append((1, 7, token))
+        # Zeros before a qualifier or the end do not count: 1.0-rc1 == 1-rc1, 1.0.0 == 1.
+        if items[-1][0] == 1:
+            qualifier = items.pop()
+            while items and items[-1] == (2, 0, ""):
+                items.pop()
+            items.append(qualifier)
+    while items and items[-1] in ((2, 0, ""), _MAVEN_RELEASE):
+        items.pop()
+    return items + [_MAVEN_RELEASE] * max(0, 16 - len(items))
+
+def _is_newer(ecosystem, latest, current):
+    if ecosystem == "maven":
+        return _maven_version_key(latest) > _maven_version_key(current)
+    return version.parse(latest) > version.parse(current)
+
+def _indexed_latest_version(ecosystem, pkg_name):
+    """Latest version from the local registry index, going to the registry only for
+    missing or stale entries. A stale entry is served when the registry is unreachable."""
+    index = get_registry_index()
+    entry = index.get(ecosystem, pkg_name) if index else None
+    if entry and index.is_fresh(entry[1]):
+        REGISTRY_INDEX_LOOKUPS.inc(ecosystem, "fresh")
+        return entry[0]
+    try:
+        latest = LATEST_VERSION_FETCHERS[ecosystem](pkg_name)
+    except Exception:
+        if entry:
+            REGISTRY_INDEX_LOOKUPS.inc(ecosystem, "stale")
+            return entry[0]
+        raise
+    REGISTRY_INDEX_LOOKUPS.inc(ecosystem, "refreshed" if entry else "miss")
+    if index:
+        index.put(ecosystem, pkg_name, latest)
+    return latest
+
+def _latest_version(ecosystem, pkg_name):
+    """Cached latest-version lookup for a package in the given ecosystem."""
+    with timed("registry.lookup"):
+        return _latest_versions.get_or_set(
+            (ecosystem, pkg_name), lambda: _indexed_latest_version(ecosystem, pkg_name))
+
+def _check_dependency(ecosystem, pkg, ver):
+    latest = None
+    outdated = False
+    if ecosystem in LATEST_VERSION_FETCHERS and ver != "any":
+        try:
+            latest = _latest_version(ecosystem, pkg)
+            if latest and _is_newer(ecosystem, latest, ver):
+                outdated = True
+        except Exception:
+            latest = "N/A" # Handle parsing errors
+
+    return {
+        "current_version": ver,
+        "latest_version": latest,
+        "outdated": outdated
+    }
+
 
+def _dependency_prompt(deps):
     dep_list = "\n".join(
         f"- {pkg}: {info['current_version']} (latest: {info.get('latest_version', 'N/A')}) "
         f"{'Outdated' if info['outdated'] else 'Up-to-date'}"
         for pkg, info in deps.items()
     )
 
-    prompt = f"""
+    return f"""
 You are a professional software dependency auditor.
 Analyze this dependency list from a GitHub project and provide:
 1.  A one-sentence summary of the key frameworks and their purpose (e.g., "This is a Python web app using Flask and SQLAlchemy...").
@@ -117,109 +330,206 @@ Dependencies:
 {dep_list}
 """
 
-    print("\nSummarizing dependencies with Google Gemini...")
+def summarize_dependencies_ai(deps):
+    """Summarize dependency health using Google Gemini API."""
+    
+    if not is_available():
+        logger.warning("GOOGLE_API_KEY not found in .env. Skipping AI summary.")
+        return None
+
+    prompt = _dependency_prompt(deps)
+
+    logger.info("Summarizing dependencies with Google Gemini...")
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL_ID)
-        response = model.generate_content(prompt)
-        summary = response.text
+        summary = generate(prompt)
 
-        print("AI Dependency Summary received.")
+        logger.info("AI Dependency Summary received.")
         return summary
 
     except Exception as e:
-        print(f" Gemini API Error: {e}")
+        logger.error("Gemini API Error: %s", e)
         return None
 
-def analyze_dependencies(owner, repo, token):
+MANIFEST_TYPES = {
+    "requirements.txt": (_parse_requirements, "pypi"),
+    "package.json": (_parse_package_json, "npm"),
+    "pom.xml": (_parse_pom_xml, "maven"),
+}
+# Manifests whose parser takes an iterable of text chunks, streamed like lockfiles.
+STREAMED_MANIFESTS = {"pom.xml"}
+
+@instrumented("github.fetch_tree")
+def _find_manifests(owner, repo, token, ref="HEAD"):
+    """List supported manifests anywhere in the repo with one recursive tree call,
+    shallowest first. Returns (entries, truncated), truncated when GitHub cut the
+    tree listing short or more than MAX_MANIFESTS were found."""
+    data = _get(f"{GITHUB_API}/repos/{owner}/{repo}/git/trees/{ref}?recursive=1", token)
+    if not data:
+        return [], False
+    truncated = bool(data.get("truncated"))
+    if truncated:
+        logger.warning("(Tree listing was truncated by GitHub; some manifests may be missed.)")
+
+    manifests = []
+    for entry in data.get("tree", []):
+        parts = entry["path"].split("/")
+        if entry.get("type") == "blob" and (parts[-1] in MANIFEST_TYPES or parts[-1] in LOCKFILE_TYPES) \
+                and not MANIFEST_SKIP_DIRS.intersection(parts[:-1]):
+            manifests.append(entry)
+    manifests.sort(key=lambda e: (e["path"].count("/"), e["path"]))
+    if len(manifests) > MAX_MANIFESTS:
+        logger.warning("%s/%s has %d dependency files; only the %d shallowest are analyzed (MAX_MANIFESTS).",
+                       owner, repo, len(manifests), MAX_MANIFESTS)
+        truncated = True
+    return manifests[:MAX_MANIFESTS], truncated
+
+def _read_lockfile(owner, repo, entry, token):
+    """Lockfiles report their top-level packages under "dependencies" and the
+    size of the deduplicated graph under "graph". Every locked (package,
+    version) is kept under "locked" until analyze_manifests has checked it."""
+    parser, ecosystem = LOCKFILE_TYPES[entry["path"].rsplit("/", 1)[-1]]
+    manifest = {"ecosystem": ecosystem, "sha": entry["sha"], "dependencies": {}}
+    try:
+        graph = _parse_blob_stream(owner, repo, entry["sha"], token, parser)
+    except (ValueError, requests.RequestException) as e:
+        manifest["error"] = f"Could not parse lockfile: {e}"
+        return manifest
+    if graph is None:
+        manifest["error"] = "Could not fetch file"
+        return manifest
+    manifest["dependencies"] = graph.top_level_versions()
+    manifest["graph"] = graph.summary()
+    manifest["locked"] = graph.nodes
+    if not graph.nodes:
+        manifest["error"] = "Could not parse any dependencies from file"
+    return manifest
+
+def _read_manifest(owner, repo, entry, token):
+    name = entry["path"].rsplit("/", 1)[-1]
+    if name in LOCKFILE_TYPES:
+        return _read_lockfile(owner, repo, entry, token)
+    parser, ecosystem = MANIFEST_TYPES[name]
+    manifest = {"ecosystem": ecosystem, "sha": entry["sha"], "dependencies": {}}
+    if name in STREAMED_MANIFESTS:
+        try:
+            deps = _parse_blob_stream(owner, repo, entry["sha"], token, parser)
+        except requests.RequestException as e:
+            manifest["error"] = f"Could not fetch file: {e}"
+            return manifest
+    else:
+        content = _fetch_blob(owner, repo, entry["sha"], token)
+        deps = parser(content) if content is not None else None
+    if deps is None:
+        manifest["error"] = "Could not fetch file"
+        return manifest
+    manifest["dependencies"] = deps or {}
+    if not manifest["dependencies"]:
+        manifest["error"] = "Could not parse any dependencies from file"
+    return manifest
+
+def scan_manifests(owner, repo, token):
+    """
+    Find every supported manifest in the repo, fetch them concurrently and
+    check each declared version against its registry.
+    Returns {"manifests": {path: {"ecosystem", "sha", "dependencies", "outdated_count"[, "error"]}},
+    "truncated": bool}; lockfiles add "graph" (package, edge and direct counts) and
+    "transitive_outdated" (every locked package is checked). "truncated" is set
+    when not every manifest could be listed or analyzed (see _find_manifests).
+    """
+    logger.info("Analyzing dependencies for %s/%s", owner, repo)
+
+    entries, truncated = _find_manifests(owner, repo, token)
+    if not entries:
+        logger.info("(No supported dependency file found. Skipping dep analysis.)")
+        return {"manifests": {}, "truncated": truncated}
+    logger.info("Found %d dependency file(s): %s", len(entries), ", ".join(e["path"] for e in entries))
+
+    store = get_scan_store()
+    store_key = f"{owner.lower()}/{repo.lower()}|{token_scope(token)}"
+    shas = {e["path"]: e["sha"] for e in entries}
+    stored = store.get("manifests", store_key) if store else None
+    if stored and stored[0]["shas"] == shas and time.time() - stored[1] < DEPENDENCY_REUSE_TTL:
+        logger.info("(Dependency files unchanged since the last analysis; reusing results.)")
+        return {"manifests": stored[0]["manifests"], "truncated": truncated}
+
+    with ThreadPoolExecutor(max_workers=MANIFEST_CONCURRENCY, thread_name_prefix="manifest") as pool:
+        manifests = dict(zip(
+            (e["path"] for e in entries),
+            pool.map(propagate(lambda e: _read_manifest(owner, repo, e, token)), entries)))
+
+    # Each (ecosystem, package, version) is checked once, however many manifests
+    # (or lockfiles lock) it.
+    unique = list(dict.fromkeys(
+        [(m["ecosystem"], pkg, ver) for m in manifests.values() for pkg, ver in m["dependencies"].items()]
+        + [(m["ecosystem"], pkg, ver) for m in manifests.values() for pkg, ver in m.get("locked", ())]))
+    logger.info("...found %d unique dependencies.", len(unique))
+    with ThreadPoolExecutor(max_workers=REGISTRY_CONCURRENCY, thread_name_prefix="registry") as pool:
+        checks = dict(zip(unique, pool.map(propagate(lambda dep: _check_dependency(*dep)), unique)))
+
+    for m in manifests.values():
+        m["dependencies"] = {pkg: checks[(m["ecosystem"], pkg, ver)] for pkg, ver in m["dependencies"].items()}
+        m["outdated_count"] = sum(1 for d in m["dependencies"].values() if d["outdated"])
+        if "locked" in m:
+            m["transitive_outdated"] = [
+                [pkg, ver, checks[(m["ecosystem"], pkg, ver)]["latest_version"]]
+                for pkg, ver in m.pop("locked") if checks[(m["ecosystem"], pkg, ver)]["outdated"]]
+
+    if store and not any(m.get("error") == "Could not fetch file" for m in manifests.values()):
+        store.put("manifests", store_key, {"shas": shas, "manifests": manifests})
+    return {"manifests": manifests, "truncated": truncated}
+
+def analyze_manifests(owner, repo, token):
+    """The per-file results of scan_manifests: {path: {...}}."""
+    return scan_manifests(owner, repo, token)["manifests"]
+
+def flatten_dependencies(manifests):
+    """Merge per-manifest results into one {package: info} view.
+    When several manifests of an ecosystem declare a package, the shallowest
+    one wins. A name already taken by another ecosystem (PyPI and npm
+    `requests`) is keyed "ecosystem:package" instead."""
+    results = {}
+    owners = {}
+    for manifest in (manifests or {}).values():
+        ecosystem = manifest["ecosystem"]
+        for pkg, info in manifest["dependencies"].items():
+            key = pkg if owners.setdefault(pkg, ecosystem) == ecosystem else f"{ecosystem}:{pkg}"
+            results.setdefault(key, info)
+    return results or None
+
+def analyze_dependencies(owner, repo, token, summarize=True):
     """
     Public function to run the full dependency analysis.
     This is called by health_index.py.
+    With summarize=False the Gemini summary and the JSON dump are skipped,
+    so callers can run summarize_dependencies_ai as a separate step.
     """
-    print(f"\nAnalyzing dependencies for {owner}/{repo}")
-
-    files_to_check = {
-        "requirements.txt": (_parse_requirements, _check_latest_pypi),
-        "package.json": (_parse_package_json, _check_latest_npm),
-        "pom.xml": (_parse_pom_xml, None), # Maven check is complex, skip for now
-    }
-    
-    found_file = None
-    content = None
-    parser = None
-    latest_fetcher = None
-
-    for f, (parser_func, fetcher_func) in files_to_check.items():
-        content = _fetch_file_content(owner, repo, f, token)
-        if content:
-            found_file = f
-            parser = parser_func
-            latest_fetcher = fetcher_func
-            print(f"Found and parsing {f}...")
-            break
-
-    if not found_file:
-        print("   (No supported dependency file found. Skipping dep analysis.)")
+    scanned = scan_manifests(owner, repo, token)
+    results = flatten_dependencies(scanned["manifests"])
+    if not results:
+        logger.info("(Could not parse any dependencies from file.)")
         return None, None
 
-    deps = parser(content)
-    if not deps:
-        print("   (Could not parse any dependencies from file.)")
-        return None, None
-        
-    print(f"   ...found {len(deps)} dependencies.")
-    results = {}
-
-    for pkg, ver in deps.items():
-        latest = None
-        outdated = False
-        if latest_fetcher and ver != "any":
-            try:
-                latest = latest_fetcher(pkg)
-                if latest and version.parse(latest) > version.parse(ver):
-                    outdated = True
-            except Exception:
-                latest = "N/A" # Handle parsing errors
-
-        results[pkg] = {
-            "current_version": ver,
-            "latest_version": latest,
-            "outdated": outdated
-        }
-
     outdated_count = sum(1 for d in results.values() if d["outdated"])
-    print(f"   ...{outdated_count} dependencies are outdated.")
+    logger.info("...%d dependencies are outdated.", outdated_count)
 
-    ai_summary = _summarize_dependencies_gemini(results)
+    if not summarize:
+        return None, results
+
+    ai_summary = summarize_dependencies_ai(results)
 
     filename = f"{owner}_{repo}_dependencies.json"
     with open(filename, "w") as f:
-        json.dump({"summary": ai_summary, "dependencies": results}, f, indent=4)
-    print(f"Dependency analysis saved to {filename}")
+        json.dump({"summary": ai_summary, "dependencies": results, **scanned}, f, indent=4)
+    logger.info("Dependency analysis saved to %s", filename)
 
     return ai_summary, results
 
-def summarize_tech_stack_ai(contents):
-    import google.generativeai as genai
-    import os
-
-    GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
-    if not GEMINI_API_KEY:
-        print("❌ GOOGLE_API_KEY not found. Skipping AI tech stack summary.")
-        return None
-
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-    except Exception as e:
-        print(f"❌ Gemini config failed: {e}")
-        return None
-
+def _tech_stack_prompt(contents):
     file_list = "\n".join([item["name"] for item in contents])
     if not file_list:
-        print("❌ No files found in contents for AI analysis.")
         return None
 
-    prompt = f"""
+    return f"""
         You are a senior software architect.
         Analyze this list of files from a GitHub repository and infer what technologies, frameworks, and deployment patterns are used.
         Summarize the tech stack in a short, clear paragraph.
@@ -228,12 +538,47 @@ def summarize_tech_stack_ai(contents):
         {file_list}
         """
 
+def summarize_tech_stack_ai(contents):
+    if not is_available():
+        logger.warning("❌ GOOGLE_API_KEY not found. Skipping AI tech stack summary.")
+        return None
+
+    prompt = _tech_stack_prompt(contents)
+    if not prompt:
+        logger.info("❌ No files found in contents for AI analysis.")
+        return None
+
     try:
-        print("🧠 Calling Gemini for tech stack summary...")
-        response = model.generate_content(prompt)
-        print("✅ AI Tech Stack Summary received.")
-        print(f"🔹 Gemini Output Preview:\n{response.text[:200]}...")
-        return response.text.strip()
+        logger.info("🧠 Calling Gemini for tech stack summary...")
+        text = generate(prompt)
+        logger.info("✅ AI Tech Stack Summary received.")
+        logger.debug("🔹 Gemini Output Preview:\n%.200s...", text)
+        return text.strip()
     except Exception as e:
-        print(f"❌ Gemini AI Error: {e}")
+        logger.error("❌ Gemini AI Error: %s", e)
         return None
+
+def summarize_combined_ai(deps, contents):
+    """Dependency audit and tech-stack summary from a single structured Gemini call.
+    Returns a dict with the COMBINED_KEYS; a section without input is None."""
+    summaries = dict.fromkeys(COMBINED_KEYS)
+    if not is_available():
+        logger.warning("GOOGLE_API_KEY not found. Skipping AI summaries.")
+        return summaries
+
+    prompts = {}
+    if deps:
+        prompts["dependency_summary"] = _dependency_prompt(deps)
+    tech_prompt = _tech_stack_prompt(contents or [])
+    if tech_prompt:
+        prompts["tech_stack_summary"] = tech_prompt
+    if not prompts:
+        return summaries
+
+    try:
+        logger.info("🧠 Calling Gemini for combined summaries...")
+        summaries.update(generate_combined(prompts))
+        logger.info("✅ AI summaries received.")
+    except Exception as e:
+        logger.error("❌ Gemini AI Error (combined): %s", e)
+    return summaries
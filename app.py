@@ -1,57 +1,106 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import google.generativeai as genai
 
 from dotenv import load_dotenv
-from repo_explorer import deep_scan_repo
-from health_index import calculate_health_index
-from ai_summarizer import analyze_dependencies, summarize_tech_stack_ai
+from batch import batch_bp
+from jobs import jobs_bp, submit_analysis_job
+from ops import ops_bp
+from pipeline import run_analysis_profiled
+from report_cache import cached_analysis
+from response_shaping import json_response, shape_from_request
+from streaming import stream_analysis
+from repo_explorer import SCAN_BACKENDS
+import logging
 import os
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+# Comma-separated list of origins allowed to call the API, or "*".
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
 
-CORS(app, resources={r"/*": {"origins": ["http://localhost:5173", "http://localhost:5174"]}}, supports_credentials=True)
 
-@app.after_request
-def after_request(response):
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-    response.headers.add('Access-Control-Allow-Methods', 'GET,POST,OPTIONS')
-    return response
-
-@app.route('/analyze', methods=['POST'])
 def analyze_repo():
-    data = request.get_json()
-    owner = data.get('owner')
-    repo = data.get('repo')
-    token = data.get('token')
+    """
+    API endpoint to analyze a GitHub repository.
+    Expects JSON: { "owner": "...", "repo": "...", "token": "..." }
+    Optional: "scan_backend": "rest" | "graphql"
+    With ?async=1 the analysis is queued and a job id is returned (202);
+    with ?stream=1 report sections are streamed as Server-Sent Events;
+    with ?profile=1 the response carries a per-stage timing breakdown.
+    Finished reports are cached per repository (see report_cache.py); the
+    X-Cache header says HIT, STALE (refreshing in the background) or MISS,
+    and ?refresh=1 bypasses the cache.
+    ?fields=health_report,dependency_report.dependencies keeps only the listed
+    (dotted) sections and ?compact=1 drops raw_data; the response is gzip or
+    brotli compressed when the client accepts it.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object: { "owner", "repo", "token" }'}), 400
+        owner = data.get('owner')
+        repo = data.get('repo')
+        token = data.get('token')
+        backend = data.get('scan_backend')
+
+        if not all(isinstance(value, str) and value for value in (owner, repo, token)):
+            return jsonify({'error': 'Missing required fields: owner, repo, token'}), 400
+        if backend and backend not in SCAN_BACKENDS:
+            return jsonify({'error': f"scan_backend must be one of {', '.join(SCAN_BACKENDS)}"}), 400
+
+        if request.args.get('async') == '1':
+            return submit_analysis_job(owner, repo, token, backend)
+        if request.args.get('stream') == '1':
+            return stream_analysis(owner, repo, token, backend, refresh=request.args.get('refresh') == '1')
+
+        logger.info("Analyzing %s/%s...", owner, repo)
+        cache_status, age = None, None
+        if request.args.get('profile') == '1':
+            report = run_analysis_profiled(owner, repo, token, backend)
+        else:
+            report, cache_status, age = cached_analysis(
+                owner, repo, token, backend, refresh=request.args.get('refresh') == '1')
+        if not report['raw_data']:
+            return jsonify({'error': 'Repository scan failed', 'stages': report['stages']}), 500
+        if not report['health_report']:
+            return jsonify({'error': 'Failed to calculate health index', 'stages': report['stages']}), 500
+
+        logger.info("All analysis complete. Returning JSON.")
+        response = json_response(shape_from_request(report))
+        if cache_status:
+            response.headers['X-Cache'] = cache_status.upper()
+            response.headers['Age'] = str(int(age))
+        return response
+
+    except Exception as e:
+        logger.exception("Error: %s", e)
+        return jsonify({'error': str(e)}), 500
 
-    if not owner or not repo or not token:
-        return jsonify({"error": "Missing required parameters"}), 400
 
-    print(f"Analyzing {owner}/{repo}...")
+def health_check():
+    """Simple health check endpoint"""
+    return jsonify({'status': 'ok'}), 200
 
-    general_results = deep_scan_repo(owner, repo, token)
-    if not general_results:
-        return jsonify({"error": "Repository scan failed"}), 500
 
-    report_data = calculate_health_index(general_results)
-    ai_summary, dependencies = analyze_dependencies(owner, repo, token)
-    ai_stack_summary = summarize_tech_stack_ai(general_results.get("contents", []))
+def create_app():
+    """Build the analyzer API. Used by the dev servers below and by gunicorn
+    (see gunicorn.conf.py) in production."""
+    app = Flask(__name__)
+    origins = "*" if CORS_ORIGINS.strip() == "*" else [o.strip() for o in CORS_ORIGINS.split(",") if o.strip()]
+    CORS(app, resources={r"/*": {"origins": origins}},
+         allow_headers=["Content-Type", "Authorization"], methods=["GET", "POST", "DELETE", "OPTIONS"],
+         expose_headers=["X-Cache", "Age"])
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(ops_bp)
+    app.add_url_rule('/analyze', view_func=analyze_repo, methods=['POST'])
+    app.add_url_rule('/health', view_func=health_check, methods=['GET'])
+    return app
 
-    print("All analysis complete. Returning JSON.")
 
-    return jsonify({
-        "health_report": report_data,
-        "dependency_report": {
-            "ai_summary": ai_summary,
-            "dependencies": dependencies
-        },
-        "tech_stack_summary": ai_stack_summary,
-        "raw_data": general_results
-    })
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
+    app.run(host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,87 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from pipeline import run_health_check
+from repo_explorer import SCAN_BACKENDS
+from response_shaping import dumps, shape
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_REPOS = int(os.getenv("BATCH_MAX_REPOS", "500"))
+
+# Shared by every batch request, so BATCH_CONCURRENCY is a global cap.
+_pool = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="batch")
+
+batch_bp = Blueprint("batch", __name__)
+
+
+def _parse_repo(item):
+    """Accept "owner/repo" or {"owner": ..., "repo": ...}."""
+    if isinstance(item, str) and item.count("/") == 1:
+        owner, repo = item.split("/")
+    elif isinstance(item, dict):
+        owner, repo = item.get("owner"), item.get("repo")
+    else:
+        return None
+    if not isinstance(owner, str) or not isinstance(repo, str):
+        return None
+    owner, repo = owner.strip(), repo.strip()
+    return (owner, repo) if owner and repo else None
+
+def _analyze_one(owner, repo, token, backend):
+    try:
+        result = run_health_check(owner, repo, token, backend)
+    except Exception as e:
+        return {"repo": f"{owner}/{repo}", "error": str(e)}
+    result["repo"] = f"{owner}/{repo}"
+    if not result["health_report"]:
+        scan = result["stages"].get("scan", {})
+        result["error"] = scan.get("error") or "Failed to calculate health index"
+    else:
+        result["error"] = None
+    return result
+
+@batch_bp.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many repositories; results stream back as NDJSON, one line per
+    repo in completion order, with per-item errors.
+    Expects JSON: { "repos": ["owner/repo", ...], "token": "..." }
+    ?fields= projects every line the same way as /analyze.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": 'Expected a JSON object: { "repos", "token" }'}), 400
+    repos = data.get('repos')
+    token = data.get('token')
+    backend = data.get('scan_backend')
+
+    if not isinstance(repos, list) or not repos or not isinstance(token, str) or not token:
+        return jsonify({"error": "Missing required parameters: repos (list), token"}), 400
+    if len(repos) > BATCH_MAX_REPOS:
+        return jsonify({"error": f"At most {BATCH_MAX_REPOS} repos per batch"}), 400
+    if backend and backend not in SCAN_BACKENDS:
+        return jsonify({"error": f"scan_backend must be one of {', '.join(SCAN_BACKENDS)}"}), 400
+
+    # Every line keeps its repo and error whatever the projection.
+    fields = request.args.get("fields")
+    fields = f"{fields},repo,error" if fields else None
+
+    def generate():
+        futures = []
+        try:
+            for item in repos:
+                parsed = _parse_repo(item)
+                if not parsed:
+                    yield dumps({"repo": item, "error": "Expected 'owner/repo'"}) + b"\n"
+                    continue
+                futures.append(_pool.submit(_analyze_one, *parsed, token, backend))
+            for future in as_completed(futures):
+                yield dumps(shape(future.result(), fields)) + b"\n"
+        finally:
+            # Client went away: don't keep scanning repos nobody will read.
+            for future in futures:
+                future.cancel()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
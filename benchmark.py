@@ -0,0 +1,513 @@
+"""End-to-end benchmark against local stand-ins for GitHub, PyPI/npm/Maven and Gemini.
+
+    python benchmark.py                                   # all scenarios at 1,4,16
+    python benchmark.py --scenarios analyze --concurrency 8 --requests 100
+    python benchmark.py --github-latency-ms 80 --error-rate 0.02
+    python benchmark.py --save-baseline bench.json        # record a baseline
+    python benchmark.py --baseline bench.json             # exit 1 on regression
+
+Every request targets a different repository, so scan and dependency caches
+start cold per request while the registry caches warm up across the run, as
+in production. Tuning variables (SCAN_CONCURRENCY, REGISTRY_CONCURRENCY, ...)
+are read from the environment as usual; the stub endpoints and cache paths
+are filled in only when not already set.
+"""
+import argparse
+import base64
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode
+
+SCENARIOS = ("scan", "dependencies", "analyze")
+TOKEN = "bench-token"
+
+
+class StubConfig:
+    def __init__(self, github_latency=0.02, registry_latency=0.03, llm_latency=0.5,
+                 error_rate=0.0, deps=20, package_pool=200, seed=1):
+        self.github_latency = github_latency
+        self.registry_latency = registry_latency
+        self.llm_latency = llm_latency
+        self.error_rate = error_rate
+        self.deps = deps
+        self.package_pool = package_pool
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def count(self, service):
+        with self.lock:
+            self.calls[service] = self.calls.get(service, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.calls)
+
+    def delay(self, latency):
+        """Latency with +/-50% uniform jitter; True if this call should fail."""
+        with self.lock:
+            jitter = self.random.uniform(0.5, 1.5)
+            fail = self.random.random() < self.error_rate
+        if latency:
+            time.sleep(latency * jitter)
+        return fail
+
+    def packages(self, repo, ecosystem):
+        """Deterministic dependency set of a repository."""
+        rng = random.Random(zlib.crc32(f"{self.seed}:{repo}:{ecosystem}".encode()))
+        picks = rng.sample(range(self.package_pool), min(self.deps, self.package_pool))
+        return {f"{ecosystem}-pkg-{i}": f"1.{rng.randint(0, 9)}.0" for i in picks}
+
+
+# Repositories named "paged-*" spread these listings over STUB_PAGES pages with
+# Link headers; in "paged-broken-*" ones page 2 fails with a (not retried) 422.
+PAGED_LISTINGS = ("commits", "contributors", "issues", "releases")
+STUB_PAGES = 3
+STUB_EPOCH = 1767225600  # 2026-01-01T00:00:00Z, the latest commit
+
+
+def _github_routes(config, owner, repo, rest, page=1):
+    """The REST body for `rest` under /repos/owner/repo, or None for a 404.
+    List endpoints serve `page` of their items (see PAGED_LISTINGS)."""
+    full_name = f"{owner}/{repo}"
+    first = (page - 1) * 5
+    if rest == "":
+        return {"full_name": full_name, "name": repo, "description": "Benchmark repository",
+                "default_branch": "main", "private": repo.startswith("private-"), "has_issues": True, "stargazers_count": 1200,
+                "forks_count": 150, "open_issues_count": 12, "license": {"key": "mit", "name": "MIT"},
+                "pushed_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-01T00:00:00Z",
+                "created_at": "2020-01-01T00:00:00Z", "language": "Python"}
+    if rest == "commits":
+        # One week per page, newest first.
+        date = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(STUB_EPOCH - (page - 1) * 7 * 86400))
+        return [{"sha": f"{zlib.crc32(full_name.encode()):08x}{i}", "author": {"login": f"dev{i % 3}"},
+                 "commit": {"message": f"Commit {i}", "author": {"name": "dev", "date": date}}}
+                for i in range(first, first + 5)]
+    if rest == "contributors":
+        return [{"login": f"dev{i}", "contributions": 100 - i} for i in range(first, first + 5)]
+    if rest in ("issues", "pulls"):
+        return [{"number": i, "title": f"Item {i}", "state": "open", "user": {"login": "dev"},
+                 "created_at": "2025-12-01T00:00:00Z"} for i in range(first, first + 5)]
+    if rest == "releases":
+        return [{"name": f"v1.{i}", "tag_name": f"v1.{i}", "published_at": "2025-12-01T00:00:00Z"}
+                for i in range(first, first + 3)]
+    if rest == "branches":
+        return [{"name": name} for name in ("main", "dev")]
+    if rest == "community/profile":
+        files = {name: {"url": f"https://api.github.com/repos/{full_name}/{name}",
+                        "html_url": f"https://github.com/{full_name}/{name}"}
+                 for name in ("readme", "license", "contributing")}
+        return {"health_percentage": 80, "files": dict(files, code_of_conduct=None)}
+    if rest == "contents":
+        return [{"name": name, "type": "file"} for name in ("README.md", "requirements.txt", "package.json")]
+    if rest.startswith("git/ref/heads/"):
+        return {"object": {"sha": f"{zlib.crc32(full_name.encode()):08x}0"}}
+    if rest.startswith("git/trees/"):
+        return {"truncated": False, "tree": [
+            {"path": "requirements.txt", "type": "blob", "sha": "pypi"},
+            {"path": "package.json", "type": "blob", "sha": "npm"},
+            {"path": "pom.xml", "type": "blob", "sha": "maven"},
+        ]}
+    if rest.startswith("git/blobs/"):
+        ecosystem = rest.rsplit("/", 1)[-1]
+        deps = config.packages(full_name, ecosystem)
+        if ecosystem == "pypi":
+            text = "\n".join(f"{pkg}=={ver}" for pkg, ver in deps.items())
+        elif ecosystem == "maven":
+            text = _pom(deps)
+        else:
+            text = json.dumps({"dependencies": {pkg: f"^{ver}" for pkg, ver in deps.items()}})
+        return {"encoding": "base64", "content": base64.b64encode(text.encode()).decode()}
+    return None
+
+
+def _graphql_repository(config, owner, repo, variables):
+    """The GraphQL repository node for the same data _github_routes serves.
+    Repositories named "empty-*" have no default branch (no commits yet), and
+    the oldest open issue's author is a deleted account (null)."""
+    rest = lambda path: _github_routes(config, owner, repo, path)
+    metadata = rest("")
+    if repo.startswith("empty-"):
+        branch = None
+        entries = []
+    else:
+        branch = {"name": metadata["default_branch"], "target": {"history": {"nodes": [
+            {"oid": c["sha"], "message": c["commit"]["message"], "author": {"date": c["commit"]["author"]["date"]}}
+            for c in rest("commits")[:variables["commits"]]]}}}
+        entries = [{"name": item["name"], "type": "blob"} for item in rest("contents")]
+
+    def items(path):
+        nodes = [{"title": i["title"], "number": i["number"], "createdAt": i["created_at"],
+                  "author": {"login": i["user"]["login"]}} for i in rest(path)[:variables["items"]]]
+        if nodes:
+            nodes[-1]["author"] = None
+        return {"totalCount": len(rest(path)), "nodes": nodes}
+
+    return {
+        "databaseId": zlib.crc32(f"{owner}/{repo}".encode()),
+        "name": repo,
+        "nameWithOwner": metadata["full_name"],
+        "description": metadata["description"],
+        "url": f"https://github.com/{owner}/{repo}",
+        "homepageUrl": None,
+        "createdAt": metadata["created_at"],
+        "updatedAt": metadata["updated_at"],
+        "pushedAt": metadata["pushed_at"],
+        "isPrivate": metadata["private"],
+        "isFork": False,
+        "isArchived": False,
+        "hasIssuesEnabled": True,
+        "hasWikiEnabled": True,
+        "diskUsage": 1024,
+        "stargazerCount": metadata["stargazers_count"],
+        "forkCount": metadata["forks_count"],
+        "watchers": {"totalCount": 40},
+        "primaryLanguage": {"name": metadata["language"]},
+        "licenseInfo": {"key": "mit", "name": "MIT License", "spdxId": "MIT", "url": "https://opensource.org/licenses/MIT"},
+        "codeOfConduct": None,
+        "contributingGuidelines": {"url": f"https://github.com/{owner}/{repo}/blob/main/CONTRIBUTING.md"},
+        "defaultBranchRef": branch,
+        "issues": items("issues"),
+        "pullRequests": items("pulls"),
+        "releases": {"nodes": [{"name": r["name"], "tagName": r["tag_name"], "publishedAt": r["published_at"]}
+                               for r in rest("releases")[:variables["releases"]]]},
+        "refs": {"nodes": rest("branches")[:variables["items"]]},
+        "rootTree": {"entries": entries} if branch else None,
+    }
+
+
+def _pom(deps):
+    """A POM declaring `deps` three ways: literal versions, ${properties} and
+    versions inherited from <dependencyManagement>."""
+    properties, managed, declared = [], [], []
+    for i, (pkg, ver) in enumerate(deps.items()):
+        coordinates = f"<groupId>bench.maven</groupId><artifactId>{pkg}</artifactId>"
+        if i % 3 == 1:
+            properties.append(f"<v{i}>{ver}</v{i}>")
+            ver = f"${{v{i}}}"
+        if i % 3 == 2:
+            managed.append(f"<dependency>{coordinates}<version>{ver}</version></dependency>")
+            declared.append(f"<dependency>{coordinates}</dependency>")
+        else:
+            declared.append(f"<dependency>{coordinates}<version>{ver}</version></dependency>")
+    return (f'<project xmlns="http://maven.apache.org/POM/4.0.0"><properties>{"".join(properties)}</properties>'
+            f'<dependencyManagement><dependencies>{"".join(managed)}</dependencies></dependencyManagement>'
+            f'<dependencies>{"".join(declared)}</dependencies></project>')
+
+
+def make_stub_server(config):
+    """One HTTP server playing GitHub (/repos/... and POST /graphql), PyPI (/pypi/...),
+    npm (/npm/...) and a Maven repository (/maven/.../maven-metadata.xml)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=None, content_type="application/json", headers=None):
+            if isinstance(body, str):
+                payload = body.encode()
+            else:
+                payload = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("X-RateLimit-Limit", "1000000")
+            self.send_header("X-RateLimit-Remaining", "1000000")
+            self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+            self.send_header("X-RateLimit-Resource", "core")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _send_page(self, owner, repo, rest, query):
+            """One page of a "paged-*" listing, with GitHub's Link header."""
+            params = {name: values[-1] for name, values in parse_qs(query).items()}
+            page = int(params.get("page", "1"))
+            if repo.startswith("paged-broken-") and page == 2:
+                return self._send(422, {"message": "Pagination is limited for this resource"})
+            url = f"http://{self.headers['Host']}/repos/{owner}/{repo}/{rest}"
+            rels = {"next": page + 1, "last": STUB_PAGES} if page < STUB_PAGES else {}
+            if page > 1:
+                rels.update(prev=page - 1, first=1)
+            link = ", ".join(f'<{url}?{urlencode(dict(params, page=number))}>; rel="{rel}"'
+                             for rel, number in rels.items())
+            body = _github_routes(config, owner, repo, rest, page) if page <= STUB_PAGES else []
+            self._send(200, body, headers={"Link": link} if link else None)
+
+        def do_GET(self):
+            path, _, query = self.path.partition("?")
+            parts = path.strip("/").split("/")
+            if parts[0] == "repos" and len(parts) >= 3:
+                config.count("github")
+                if config.delay(config.github_latency):
+                    return self._send(502, {"message": "injected error"})
+                if parts[2].startswith("paged-") and "/".join(parts[3:]) in PAGED_LISTINGS:
+                    return self._send_page(parts[1], parts[2], "/".join(parts[3:]), query)
+                body = _github_routes(config, parts[1], parts[2], "/".join(parts[3:]))
+                if body is not None and parts[3:5] == ["git", "blobs"] \
+                        and self.headers.get("Accept") == "application/vnd.github.raw":
+                    # Raw media type: the file itself, as github_stream requests it.
+                    return self._send(200, base64.b64decode(body["content"]).decode(),
+                                      content_type="application/vnd.github.raw")
+                return self._send(200, body) if body is not None else self._send(404, {"message": "Not Found"})
+            if parts[0] in ("pypi", "npm") and len(parts) >= 2:
+                config.count(parts[0])
+                if config.delay(config.registry_latency):
+                    return self._send(502)
+                major = zlib.crc32(parts[1].encode()) % 3 + 1
+                if parts[0] == "pypi":
+                    return self._send(200, {"info": {"version": f"{major}.5.0"}})
+                return self._send(200, {"version": f"{major}.5.0"})
+            if parts[0] == "maven" and parts[-1] == "maven-metadata.xml" and len(parts) >= 4:
+                config.count("maven")
+                if config.delay(config.registry_latency):
+                    return self._send(502)
+                major = zlib.crc32(parts[-2].encode()) % 3 + 1
+                versions = "".join(f"<version>{major}.{minor}.0</version>" for minor in range(6))
+                return self._send(200, f"<metadata><versioning><release>{major}.5.0</release>"
+                                       f"<versions>{versions}</versions></versioning></metadata>",
+                                  content_type="application/xml")
+            self._send(404, {"message": "Not Found"})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path.split("?", 1)[0].strip("/") != "graphql":
+                return self._send(404, {"message": "Not Found"})
+            config.count("github")
+            if config.delay(config.github_latency):
+                return self._send(502, {"message": "injected error"})
+            try:
+                variables = json.loads(body)["variables"]
+            except (ValueError, KeyError, TypeError):
+                return self._send(400, {"message": "Problems parsing JSON"})
+            repository = _graphql_repository(config, variables["owner"], variables["name"], variables)
+            self._send(200, {"data": {"repository": repository}})
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_model_factory(config):
+    """Fake Gemini: llm_gateway.FakeModel with injected latency and failures."""
+    from llm_gateway import FakeModel
+
+    class BenchModel(FakeModel):
+        def generate_content(self, prompt, generation_config=None, request_options=None):
+            config.count("gemini")
+            if config.delay(config.llm_latency):
+                raise RuntimeError("injected Gemini error")
+            return super().generate_content(prompt, generation_config, request_options)
+
+    return lambda model_id: BenchModel(model_id)
+
+
+def configure_environment(base_url, workdir):
+    """Point the app at the stubs and at throwaway caches. Must run before app modules are imported."""
+    defaults = {
+        "GITHUB_API_URL": base_url,
+        "GITHUB_GRAPHQL_URL": f"{base_url}/graphql",
+        "PYPI_URL": f"{base_url}/pypi",
+        "NPM_REGISTRY_URL": f"{base_url}/npm",
+        "MAVEN_REPO_URL": f"{base_url}/maven",
+        "GITHUB_CACHE_PATH": os.path.join(workdir, "github_responses.sqlite3"),
+        "SCAN_STORE_PATH": os.path.join(workdir, "scans.sqlite3"),
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_results.sqlite3"),
+        "REGISTRY_INDEX_PATH": os.path.join(workdir, "registry_index.sqlite3"),
+        "LOG_LEVEL": "ERROR",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    logging.basicConfig(level=os.environ["LOG_LEVEL"].upper(), format="%(levelname)s %(name)s: %(message)s")
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _scenario_runner(scenario, app_url):
+    """Return fn(repo) -> success flag for one operation of the scenario."""
+    if scenario == "scan":
+        from repo_explorer import deep_scan_repo
+        return lambda repo: bool(deep_scan_repo("bench", repo, TOKEN))
+    if scenario == "dependencies":
+        from ai_summarizer import analyze_dependencies
+        return lambda repo: analyze_dependencies("bench", repo, TOKEN)[1] is not None
+    if scenario == "analyze":
+        from http_client import http_post
+        return lambda repo: http_post(f"{app_url}/analyze", json={"owner": "bench", "repo": repo, "token": TOKEN},
+                                      timeout=300, retries=0).status_code == 200
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def run_scenario(scenario, concurrency, requests, config, app_url, run_id):
+    run = _scenario_runner(scenario, app_url)
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            ok = run(f"{scenario}-c{concurrency}-{run_id}-{i}")
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors += 0 if ok else 1
+
+    before = config.snapshot()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+    after = config.snapshot()
+
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+        "throughput_rps": round(requests / wall, 2),
+        "upstream_calls_per_request": {
+            service: round((after.get(service, 0) - before.get(service, 0)) / requests, 2)
+            for service in sorted(set(after) | set(before))
+        },
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of results against a baseline: slower p95, lower throughput, more upstream calls."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        base = previous.get((r["scenario"], r["concurrency"]))
+        if not base:
+            continue
+        label = f"{r['scenario']}@{r['concurrency']}"
+        if r["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{label}: p95 {r['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if r["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {r['throughput_rps']}/s vs baseline {base['throughput_rps']}/s")
+        for service, calls in r["upstream_calls_per_request"].items():
+            base_calls = base["upstream_calls_per_request"].get(service, 0)
+            if calls > base_calls * (1 + tolerance) + 0.01:
+                regressions.append(f"{label}: {calls} {service} calls/request vs baseline {base_calls}")
+    return regressions
+
+
+def print_header():
+    print(f"{'scenario':<14}{'conc':>5}{'reqs':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'req/s':>9}  upstream calls/request")
+
+def print_row(r):
+    calls = ", ".join(f"{k}={v}" for k, v in r["upstream_calls_per_request"].items())
+    print(f"{r['scenario']:<14}{r['concurrency']:>5}{r['requests']:>6}{r['errors']:>5}"
+          f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['throughput_rps']:>9}  {calls}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=40, help="requests per scenario and level")
+    parser.add_argument("--github-latency-ms", type=float, default=20)
+    parser.add_argument("--registry-latency-ms", type=float, default=30)
+    parser.add_argument("--llm-latency-ms", type=float, default=500)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub calls that fail")
+    parser.add_argument("--deps", type=int, default=20, help="dependencies per manifest")
+    parser.add_argument("--package-pool", type=int, default=200, help="distinct packages per ecosystem")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--save-baseline", help="write results as a baseline file")
+    parser.add_argument("--baseline", help="fail (exit 1) on regressions against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+    output, save_baseline, baseline = (os.path.abspath(p) if p else None
+                                       for p in (args.output, args.save_baseline, args.baseline))
+
+    config = StubConfig(args.github_latency_ms / 1000, args.registry_latency_ms / 1000,
+                        args.llm_latency_ms / 1000, args.error_rate, args.deps, args.package_pool, args.seed)
+    stub = make_stub_server(config)
+    workdir = tempfile.mkdtemp(prefix="blink-bench-")
+    configure_environment(f"http://127.0.0.1:{stub.server_address[1]}", workdir)
+    # Dependency analysis writes its JSON dump to the working directory.
+    os.chdir(workdir)
+
+    import llm_gateway
+    llm_gateway.set_model_factory(make_model_factory(config))
+
+    app_server = None
+    app_url = None
+    if "analyze" in scenarios:
+        from werkzeug.serving import make_server
+        from app import app
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        app_server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=app_server.serve_forever, daemon=True).start()
+        app_url = f"http://127.0.0.1:{app_server.server_port}"
+
+    run_id = int(time.time())
+    results = []
+    print_header()
+    try:
+        for scenario in scenarios:
+            for level in levels:
+                results.append(run_scenario(scenario, level, args.requests, config, app_url, run_id))
+                print_row(results[-1])
+    finally:
+        if app_server:
+            app_server.shutdown()
+        stub.shutdown()
+
+    report = {"settings": {k: v for k, v in vars(args).items()
+                           if k not in ("output", "save_baseline", "baseline")},
+              "results": results}
+    for path in (output, save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+from http_client import http_get, http_post
+from rate_limiter import scheduler
+from response_cache import get_response_cache, token_scope
+from ttl_cache import TTLCache
+
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API}/graphql")
+GITHUB_ACCEPT = "application/vnd.github.v3+json"
+GITHUB_RAW_ACCEPT = "application/vnd.github.raw"
+RATE_LIMITED = (429, {"message": "GitHub rate limit exhausted for every configured token"})
+
+# Repositories recently seen to be public. Only requests for these may fall
+# back onto GITHUB_TOKEN_POOL tokens: a pool token could otherwise read a
+# private repository the caller's own token cannot (or can no longer) reach.
+_public_repos = TTLCache(maxsize=10000, ttl=3600)
+_REPO_PATH = re.compile(r"/repos/([^/]+)/([^/]+)(/.*)?$")
+
+
+def _parse(body):
+    try:
+        return json.loads(body)
+    except (ValueError, TypeError):
+        return None
+
+def _is_rate_limited(response):
+    return response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0"
+
+def _repo_of(url):
+    """("owner/repo", whether `url` is the repository itself) for REST URLs, else (None, False)."""
+    match = _REPO_PATH.search(urlsplit(url).path)
+    if not match:
+        return None, False
+    return f"{match[1]}/{match[2]}".lower(), not match[3]
+
+def _record_visibility(repo, private):
+    if private is False:
+        _public_repos.set(repo, True)
+    elif private is True:
+        _public_repos.invalidate(repo)
+
+def _may_use_pool(repo):
+    return repo is not None and _public_repos.get(repo) is not None
+
+def _scheduled(send, token, resource, use_pool=False):
+    """Send a request through the rate-limit scheduler, re-queueing (onto a
+    pool token if `use_pool`) when the chosen token turns out to be exhausted."""
+    while True:
+        chosen = scheduler.acquire(token, resource, use_pool)
+        if chosen is None:
+            return None
+        response = send(chosen)
+        scheduler.update(chosen, response, resource)
+        if not _is_rate_limited(response):
+            return response
+        response.close()
+
+def parse_link_header(value):
+    """Parse an RFC 8288 Link header into {rel: url}."""
+    links = {}
+    for part in (value or "").split(","):
+        url, _, params = part.partition(";")
+        url = url.strip()
+        if not (url.startswith("<") and url.endswith(">")):
+            continue
+        for param in params.split(";"):
+            name, _, rel = param.strip().partition("=")
+            if name == "rel":
+                for r in rel.strip('"').split():
+                    links[r] = url[1:-1]
+    return links
+
+def github_get(url, token, accept=GITHUB_ACCEPT):
+    """Conditional GET against the GitHub REST API.
+    Sends If-None-Match/If-Modified-Since from the response cache and serves
+    the cached body on 304 (which GitHub does not count against the rate limit).
+    Returns (status_code, parsed_json)."""
+    status, data, _ = github_get_page(url, token, accept)
+    return status, data
+
+def github_get_page(url, token, accept=GITHUB_ACCEPT):
+    """github_get that also returns the response's pagination links as {rel: url}."""
+    headers = {"Accept": accept}
+    cache = get_response_cache()
+    key = f"{token_scope(token)} {accept} {url}"
+    cached = cache.get(key) if cache else None
+    if cached:
+        etag, last_modified, _, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    repo, is_repo = _repo_of(url)
+    response = _scheduled(
+        lambda t: http_get(url, headers={**headers, "Authorization": f"token {t}"}), token, "core",
+        _may_use_pool(repo))
+    if response is None:
+        return RATE_LIMITED + ({},)
+
+    if response.status_code == 304 and cached:
+        status, data, link = 200, _parse(cached[2]), cached[3]
+    else:
+        status, data, link = response.status_code, _parse(response.content), response.headers.get("Link")
+        if status == 200 and cache:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                cache.put(key, etag, last_modified, response.content, link)
+
+    if is_repo and status == 200 and isinstance(data, dict):
+        _record_visibility(repo, data.get("private"))
+    return status, data, parse_link_header(link)
+
+def github_stream(url, token, accept=GITHUB_RAW_ACCEPT):
+    """Unconditional GET whose body is streamed rather than read, for files too
+    large to hold in memory (or in the response cache). Returns the open
+    response, or None when every token is rate limited; the caller closes it."""
+    return _scheduled(
+        lambda t: http_get(url, headers={"Accept": accept, "Authorization": f"token {t}"}, stream=True),
+        token, "core", _may_use_pool(_repo_of(url)[0]))
+
+def github_graphql(query, variables, token):
+    """POST a GraphQL v4 query. Returns (status_code, parsed_json).
+    Queries with "owner" and "name" variables may use pool tokens once that
+    repository is known to be public; selecting `isPrivate` records it."""
+    payload = {"query": query, "variables": variables}
+    repo = f"{variables['owner']}/{variables['name']}".lower() \
+        if variables.get("owner") and variables.get("name") else None
+    response = _scheduled(
+        lambda t: http_post(GITHUB_GRAPHQL_URL, json=payload, headers={"Authorization": f"bearer {t}"}),
+        token, "graphql", _may_use_pool(repo))
+    if response is None:
+        return RATE_LIMITED
+    data = _parse(response.content)
+    repository = ((data or {}).get("data") or {}).get("repository") if isinstance(data, dict) else None
+    if repo and response.status_code == 200 and isinstance(repository, dict):
+        _record_visibility(repo, repository.get("isPrivate"))
+    return response.status_code, data
@@ -0,0 +1,157 @@
+import logging
+
+from github_client import github_graphql
+from metrics import instrumented
+
+logger = logging.getLogger(__name__)
+
+SCAN_QUERY = """
+query($owner: String!, $name: String!, $commits: Int!, $items: Int!, $releases: Int!) {
+  repository(owner: $owner, name: $name) {
+    databaseId
+    name
+    nameWithOwner
+    description
+    url
+    homepageUrl
+    createdAt
+    updatedAt
+    pushedAt
+    isPrivate
+    isFork
+    isArchived
+    hasIssuesEnabled
+    hasWikiEnabled
+    diskUsage
+    stargazerCount
+    forkCount
+    watchers { totalCount }
+    primaryLanguage { name }
+    licenseInfo { key name spdxId url }
+    codeOfConduct { name url }
+    contributingGuidelines { url }
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(first: $commits) {
+            nodes { oid message author { date } }
+          }
+        }
+      }
+    }
+    issues(states: OPEN, first: $items, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { title number createdAt author { login } }
+    }
+    pullRequests(states: OPEN, first: $items, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { title number createdAt author { login } }
+    }
+    releases(first: $releases, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { name tagName publishedAt }
+    }
+    refs(refPrefix: "refs/heads/", first: $items) {
+      nodes { name }
+    }
+    rootTree: object(expression: "HEAD:") {
+      ... on Tree { entries { name type } }
+    }
+  }
+}
+"""
+
+# Git object types in a tree mapped to the names the REST contents API uses.
+_ENTRY_TYPES = {"blob": "file", "tree": "dir", "commit": "submodule"}
+
+
+def _login(node):
+    return (node.get("author") or {}).get("login", "ghost")
+
+def _link(obj):
+    return {"url": obj.get("url"), "html_url": obj.get("url")} if obj else None
+
+def _map_metadata(r):
+    """Map a GraphQL repository node onto the REST /repos/{owner}/{repo} keys we use."""
+    license_info = r.get("licenseInfo")
+    return {
+        "id": r.get("databaseId"),
+        "name": r.get("name"),
+        "full_name": r.get("nameWithOwner"),
+        "description": r.get("description"),
+        "html_url": r.get("url"),
+        "homepage": r.get("homepageUrl"),
+        "private": r.get("isPrivate"),
+        "fork": r.get("isFork"),
+        "archived": r.get("isArchived"),
+        "created_at": r.get("createdAt"),
+        "updated_at": r.get("updatedAt"),
+        "pushed_at": r.get("pushedAt"),
+        "has_issues": r.get("hasIssuesEnabled"),
+        "has_wiki": r.get("hasWikiEnabled"),
+        "size": r.get("diskUsage"),
+        "stargazers_count": r.get("stargazerCount", 0),
+        # REST reports stars as watchers_count and real watchers as subscribers_count.
+        "watchers_count": r.get("stargazerCount", 0),
+        "subscribers_count": (r.get("watchers") or {}).get("totalCount", 0),
+        "forks_count": r.get("forkCount", 0),
+        "open_issues_count": (r.get("issues") or {}).get("totalCount", 0)
+                             + (r.get("pullRequests") or {}).get("totalCount", 0),
+        "language": (r.get("primaryLanguage") or {}).get("name"),
+        "license": {
+            "key": license_info.get("key"),
+            "name": license_info.get("name"),
+            "spdx_id": license_info.get("spdxId"),
+            "url": license_info.get("url"),
+        } if license_info else None,
+        "default_branch": (r.get("defaultBranchRef") or {}).get("name"),
+    }
+
+def _map_community_profile(r, contents):
+    """Approximate the community profile `files` object from GraphQL fields."""
+    readme = next((c for c in contents if c["type"] == "file" and c["name"].lower().startswith("readme")), None)
+    return {
+        "readme": {"url": None, "html_url": None} if readme else None,
+        "license": _link(r.get("licenseInfo")),
+        "contributing": _link(r.get("contributingGuidelines")),
+        "code_of_conduct": _link(r.get("codeOfConduct")),
+    }
+
+def map_repository(r):
+    """Map a GraphQL repository node into the deep_scan_repo info dict
+    (every section except contributors, which GraphQL does not expose)."""
+    branch = (r.get("defaultBranchRef") or {}).get("target") or {}
+    tree = r.get("rootTree") or {}
+    contents = [{"name": e["name"], "type": _ENTRY_TYPES.get(e["type"], e["type"])}
+                for e in tree.get("entries") or []]
+    return {
+        "metadata": _map_metadata(r),
+        "commits": [{"sha": c["oid"], "message": c["message"], "date": (c.get("author") or {}).get("date")}
+                    for c in (branch.get("history") or {}).get("nodes") or []],
+        "issues": [{"title": i["title"], "number": i["number"], "user": _login(i), "created_at": i["createdAt"]}
+                   for i in (r.get("issues") or {}).get("nodes") or []],
+        "pull_requests": [{"title": p["title"], "number": p["number"], "user": _login(p), "created_at": p["createdAt"]}
+                          for p in (r.get("pullRequests") or {}).get("nodes") or []],
+        "releases": [{"name": rel["name"], "tag_name": rel["tagName"], "published_at": rel["publishedAt"]}
+                     for rel in (r.get("releases") or {}).get("nodes") or []],
+        "branches": [b["name"] for b in (r.get("refs") or {}).get("nodes") or []],
+        "community_profile": _map_community_profile(r, contents),
+        "contents": contents,
+    }
+
+@instrumented("github.fetch_repository_graphql")
+def fetch_repository_graphql(owner, repo, token, commits=5, items=5, releases=3):
+    """Fetch everything deep_scan_repo needs except contributors in one GraphQL query.
+    Returns the mapped sections, or None if the repository could not be read."""
+    logger.debug("Fetching repository via GraphQL...")
+    variables = {"owner": owner, "name": repo, "commits": commits, "items": items, "releases": releases}
+    status, data = github_graphql(SCAN_QUERY, variables, token)
+    if status != 200 or not data:
+        logger.warning("GraphQL error %s for %s/%s", status, owner, repo)
+        return None
+    for error in data.get("errors") or []:
+        logger.warning("GraphQL: %s", error.get('message'))
+    repository = (data.get("data") or {}).get("repository")
+    if not repository:
+        return None
+    return map_repository(repository)
@@ -0,0 +1,61 @@
+"""Production serving for the analyzer API:
+
+    gunicorn -c gunicorn.conf.py
+
+Analyses spend nearly all their time waiting on GitHub, the registries and
+Gemini through blocking clients, so each worker serves requests on a large
+thread pool rather than one request at a time. Job status, request
+coalescing, the rate-limit scheduler and the in-memory caches live in the
+worker process; keep WEB_WORKERS=1 unless requests are routed stickily.
+"""
+import os
+import signal
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
+wsgi_app = "app:app"
+bind = os.getenv("WEB_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+worker_class = "gthread"
+workers = int(os.getenv("WEB_WORKERS", "1"))
+# Concurrent requests per worker; SSE (?stream=1) requests hold a thread until done.
+threads = int(os.getenv("WEB_THREADS", "256"))
+# Open client connections per worker, including idle keep-alive ones.
+worker_connections = int(os.getenv("WEB_MAX_CONNECTIONS", "1000"))
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))
+# A worker that stops heartbeating for this long is restarted.
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+# On SIGTERM, in-flight requests and accepted async jobs get this long to finish.
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "60"))
+# Seconds of graceful_timeout held back to log abandoned jobs before the arbiter's SIGKILL.
+SHUTDOWN_MARGIN = min(2, graceful_timeout // 2)
+accesslog = os.getenv("WEB_ACCESS_LOG") or None
+loglevel = os.getenv("LOG_LEVEL", "warning").lower()
+
+
+def post_worker_init(worker):
+    """Start the shutdown clock on SIGTERM. New async jobs are refused from
+    then on, while accepted ones keep running alongside the in-flight
+    requests; worker_exit gives the jobs whatever is left of the one
+    graceful_timeout."""
+    handle_exit = worker.handle_exit
+
+    def on_sigterm(sig, frame):
+        from jobs import close_jobs
+        worker.shutdown_started = time.monotonic()
+        close_jobs()
+        handle_exit(sig, frame)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    # In-flight requests must finish before the margin, too.
+    worker.cfg.set("graceful_timeout", graceful_timeout - SHUTDOWN_MARGIN)
+
+
+def worker_exit(server, worker):
+    from jobs import drain_jobs
+    started = getattr(worker, "shutdown_started", None)
+    elapsed = time.monotonic() - started if started is not None else 0
+    if not drain_jobs(max(graceful_timeout - SHUTDOWN_MARGIN - elapsed, 0)):
+        worker.log.warning("Async jobs still running at shutdown were abandoned")
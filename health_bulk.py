@@ -0,0 +1,158 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from health_index import (ACTIVE_AUTHOR_LADDER, COMMIT_CADENCE_LADDER, FAILING_GRADE, FLAG_POINTS,
+                          FORK_LADDER, GRADE_LADDER, HISTORY_RECENCY_LADDER, ISSUE_AGE_LADDER,
+                          RELEASE_CADENCE_LADDER, STAR_LADDER, UPDATE_RECENCY_LADDER, WEIGHTS,
+                          history_usable, parse_date)
+from metrics import instrumented
+
+_US_PER_DAY = 86_400_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _epoch_us(date_string):
+    """ISO date -> integer microseconds since the epoch (exact, unlike float seconds)."""
+    parsed = parse_date(date_string)
+    if parsed is None:
+        return None
+    delta = parsed - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+def records_to_columns(records):
+    """Turn deep_scan_repo results into columnar arrays.
+    Records without metadata (which calculate_health_index rejects) are dropped;
+    `index` maps each row back to its position in `records`."""
+    rows = [(i, r) for i, r in enumerate(records) if r and r.get("metadata")]
+    n = len(rows)
+    cols = {
+        "index": np.fromiter((i for i, _ in rows), dtype=np.int64, count=n),
+        "full_name": np.array([r["metadata"].get("full_name", "Unknown Repo") for _, r in rows], dtype=object),
+        "updated_us": np.zeros(n, dtype=np.int64),
+        "has_update": np.zeros(n, dtype=bool),
+        "releases": np.zeros(n, dtype=bool),
+        "has_issues": np.zeros(n, dtype=bool),
+        "has_profile": np.zeros(n, dtype=bool),
+        "readme": np.zeros(n, dtype=bool),
+        "license": np.zeros(n, dtype=bool),
+        "contributing": np.zeros(n, dtype=bool),
+        "code_of_conduct": np.zeros(n, dtype=bool),
+        "stars": np.zeros(n, dtype=np.int64),
+        "forks": np.zeros(n, dtype=np.int64),
+        "has_history": np.zeros(n, dtype=bool),
+        "commit_week_pct": np.zeros(n, dtype=np.int64),
+        "releases_in_window": np.zeros(n, dtype=np.int64),
+        "active_authors": np.zeros(n, dtype=np.int64),
+        "issues_read": np.zeros(n, dtype=bool),
+        "issue_age": np.zeros(n, dtype=np.int64),
+    }
+    for row, (_, record) in enumerate(rows):
+        metadata = record["metadata"]
+        profile = record.get("community_profile") or {}
+        updated = _epoch_us(metadata.get("updated_at"))
+        if updated is not None:
+            cols["updated_us"][row] = updated
+            cols["has_update"][row] = True
+        cols["releases"][row] = bool(record.get("releases"))
+        cols["has_issues"][row] = bool(metadata.get("has_issues"))
+        cols["has_profile"][row] = bool(profile)
+        cols["readme"][row] = bool(profile.get("readme"))
+        cols["license"][row] = bool(profile.get("license") or metadata.get("license"))
+        cols["contributing"][row] = bool(profile.get("contributing"))
+        cols["code_of_conduct"][row] = bool(profile.get("code_of_conduct"))
+        cols["stars"][row] = metadata.get("stargazers_count", 0)
+        cols["forks"][row] = metadata.get("forks_count", 0)
+        activity = record.get("activity")
+        if history_usable(activity):
+            cols["has_history"][row] = True
+            cols["commit_week_pct"][row] = activity["commits"]["active_week_pct"]
+            cols["releases_in_window"][row] = activity["releases"]["releases"]
+            cols["active_authors"][row] = activity["commits"]["active_authors_90d"]
+            cols["issues_read"][row] = "issues" not in activity.get("failed", ())
+            cols["issue_age"][row] = activity["issues"]["mean_age_days"]
+    return cols
+
+def _ladder_points(values, ladder, at_most=False):
+    """Vectorized equivalent of health_index._climb (first matching rung wins)."""
+    conditions = [(values <= t) if at_most else (values >= t) for t, _, _ in ladder]
+    return np.select(conditions, [points for _, points, _ in ladder], default=0)
+
+def score_columns(cols, now=None):
+    """Compute the three sub-scores, totals and grades for every row at once."""
+    now = now or datetime.now(timezone.utc)
+    delta = now - _EPOCH
+    now_us = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    days = (now_us - cols["updated_us"]) // _US_PER_DAY
+
+    recency = np.where(cols["has_update"], _ladder_points(days, UPDATE_RECENCY_LADDER, at_most=True), 0)
+    sampled = recency + FLAG_POINTS["releases"] * cols["releases"] + FLAG_POINTS["has_issues"] * cols["has_issues"]
+    history = (
+        np.where(cols["has_update"], _ladder_points(days, HISTORY_RECENCY_LADDER, at_most=True), 0)
+        + _ladder_points(cols["commit_week_pct"], COMMIT_CADENCE_LADDER)
+        + _ladder_points(cols["releases_in_window"], RELEASE_CADENCE_LADDER)
+        + _ladder_points(cols["active_authors"], ACTIVE_AUTHOR_LADDER)
+        + np.where(cols["has_issues"] & cols["issues_read"],
+                   _ladder_points(cols["issue_age"], ISSUE_AGE_LADDER, at_most=True), 0))
+    activity = np.minimum(np.where(cols["has_history"], history, sampled), WEIGHTS["activity"])
+
+    community = np.where(cols["has_profile"], np.minimum(
+        FLAG_POINTS["readme"] * cols["readme"] + FLAG_POINTS["license"] * cols["license"]
+        + FLAG_POINTS["contributing"] * cols["contributing"]
+        + FLAG_POINTS["code_of_conduct"] * cols["code_of_conduct"],
+        WEIGHTS["community"]), 0)
+
+    popularity = np.minimum(
+        _ladder_points(cols["stars"], STAR_LADDER) + _ladder_points(cols["forks"], FORK_LADDER),
+        WEIGHTS["popularity"])
+
+    total = activity + community + popularity
+    grade_labels = np.array([grade for _, grade in GRADE_LADDER] + [FAILING_GRADE], dtype=object)
+    grade_index = np.select([total >= t for t, _ in GRADE_LADDER], np.arange(len(GRADE_LADDER)),
+                            default=len(GRADE_LADDER))
+    return {
+        "activity": activity,
+        "community": community,
+        "popularity": popularity,
+        "total": total,
+        "grade": grade_labels[grade_index],
+    }
+
+def rank_scores(total):
+    """Competition rank (1 = best, ties share a rank) and percentile rank
+    (share of the fleet scoring at or below each repo, 0-100)."""
+    n = len(total)
+    ascending = np.sort(total)
+    rank = n - np.searchsorted(ascending, total, side="right") + 1
+    percentile = np.searchsorted(ascending, total, side="right") * 100.0 / max(n, 1)
+    return rank, percentile
+
+@instrumented("health.score_bulk")
+def score_bulk(records, now=None):
+    """Score a fleet of scan records in vectorized form.
+    Returns a dict of equal-length arrays: index, full_name, activity,
+    community, popularity, total, grade, rank and percentile."""
+    cols = records_to_columns(records)
+    scores = score_columns(cols, now)
+    rank, percentile = rank_scores(scores["total"])
+    return {"index": cols["index"], "full_name": cols["full_name"], **scores,
+            "rank": rank, "percentile": percentile}
+
+def ranking(scores):
+    """Rows of a score_bulk result as plain dicts, best first."""
+    order = np.lexsort((scores["full_name"].astype(str), -scores["total"]))
+    return [
+        {
+            "full_name": scores["full_name"][i],
+            "rank": int(scores["rank"][i]),
+            "percentile": round(float(scores["percentile"][i]), 2),
+            "total_score": int(scores["total"][i]),
+            "grade": scores["grade"][i],
+            "scores": {
+                "activity": int(scores["activity"][i]),
+                "community": int(scores["community"][i]),
+                "popularity": int(scores["popularity"][i]),
+            },
+        }
+        for i in order
+    ]
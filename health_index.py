@@ -1,4 +1,5 @@
 import json
+import logging
 import sys
 from datetime import datetime, timezone
 import os
@@ -6,9 +7,12 @@ from dotenv import load_dotenv
 
 from repo_explorer import deep_scan_repo
 from ai_summarizer import analyze_dependencies
+from metrics import instrumented
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 WEIGHTS = {
     "activity": 40,
@@ -16,6 +20,40 @@ WEIGHTS = {
     "popularity": 30,
 }
 
+# Scoring thresholds as data, shared by the scalar functions below and the
+# vectorized engine in health_bulk.py. Ladders are checked top-down and the
+# first matching rung wins; anything below the last rung scores 0.
+# (max days since last update, points, label)
+UPDATE_RECENCY_LADDER = [(30, 25, "Excellent"), (90, 15, "Good"), (365, 5, "Fair")]
+# (min stars, points, label)
+STAR_LADDER = [(10000, 20, "Elite"), (1000, 15, "Excellent"), (100, 10, "Good"), (10, 5, "Fair")]
+# (min forks, points, label)
+FORK_LADDER = [(5000, 10, "Elite"), (500, 7, "Excellent"), (50, 3, "Good")]
+# Points for boolean signals.
+FLAG_POINTS = {
+    "releases": 10,
+    "has_issues": 5,
+    "readme": 10,
+    "license": 10,
+    "contributing": 5,
+    "code_of_conduct": 5,
+}
+# With full history (the scan's "activity" section) the activity score uses
+# these instead of the recency ladder and the release/issues flags above.
+# (max days since last update, points, label)
+HISTORY_RECENCY_LADDER = [(30, 10, "Excellent"), (90, 6, "Good"), (365, 2, "Fair")]
+# (min % of weeks with at least one commit, points, label)
+COMMIT_CADENCE_LADDER = [(50, 15, "Excellent"), (25, 10, "Good"), (8, 5, "Fair")]
+# (min releases published in the history window, points, label)
+RELEASE_CADENCE_LADDER = [(4, 5, "Excellent"), (1, 3, "Good")]
+# (min distinct commit authors in the last 90 days, points, label)
+ACTIVE_AUTHOR_LADDER = [(5, 5, "Excellent"), (2, 3, "Good"), (1, 1, "Fair")]
+# (max mean age of open issues in days, points, label)
+ISSUE_AGE_LADDER = [(90, 5, "Excellent"), (365, 3, "Fair")]
+# (min total score, grade)
+GRADE_LADDER = [(90, "A+ (Excellent)"), (80, "A (Great)"), (70, "B (Good)"), (60, "C (Fair)"), (50, "D (Poor)")]
+FAILING_GRADE = "F (Very Poor)"
+
 def parse_date(date_string):
     """Safely parse an ISO 8601 date string."""
     if not date_string:
@@ -27,35 +65,89 @@ def parse_date(date_string):
     except (ValueError, TypeError):
         return None
 
-def score_activity(metadata, commits, releases, max_points=WEIGHTS["activity"]):
-    """Scores the project's recent activity."""
+def _climb(value, ladder, at_most=False):
+    """Return (points, label) of the first rung `value` reaches, or (0, None)."""
+    for threshold, points, label in ladder:
+        if (value <= threshold) if at_most else (value >= threshold):
+            return points, label
+    return 0, None
+
+def history_usable(activity):
+    """True when a scan's "activity" section has the commit history to score from."""
+    return bool(activity) and "commits" not in activity.get("failed", ())
+
+def _days_since_update(metadata, now):
+    updated_at = parse_date(metadata.get("updated_at"))
+    if not updated_at:
+        return None
+    return ((now or datetime.now(timezone.utc)) - updated_at).days
+
+def score_activity_history(metadata, activity, max_points=WEIGHTS["activity"], now=None):
+    """Scores activity from full-history aggregates: commit cadence, releases,
+    active authors and the age of open issues."""
     score = 0
     report = []
-    updated_at = parse_date(metadata.get("updated_at"))
-    if updated_at:
-        days_since_update = (datetime.now(timezone.utc) - updated_at).days
-        
-        if days_since_update <= 30:
-            score += 25
-            report.append(f"[+25] Excellent: Updated {days_since_update} days ago.")
-        elif days_since_update <= 90:
-            score += 15
-            report.append(f"[+15] Good: Updated {days_since_update} days ago.")
-        elif days_since_update <= 365:
-            score += 5
-            report.append(f"[+5] Fair: Updated {days_since_update} days ago.")
+    days_since_update = _days_since_update(metadata, now)
+    if days_since_update is not None:
+        points, label = _climb(days_since_update, HISTORY_RECENCY_LADDER, at_most=True)
+        score += points
+        report.append(f"[+{points}] {label or 'Poor'}: Updated {days_since_update} days ago.")
+    else:
+        report.append("[+0] Could not determine last update.")
+
+    commits = activity["commits"]
+    points, label = _climb(commits["active_week_pct"], COMMIT_CADENCE_LADDER)
+    score += points
+    report.append(f"[+{points}] {label or 'Poor'}: Commits in {commits['active_week_pct']}% of weeks "
+                  f"({commits['commits']} commits over the last {commits['covered_days']} days).")
+
+    releases = activity["releases"]["releases"]
+    points, label = _climb(releases, RELEASE_CADENCE_LADDER)
+    score += points
+    report.append(f"[+{points}] {label or 'Poor'}: {releases} release(s) in the last {activity['window_days']} days.")
+
+    authors = commits["active_authors_90d"]
+    points, label = _climb(authors, ACTIVE_AUTHOR_LADDER)
+    score += points
+    report.append(f"[+{points}] {label or 'Poor'}: {authors} active author(s) in the last 90 days.")
+
+    if not metadata.get("has_issues"):
+        report.append("[+0] Neutral: Issues are disabled.")
+    elif "issues" in activity.get("failed", ()):
+        report.append("[+0] Could not read open issues.")
+    else:
+        issues = activity["issues"]
+        points, label = _climb(issues["mean_age_days"], ISSUE_AGE_LADDER, at_most=True)
+        score += points
+        report.append(f"[+{points}] {label or 'Poor'}: {issues['open_issues']} open issue(s), "
+                      f"{issues['mean_age_days']} days old on average.")
+    return min(score, max_points), report
+
+def score_activity(metadata, commits, releases, max_points=WEIGHTS["activity"], now=None, activity=None):
+    """Scores the project's recent activity. Uses the full-history aggregates
+    in `activity` when available, else the latest commits/releases sample."""
+    if history_usable(activity):
+        return score_activity_history(metadata, activity, max_points, now)
+    score = 0
+    report = []
+    days_since_update = _days_since_update(metadata, now)
+    if days_since_update is not None:
+        points, label = _climb(days_since_update, UPDATE_RECENCY_LADDER, at_most=True)
+        score += points
+        if label:
+            report.append(f"[+{points}] {label}: Updated {days_since_update} days ago.")
         else:
             report.append(f"[+0] Poor: Last update was over a year ago ({days_since_update} days).")
     else:
         report.append("[+0] Could not determine last update.")
     if releases and len(releases) > 0:
-        score += 10
-        report.append(f"[+10] Good: Has {len(releases)} recent release(s).")
+        score += FLAG_POINTS["releases"]
+        report.append(f"[+{FLAG_POINTS['releases']}] Good: Has {len(releases)} recent release(s).")
     else:
         report.append("[+0] Poor: No recent releases found.")
     if metadata.get("has_issues"):
-        score += 5
-        report.append("[+5] Good: Issues are enabled.")
+        score += FLAG_POINTS["has_issues"]
+        report.append(f"[+{FLAG_POINTS['has_issues']}] Good: Issues are enabled.")
     else:
         report.append("[+0] Neutral: Issues are disabled.")
     return min(score, max_points), report
@@ -68,23 +160,23 @@ def score_community(community_profile, metadata, max_points=WEIGHTS["community"]
         report.append("[+0] Note: 'community_profile' data not found.")
         return 0, report
     if community_profile.get("readme"):
-        score += 10
-        report.append("[+10] Excellent: Has a README file.")
+        score += FLAG_POINTS["readme"]
+        report.append(f"[+{FLAG_POINTS['readme']}] Excellent: Has a README file.")
     else:
         report.append("[+0] Poor: Missing a README file.")
     if community_profile.get("license") or metadata.get("license"):
-        score += 10
-        report.append("[+10] Excellent: Has a LICENSE file.")
+        score += FLAG_POINTS["license"]
+        report.append(f"[+{FLAG_POINTS['license']}] Excellent: Has a LICENSE file.")
     else:
         report.append("[+0] Poor: Missing a LICENSE file.")
     if community_profile.get("contributing"):
-        score += 5
-        report.append("[+5] Good: Has a CONTRIBUTING.md file.")
+        score += FLAG_POINTS["contributing"]
+        report.append(f"[+{FLAG_POINTS['contributing']}] Good: Has a CONTRIBUTING.md file.")
     else:
         report.append("[+0] Neutral: Missing a CONTRIBUTING.md file.")
     if community_profile.get("code_of_conduct"):
-        score += 5
-        report.append("[+5] Good: Has a CODE_OF_CONDUCT.md file.")
+        score += FLAG_POINTS["code_of_conduct"]
+        report.append(f"[+{FLAG_POINTS['code_of_conduct']}] Good: Has a CODE_OF_CONDUCT.md file.")
     else:
         report.append("[+0] Neutral: Missing a CODE_OF_CONDUCT.md file.")
     return min(score, max_points), report
@@ -95,51 +187,31 @@ def score_popularity(metadata, max_points=WEIGHTS["popularity"]):
     report = []
     stars = metadata.get("stargazers_count", 0)
     forks = metadata.get("forks_count", 0)
-    if stars >= 10000:
-        score += 20
-        report.append(f"[+20] Elite: {stars} stars.")
-    elif stars >= 1000:
-        score += 15
-        report.append(f"[+15] Excellent: {stars} stars.")
-    elif stars >= 100:
-        score += 10
-        report.append(f"[+10] Good: {stars} stars.")
-    elif stars >= 10:
-        score += 5
-        report.append(f"[+5] Fair: {stars} stars.")
-    else:
-        report.append(f"[+0] Poor: {stars} stars.")
-    if forks >= 5000:
-        score += 10
-        report.append(f"[+10] Elite: {forks} forks.")
-    elif forks >= 500:
-        score += 7
-        report.append(f"[+7] Excellent: {forks} forks.")
-    elif forks >= 50:
-        score += 3
-        report.append(f"[+3] Good: {forks} forks.")
-    else:
-        report.append(f"[+0] Poor: {forks} forks.")
+    points, label = _climb(stars, STAR_LADDER)
+    score += points
+    report.append(f"[+{points}] {label or 'Poor'}: {stars} stars.")
+    points, label = _climb(forks, FORK_LADDER)
+    score += points
+    report.append(f"[+{points}] {label or 'Poor'}: {forks} forks.")
     return min(score, max_points), report
 
 def get_grade(score):
     """Assign a letter grade based on the score."""
-    if score >= 90: return "A+ (Excellent)"
-    if score >= 80: return "A (Great)"
-    if score >= 70: return "B (Good)"
-    if score >= 60: return "C (Fair)"
-    if score >= 50: return "D (Poor)"
-    return "F (Very Poor)"
-
-def calculate_health_index(data):
+    for threshold, grade in GRADE_LADDER:
+        if score >= threshold:
+            return grade
+    return FAILING_GRADE
+
+@instrumented("health.score")
+def calculate_health_index(data, now=None):
     """Main function to calculate the full score and generate a report."""
     metadata = data.get("metadata", {})
     if not metadata:
-        print("Error: 'metadata' key is missing or empty in the JSON file.")
+        logger.error("Error: 'metadata' key is missing or empty in the JSON file.")
         return
 
     activity_score, activity_report = score_activity(
-        metadata, data.get("commits", []), data.get("releases", []))
+        metadata, data.get("commits", []), data.get("releases", []), now=now, activity=data.get("activity"))
     community_score, community_report = score_community(
         data.get("community_profile"), metadata)
     popularity_score, popularity_report = score_popularity(metadata)
@@ -157,26 +229,24 @@ def calculate_health_index(data):
         }
     }
 
-    # --- Print Report ---
-    print("\n" + "=" * 60)
-    print(f"Health Index Report for: {report_data['full_name']}")
-    print("=" * 60)
-    print(f"\nActivity Score: {activity_score} / {WEIGHTS['activity']}")
-    for line in activity_report: print(f"   {line}")
-    print(f"\nCommunity Score: {community_score} / {WEIGHTS['community']}")
-    for line in community_report: print(f"   {line}")
-    print(f"\nPopularity Score: {popularity_score} / {WEIGHTS['popularity']}")
-    for line in popularity_report: print(f"   {line}")
-    print("\n" + "-" * 60)
-    print(f"Total Score: {total_score} / 100")
-    print(f"Final Grade: {grade}")
-    print("=" * 60)
+    # --- Log Report (only built when INFO is enabled) ---
+    if logger.isEnabledFor(logging.INFO):
+        lines = ["=" * 60, f"Health Index Report for: {report_data['full_name']}", "=" * 60]
+        lines.append(f"\nActivity Score: {activity_score} / {WEIGHTS['activity']}")
+        lines += [f"   {line}" for line in activity_report]
+        lines.append(f"\nCommunity Score: {community_score} / {WEIGHTS['community']}")
+        lines += [f"   {line}" for line in community_report]
+        lines.append(f"\nPopularity Score: {popularity_score} / {WEIGHTS['popularity']}")
+        lines += [f"   {line}" for line in popularity_report]
+        lines += ["\n" + "-" * 60, f"Total Score: {total_score} / 100", f"Final Grade: {grade}", "=" * 60]
+        logger.info("\n".join(lines))
     
     return report_data
 
 
 if __name__ == "__main__":
-    
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     token = os.getenv("GITHUB_TOKEN")
     if not token:
         print("GITHUB_TOKEN not found in your .env file or environment.")
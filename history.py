@@ -0,0 +1,311 @@
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+from github_client import GITHUB_API, github_get_page
+from metrics import instrumented, propagate
+
+# Full-history signals for the health score, collected by following GitHub's
+# pagination. Each collector streams items through an aggregator, so memory
+# stays flat however long the history is; page counts are capped per collector.
+# The first page of each listing also serves as the scan's latest-items sample.
+SCAN_HISTORY = os.getenv("SCAN_HISTORY", "1") == "1"
+HISTORY_WINDOW_DAYS = int(os.getenv("HISTORY_WINDOW_DAYS", "365"))
+HISTORY_MAX_PAGES = int(os.getenv("HISTORY_MAX_PAGES", "10"))
+HISTORY_PAGE_SIZE = 100
+# Pages fetched ahead of the consumer when the last page number is known.
+PAGE_PREFETCH = int(os.getenv("PAGE_PREFETCH", "4"))
+ACTIVE_AUTHOR_DAYS = 90
+HISTORY_LISTINGS = ("commits", "contributors", "issues", "releases")
+# (max age in days, bucket label) for open issues; older ones fall into "older".
+ISSUE_AGE_BUCKETS = [(7, "week"), (30, "month"), (90, "quarter"), (365, "year")]
+
+logger = logging.getLogger(__name__)
+
+
+def _date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+
+def _with_page(url, page):
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+def _page_number(url):
+    if not url:
+        return None
+    pages = parse_qs(urlsplit(url).query).get("page")
+    return int(pages[0]) if pages and pages[0].isdigit() else None
+
+@instrumented("github.fetch_page")
+def _fetch_page(url, token):
+    return github_get_page(url, token)
+
+
+class Pages:
+    """Iterate over every item of a paginated GitHub list endpoint.
+
+    Follows Link rel="next"; when the first page announces rel="last", the
+    remaining pages are requested up to `prefetch` at a time while earlier
+    ones are consumed. Stops after `max_pages` (setting `truncated`) or at the
+    first failing page (setting `error` to its status). Breaking out of the
+    loop cancels pages not yet requested. The items of the first page are
+    kept in `first_page`.
+    """
+
+    def __init__(self, url, token, max_pages=HISTORY_MAX_PAGES, prefetch=PAGE_PREFETCH):
+        self.url = url
+        self.token = token
+        self.max_pages = max_pages
+        self.prefetch = prefetch
+        self.pages = 0
+        self.truncated = False
+        self.error = None
+        self.first_page = None
+
+    def _accept(self, status, data):
+        if status != 200 or not isinstance(data, list):
+            self.error = status
+            return False
+        self.pages += 1
+        return True
+
+    def __iter__(self):
+        status, data, links = _fetch_page(self.url, self.token)
+        if not self._accept(status, data):
+            return
+        self.first_page = data
+        yield from data
+
+        last = _page_number(links.get("last"))
+        if last and self.prefetch > 1:
+            if last > self.max_pages:
+                self.truncated = True
+            urls = [_with_page(links["last"], page) for page in range(2, min(last, self.max_pages) + 1)]
+            yield from self._prefetched(urls)
+            return
+
+        url = links.get("next")
+        while url:
+            if self.pages >= self.max_pages:
+                self.truncated = True
+                return
+            status, data, links = _fetch_page(url, self.token)
+            if not self._accept(status, data):
+                return
+            yield from data
+            url = links.get("next")
+
+    def _prefetched(self, urls):
+        pool = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="page")
+        fetch = propagate(_fetch_page)
+        pending = deque()
+        try:
+            for url in urls:
+                pending.append(pool.submit(fetch, url, self.token))
+                if len(pending) < self.prefetch:
+                    continue
+                status, data, _ = pending.popleft().result()
+                if not self._accept(status, data):
+                    return
+                yield from data
+            while pending:
+                status, data, _ = pending.popleft().result()
+                if not self._accept(status, data):
+                    return
+                yield from data
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class CommitCadence:
+    """Commits per ISO week and recently active authors."""
+
+    def __init__(self, now):
+        self.now = now
+        self.recent = now - timedelta(days=ACTIVE_AUTHOR_DAYS)
+        self.weeks = {}
+        self.authors = set()
+        self.count = 0
+        self.latest = None
+        self.oldest = None
+
+    def add(self, commit):
+        date = _date(((commit.get("commit") or {}).get("author") or {}).get("date"))
+        if not date:
+            return
+        self.count += 1
+        week = date.isocalendar()[:2]
+        self.weeks[week] = self.weeks.get(week, 0) + 1
+        self.latest = max(self.latest, date) if self.latest else date
+        self.oldest = min(self.oldest, date) if self.oldest else date
+        if date >= self.recent:
+            author = (commit.get("author") or {}).get("login") \
+                or ((commit.get("commit") or {}).get("author") or {}).get("email")
+            if author:
+                self.authors.add(author)
+
+    def result(self, window_days, truncated=False):
+        # A truncated listing only reaches back to the oldest commit seen.
+        days = window_days
+        if truncated and self.oldest:
+            days = min(window_days, max(7, (self.now - self.oldest).days))
+        weeks = max(1, -(-days // 7))
+        return {
+            "commits": self.count,
+            "covered_days": days,
+            "active_weeks": len(self.weeks),
+            "active_week_pct": min(100, len(self.weeks) * 100 // weeks),
+            "commits_per_week": round(self.count / weeks, 2),
+            "busiest_week": max(self.weeks.values(), default=0),
+            "active_authors_90d": len(self.authors),
+            "last_commit": self.latest.isoformat() if self.latest else None,
+        }
+
+
+class ContributorShare:
+    """Contributor count and how many people account for half of all commits."""
+
+    def __init__(self):
+        self.contributions = []
+
+    def add(self, contributor):
+        self.contributions.append(contributor.get("contributions") or 0)
+
+    def result(self):
+        total = sum(self.contributions)
+        covered = 0
+        bus_factor = 0
+        for count in sorted(self.contributions, reverse=True):
+            if covered * 2 >= total:
+                break
+            covered += count
+            bus_factor += 1
+        return {"contributors": len(self.contributions), "contributions": total, "bus_factor": bus_factor}
+
+
+class IssueAges:
+    """Open-issue count and age distribution (pull requests excluded)."""
+
+    def __init__(self, now):
+        self.now = now
+        self.count = 0
+        self.total_days = 0
+        self.buckets = dict.fromkeys([label for _, label in ISSUE_AGE_BUCKETS] + ["older"], 0)
+
+    def add(self, issue):
+        if "pull_request" in issue:
+            return
+        created = _date(issue.get("created_at"))
+        if not created:
+            return
+        days = (self.now - created).days
+        self.count += 1
+        self.total_days += days
+        label = next((label for limit, label in ISSUE_AGE_BUCKETS if days <= limit), "older")
+        self.buckets[label] += 1
+
+    def result(self):
+        return {
+            "open_issues": self.count,
+            "mean_age_days": self.total_days // self.count if self.count else 0,
+            "age_buckets": self.buckets,
+        }
+
+
+class ReleaseCadence:
+    """Releases published within the window, newest first; `add` returns False
+    once releases fall outside the window so the caller can stop paging."""
+
+    def __init__(self, since):
+        self.since = since
+        self.count = 0
+        self.latest = None
+
+    def add(self, release):
+        published = _date(release.get("published_at"))
+        if not published or release.get("draft"):
+            return True
+        if published < self.since:
+            return False
+        self.count += 1
+        self.latest = max(self.latest, published) if self.latest else published
+        return True
+
+    def result(self):
+        return {"releases": self.count, "last_release": self.latest.isoformat() if self.latest else None}
+
+
+def _collect(pages, aggregator):
+    for item in pages:
+        if aggregator.add(item) is False:
+            break
+    return pages
+
+@instrumented("github.fetch_activity")
+def collect_history(owner, repo, token, listings=HISTORY_LISTINGS, previous=None, now=None, window_days=None):
+    """Aggregate the last `window_days` of commits and releases, all contributors
+    and all open issues into the scan's "activity" section.
+
+    Given the `previous` activity section, only `listings` (plus any that
+    failed last time) are paged again and the rest keep their aggregates, as
+    long as it was collected the same day for the same window; an older one
+    is discarded, since commit cadence and active authors are relative to now.
+    Returns (activity, first_pages), first_pages mapping each listing paged
+    to the items of its first page (None if it failed), or (None, {}) when
+    SCAN_HISTORY is off."""
+    if not SCAN_HISTORY:
+        return None, {}
+    now = now or datetime.now(timezone.utc)
+    window_days = window_days or HISTORY_WINDOW_DAYS
+    # Day-aligned so the URL (and its ETag cache entry) is stable for a day.
+    since = (now - timedelta(days=window_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    if previous and previous.get("window_days") == window_days and previous.get("since") == since.isoformat():
+        listings = set(listings) | set(previous.get("failed", ()))
+    else:
+        previous, listings = None, HISTORY_LISTINGS
+    base = f"{GITHUB_API}/repos/{owner}/{repo}"
+    per_page = f"per_page={HISTORY_PAGE_SIZE}"
+
+    commits = CommitCadence(now)
+    contributors = ContributorShare()
+    issues = IssueAges(now)
+    releases = ReleaseCadence(since)
+    jobs = {
+        "commits": (Pages(f"{base}/commits?{per_page}&since={since.strftime('%Y-%m-%dT%H:%M:%SZ')}", token), commits),
+        "contributors": (Pages(f"{base}/contributors?{per_page}&anon=true", token), contributors),
+        "issues": (Pages(f"{base}/issues?state=open&{per_page}", token), issues),
+        "releases": (Pages(f"{base}/releases?{per_page}", token), releases),
+    }
+    jobs = {name: job for name, job in jobs.items() if name in listings}
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="history") as pool:
+        futures = {name: pool.submit(propagate(_collect), pages, aggregator)
+                   for name, (pages, aggregator) in jobs.items()}
+        pages = {name: future.result() for name, future in futures.items()}
+
+    kept = [name for name in HISTORY_LISTINGS if name not in pages]
+    truncated = sorted([name for name, p in pages.items() if p.truncated]
+                       + [name for name in (previous or {}).get("truncated", ()) if name in kept])
+    failed = sorted(name for name, p in pages.items() if p.error)
+    if truncated or failed:
+        logger.info("History for %s/%s truncated: %s; failed: %s", owner, repo, truncated, failed)
+    results = {
+        "commits": lambda: commits.result(window_days, pages["commits"].truncated),
+        "contributors": contributors.result,
+        "issues": issues.result,
+        "releases": releases.result,
+    }
+    activity = {"window_days": window_days, "since": since.isoformat()}
+    for name in HISTORY_LISTINGS:
+        activity[name] = results[name]() if name in pages else previous[name]
+    activity.update(truncated=truncated, failed=failed)
+    return activity, {name: p.first_page for name, p in pages.items()}
@@ -0,0 +1,109 @@
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from metrics import UPSTREAM_REQUESTS, UPSTREAM_SECONDS
+
+logger = logging.getLogger(__name__)
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
+
+# Pool sizing: POOL_CONNECTIONS is how many per-host pools are kept alive,
+# POOL_MAXSIZE how many keep-alive connections each host pool may hold.
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def _is_secondary_rate_limit(response):
+    """GitHub signals secondary rate limits with 429, or 403 plus Retry-After/message."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if "Retry-After" in response.headers:
+        return True
+    try:
+        message = response.json().get("message", "")
+    except (ValueError, AttributeError):
+        return False
+    return "secondary rate limit" in message.lower()
+
+def _backoff(attempt):
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+def _retry_delay(response, attempt):
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    return _backoff(attempt)
+
+def http_request(method, url, headers=None, params=None, json=None, timeout=None, retries=None, stream=False):
+    """Send a request through the shared keep-alive session.
+    Retries connection errors, 5xx and secondary rate limits with jittered backoff.
+    With stream=True the body is left unread; the caller must close the response."""
+    retries = MAX_RETRIES if retries is None else retries
+    timeout = timeout or DEFAULT_TIMEOUT
+    session = get_session()
+    host = urlsplit(url).netloc
+
+    for attempt in range(retries + 1):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, headers=headers, params=params, json=json, timeout=timeout,
+                                       stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - started, host)
+            UPSTREAM_REQUESTS.inc(host, type(e).__name__)
+            if attempt == retries:
+                raise
+            logger.warning("%s on %s, retrying...", type(e).__name__, url)
+            time.sleep(_backoff(attempt))
+            continue
+        UPSTREAM_SECONDS.observe(time.perf_counter() - started, host)
+        UPSTREAM_REQUESTS.inc(host, str(response.status_code))
+
+        if attempt < retries and (response.status_code >= 500 or _is_secondary_rate_limit(response)):
+            delay = _retry_delay(response, attempt)
+            logger.warning("%s on %s, retrying in %.1fs...", response.status_code, url, delay)
+            response.close()
+            time.sleep(delay)
+            continue
+        return response
+
+def http_get(url, headers=None, params=None, timeout=None, retries=None, stream=False):
+    """GET through the shared keep-alive session (see http_request)."""
+    return http_request("GET", url, headers=headers, params=params, timeout=timeout, retries=retries, stream=stream)
+
+def http_post(url, json=None, headers=None, timeout=None, retries=None):
+    """POST through the shared keep-alive session (see http_request)."""
+    return http_request("POST", url, headers=headers, json=json, timeout=timeout, retries=retries)
@@ -0,0 +1,207 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+from flask import Blueprint, jsonify
+
+from metrics import Gauge, register_collector
+from pipeline import build_report, run_analysis
+from response_cache import token_scope
+from response_shaping import json_response, shape_from_request
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_TTL = float(os.getenv("JOB_TTL", "3600"))
+
+JOBS_QUEUED = Gauge("blink_job_queue_depth", "Async analysis jobs waiting for a worker.")
+JOBS_RUNNING = Gauge("blink_jobs_running", "Async analysis jobs being run.")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, owner, repo, token, backend, key):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.repo = repo
+        self.token = token
+        self.backend = backend
+        self.key = key
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.results = {}
+        self.stages = {}
+        self.report = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def on_stage(self, name, value, info):
+        with self._lock:
+            if info["status"] == "ok":
+                self.results[name] = value
+            self.stages[name] = info
+
+    def to_dict(self):
+        with self._lock:
+            results, stages = dict(self.results), dict(self.stages)
+        data = {
+            "job_id": self.id,
+            "owner": self.owner,
+            "repo": self.repo,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "completed_sections": list(stages),
+            "report": self.report or build_report(results, stages),
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class JobQueue:
+    """In-process bounded job queue drained by a pool of background workers.
+    Identical requests (owner/repo, scan backend, token) that are still
+    queued or running share one job."""
+
+    def __init__(self, workers=JOB_WORKERS, maxsize=JOB_QUEUE_SIZE, ttl=JOB_TTL):
+        self.ttl = ttl
+        self._closed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._jobs = {}
+        self._active = {}
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, owner, repo, token, backend=None):
+        """Return (job, created). Raises QueueFull when the queue is at capacity."""
+        key = (owner.lower(), repo.lower(), backend, token_scope(token))
+        with self._lock:
+            if self._closed:
+                raise QueueFull("Server is shutting down")
+            self._prune()
+            active = self._active.get(key)
+            if active:
+                return active, False
+            job = Job(owner, repo, token, backend, key)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFull(f"Job queue is full ({self._queue.maxsize} pending)")
+            self._jobs[job.id] = job
+            self._active[key] = job
+            return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for job in self._active.values() if job.status == "running")
+        return {"queued": self._queue.qsize(), "running": running,
+                "capacity": self._queue.maxsize, "closed": self._closed}
+
+    def close(self):
+        """Refuse new jobs from now on. A plain flag write, so it is safe to
+        call from a signal handler."""
+        self._closed = True
+
+    def drain(self, timeout):
+        """Stop accepting jobs and wait up to `timeout` seconds for queued and
+        running ones to finish. Returns True if everything finished."""
+        self.close()
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.1)
+        return not self._queue.unfinished_tasks
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.report = run_analysis(job.owner, job.repo, job.token, job.backend, on_stage=job.on_stage)
+                job.status = "done" if job.report["raw_data"] else "failed"
+                if not job.report["raw_data"]:
+                    job.error = "Repository scan failed"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                job.token = None
+                job.finished_at = time.time()
+                with self._lock:
+                    if self._active.get(job.key) is job:
+                        del self._active[job.key]
+                self._queue.task_done()
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Return the process-wide job queue, starting its workers on first use."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+    return _job_queue
+
+@register_collector
+def _collect_jobs():
+    if _job_queue is not None:
+        stats = _job_queue.stats()
+        JOBS_QUEUED.set(stats["queued"])
+        JOBS_RUNNING.set(stats["running"])
+
+def close_jobs():
+    """Shutdown hook: refuse new async jobs (see JobQueue.close)."""
+    if _job_queue is not None:
+        _job_queue.close()
+
+def drain_jobs(timeout):
+    """Graceful-shutdown hook: let accepted jobs finish (see JobQueue.drain)."""
+    return _job_queue.drain(timeout) if _job_queue is not None else True
+
+def submit_analysis_job(owner, repo, token, backend=None):
+    """Queue an analysis and build the 202 response for POST /analyze?async=1."""
+    try:
+        job, created = get_job_queue().submit(owner, repo, token, backend)
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({"job_id": job.id, "status": job.status, "deduplicated": not created,
+                    "status_url": f"/jobs/{job.id}"}), 202
+
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status, completed sections and the (partial or final) report of a job.
+    Accepts the same ?fields= and ?compact=1 as /analyze for the report."""
+    job = get_job_queue().get(job_id)
+    if not job:
+        return jsonify({"error": "Unknown job id"}), 404
+    data = job.to_dict()
+    data["report"] = shape_from_request(data["report"])
+    return json_response(data)
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+import time
+
+from metrics import Counter, Gauge, register_collector
+from response_cache import CACHE_DIR
+from sqlite_db import SQLiteDB, evict_lru
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_results.sqlite3"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+LLM_CACHE_LOOKUPS = Counter("blink_llm_cache_lookups_total", "LLM result cache lookups: hit or miss.", ["result"])
+LLM_CACHE_BYTES = Gauge("blink_llm_cache_bytes", "Size of the cached LLM outputs.")
+LLM_CACHE_ENTRIES = Gauge("blink_llm_cache_entries", "LLM outputs in the result cache.")
+
+
+def prompt_key(model_id, prompt):
+    """Content address of a generation request."""
+    return hashlib.sha256(f"{model_id}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Persistent cache of model outputs keyed by hash(model id, prompt),
+    with a TTL, size-bounded LRU eviction and hit/miss counters."""
+
+    def __init__(self, path=LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._db = SQLiteDB(
+            path,
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, model TEXT, text TEXT,"
+            " size INTEGER, created REAL, accessed REAL)",
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)",
+        )
+
+    def get(self, model_id, prompt):
+        """Return the cached output for (model_id, prompt), or None."""
+        key = prompt_key(model_id, prompt)
+        now = time.time()
+        with self._db.transaction() as conn:
+            row = conn.execute("SELECT text, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl:
+                conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[0]
+            if row:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+    def put(self, model_id, prompt, text):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (prompt_key(model_id, prompt), model_id, text, size, now, now),
+            )
+            conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+            evict_lru(conn, "results", self.max_bytes)
+
+    def stats(self):
+        entries, size = self._db.fetchone("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results")
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """Return the process-wide LLM result cache, or None when disabled."""
+    global _cache
+    if LLM_CACHE_MAX_BYTES <= 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
+
+@register_collector
+def _collect_llm_cache():
+    if _cache is not None:
+        stats = _cache.stats()
+        LLM_CACHE_LOOKUPS.replace({("hit",): stats["hits"], ("miss",): stats["misses"]})
+        LLM_CACHE_BYTES.set(stats["bytes"])
+        LLM_CACHE_ENTRIES.set(stats["entries"])
@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import threading
+
+from dotenv import load_dotenv
+
+from llm_cache import get_llm_cache
+from metrics import Counter, timed
+
+logger = logging.getLogger(__name__)
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
+
+GEMINI_MODEL_ID = os.getenv("GEMINI_MODEL_ID", "gemini-2.5-flash")
+# "gemini" talks to Google; "fake" uses FakeModel so the app runs without a key or network.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+# "separate": one call per summary; "combined": one structured call for both.
+LLM_MODE = os.getenv("LLM_MODE", "separate")
+LLM_MODES = ("separate", "combined")
+
+_in_flight = threading.BoundedSemaphore(LLM_MAX_IN_FLIGHT)
+
+LLM_REQUESTS = Counter("blink_llm_requests_total", "LLM generations by model and outcome.", ["model", "result"])
+_models = {}
+_configured = False
+_lock = threading.Lock()
+_model_factory = None
+
+
+class LLMUnavailable(Exception):
+    pass
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel. Answers deterministically and,
+    when JSON output is requested, with every key the prompt asks for."""
+
+    def __init__(self, model_id, latency=0.0):
+        self.model_id = model_id
+        self.latency = latency
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        if self.latency:
+            threading.Event().wait(self.latency)
+        summary = f"[{self.model_id}] summary of a {len(prompt)}-character prompt."
+        if (generation_config or {}).get("response_mime_type") == "application/json":
+            return _FakeResponse(json.dumps({key: summary for key in COMBINED_KEYS}))
+        return _FakeResponse(summary)
+
+
+def set_model_factory(factory):
+    """Override how models are built (factory(model_id) -> model); None restores the default."""
+    global _model_factory
+    with _lock:
+        _model_factory = factory
+        _models.clear()
+
+def is_available():
+    return LLM_BACKEND == "fake" or _model_factory is not None or bool(os.getenv("GOOGLE_API_KEY"))
+
+def _get_model(model_id):
+    global _configured
+    model = _models.get(model_id)
+    if model is not None:
+        return model
+    with _lock:
+        if model_id not in _models:
+            if _model_factory is not None:
+                _models[model_id] = _model_factory(model_id)
+            elif LLM_BACKEND == "fake":
+                _models[model_id] = FakeModel(model_id)
+            else:
+                import google.generativeai as genai
+                if not _configured:
+                    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                    _configured = True
+                _models[model_id] = genai.GenerativeModel(model_id)
+        return _models[model_id]
+
+def generate(prompt, model_id=None, json_output=False, timeout=None, parse=None):
+    """Run one generation through the shared client and the result cache.
+    Waits at most `timeout` seconds (LLM_TIMEOUT) for an in-flight slot and
+    as long again for the model; raises LLMUnavailable when no slot frees up.
+    `parse(text)` turns the answer into the return value; an answer it rejects
+    with ValueError is raised to the caller and never cached."""
+    model_id = model_id or GEMINI_MODEL_ID
+    timeout = timeout or LLM_TIMEOUT
+    parse = parse or (lambda text: text)
+    cache = get_llm_cache()
+    cache_id = f"{model_id}:json" if json_output else model_id
+    cached = cache.get(cache_id, prompt) if cache else None
+    if cached is not None:
+        try:
+            result = parse(cached)
+        except ValueError:
+            logger.warning("Discarding unparseable cached Gemini result (%s).", model_id)
+        else:
+            logger.debug("Gemini result served from cache (%s).", model_id)
+            LLM_REQUESTS.inc(model_id, "cached")
+            return result
+
+    with timed("llm.slot_wait"):
+        acquired = _in_flight.acquire(timeout=timeout)
+    if not acquired:
+        LLM_REQUESTS.inc(model_id, "no_slot")
+        raise LLMUnavailable(f"No free LLM slot within {timeout}s ({LLM_MAX_IN_FLIGHT} in flight)")
+    try:
+        model = _get_model(model_id)
+        generation_config = {"response_mime_type": "application/json"} if json_output else None
+        try:
+            with timed("llm.generate"):
+                text = model.generate_content(prompt, generation_config=generation_config,
+                                              request_options={"timeout": timeout}).text
+        except Exception:
+            LLM_REQUESTS.inc(model_id, "error")
+            raise
+        LLM_REQUESTS.inc(model_id, "generated")
+    finally:
+        _in_flight.release()
+
+    try:
+        result = parse(text)
+    except ValueError:
+        LLM_REQUESTS.inc(model_id, "invalid")
+        raise
+    if cache and text:
+        cache.put(cache_id, prompt, text)
+    return result
+
+
+COMBINED_KEYS = ("dependency_summary", "tech_stack_summary")
+
+def generate_combined(prompts, model_id=None, timeout=None):
+    """Answer several prompts with one structured call.
+    `prompts` maps output key -> prompt; returns key -> text (None if missing)."""
+    sections = "\n\n".join(f"### Task `{key}`\n{prompt.strip()}" for key, prompt in prompts.items())
+    prompt = (
+        "Complete each task below. Respond with a single JSON object whose keys are "
+        f"{', '.join(prompts)} and whose values are the plain-text answer to that task.\n\n"
+        f"{sections}"
+    )
+
+    def parse(text):
+        # Truncated or incomplete answers raise, so they are retried rather than cached.
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        missing = [key for key in prompts if not isinstance(data.get(key), str) or not data[key].strip()]
+        if missing:
+            raise ValueError(f"Missing answers for: {', '.join(missing)}")
+        return {key: data[key] for key in prompts}
+
+    return generate(prompt, model_id=model_id, json_output=True, timeout=timeout, parse=parse)
@@ -0,0 +1,343 @@
+import json
+import re
+
+# Lockfile parsers. Each one consumes the file as an iterable of text chunks
+# and keeps only the dependency graph, so memory depends on the number of
+# distinct packages rather than on the size of the file.
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+_NAME_NORMALIZE = re.compile(r"[-_.]+")
+
+
+class DependencyGraph:
+    """Deduplicated (package, version) nodes and the edges between them."""
+
+    def __init__(self):
+        self._ids = {}
+        self.nodes = []
+        self.edges = set()
+        self.direct = set()
+
+    def add(self, name, version):
+        key = (name, version)
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+        return node
+
+    def link(self, parent, child):
+        """Record that `parent` depends on `child`; a None parent is the project itself."""
+        if child is None:
+            return
+        if parent is None:
+            self.direct.add(child)
+        elif parent != child:
+            self.edges.add((parent, child))
+
+    def top_level(self):
+        """Direct dependencies, or the packages nothing else depends on when
+        the lockfile does not record which ones are direct."""
+        if self.direct:
+            return sorted(self.direct)
+        required = {child for _, child in self.edges}
+        return [node for node in range(len(self.nodes)) if node not in required]
+
+    def top_level_versions(self):
+        versions = {}
+        for node in self.top_level():
+            name, version = self.nodes[node]
+            versions.setdefault(name, version)
+        return versions
+
+    def summary(self):
+        """Counts for reports; the graph itself can run to megabytes."""
+        return {"packages": len(self.nodes), "edges": len(self.edges), "direct": len(self.top_level())}
+
+
+class _JsonStream:
+    """Walk a JSON document from a chunk iterator one object member at a time.
+    Only the value being decoded is held in memory."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size=1):
+        """Read until at least `size` unconsumed characters are buffered; False at end of input."""
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        read = False
+        while len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return read
+            self._buf += chunk
+            read = True
+        return True
+
+    def _peek(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode the value at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value: buffer twice as much and retry, so large values stay linear.
+                if self._fill(2 * (len(self._buf) - self._pos) + 1):
+                    continue
+                raise
+            # A number cut by a chunk boundary ("12|34", "1.|5", "1e|3") decodes
+            # short; retry while everything after it could still belong to it.
+            if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                    and _NUMBER_TAIL.match(self._buf, end) and self._fill(len(self._buf) - self._pos + 1):
+                continue
+            self._pos = end
+            return value
+
+    def members(self):
+        """Yield the keys of the object at the current position. The caller
+        must consume each member's value (`value()` or `members()`) before
+        asking for the next key."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}', found {separator!r}")
+
+
+def _lines(chunks):
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        yield from lines
+    if pending:
+        yield pending
+
+def _unquote(value):
+    return value.strip().strip('"').strip("'")
+
+
+# --- npm: package-lock.json / npm-shrinkwrap.json ---
+
+_NPM_EDGE_FIELDS = ("dependencies", "optionalDependencies", "peerDependencies")
+
+def _resolve_npm(paths, path, name):
+    """Node's lookup: the nearest node_modules/<name> from `path` upwards."""
+    while True:
+        found = paths.get(f"{path}/node_modules/{name}" if path else f"node_modules/{name}")
+        if found is not None or not path:
+            return found
+        cut = path.rfind("/node_modules/")
+        path = path[:cut] if cut >= 0 else ""
+
+def _walk_npm_v1(entries, parent_path, paths, requires):
+    """lockfileVersion 1: nested "dependencies" mirror the node_modules tree."""
+    for name, entry in entries.items():
+        if not isinstance(entry, dict):
+            continue
+        path = f"{parent_path}/node_modules/{name}" if parent_path else f"node_modules/{name}"
+        if entry.get("version"):
+            paths[path] = (name, entry["version"])
+            requires.append((path, tuple(entry.get("requires") or ())))
+        _walk_npm_v1(entry.get("dependencies") or {}, path, paths, requires)
+
+def parse_package_lock(chunks):
+    """package-lock.json v1-v3. Reads "packages" (v2+) entry by entry and
+    stops there; v1 files are walked through their nested "dependencies"."""
+    stream = _JsonStream(chunks)
+    graph = DependencyGraph()
+    paths = {}
+    requires = []   # (path, dependency names, whether the path is the project's own)
+    names_seen = {}  # one string object per dependency name, however often it is required
+    for key in stream.members():
+        if key == "packages":
+            for path in stream.members():
+                entry = stream.value()
+                if not isinstance(entry, dict) or entry.get("link"):
+                    continue
+                names = tuple(names_seen.setdefault(name, name)
+                              for field in _NPM_EDGE_FIELDS for name in (entry.get(field) or ()))
+                if "node_modules/" not in path:
+                    # The root ("") or a workspace package: its dependencies are direct.
+                    requires.append((path, names + tuple(entry.get("devDependencies") or ()), True))
+                    continue
+                version = entry.get("version")
+                if version:
+                    name = entry.get("name") or path[path.rfind("node_modules/") + len("node_modules/"):]
+                    paths[path] = graph.add(name, version)
+                    requires.append((path, names, False))
+            break
+        if key == "dependencies":
+            # v1: decoded one top-level package (with its nested tree) at a time.
+            for name in stream.members():
+                nested = {}
+                v1_requires = []
+                _walk_npm_v1({name: stream.value()}, "", nested, v1_requires)
+                for path, pair in nested.items():
+                    paths[path] = graph.add(*pair)
+                requires += [(path, names, False) for path, names in v1_requires]
+            continue
+        stream.value()
+
+    for path, names, is_project in requires:
+        parent = None if is_project else paths[path]
+        for name in names:
+            graph.link(parent, _resolve_npm(paths, path, name))
+    return graph
+
+
+# --- npm: yarn.lock (classic and berry) ---
+
+def _yarn_spec(spec):
+    """'@scope/name@^1.0' -> ('@scope/name', '^1.0')."""
+    spec = _unquote(spec)
+    at = spec.find("@", 1)
+    return (spec[:at], spec[at + 1:]) if at > 0 else (spec, "")
+
+def parse_yarn_lock(chunks):
+    graph = DependencyGraph()
+    specs = {}      # "name@range" -> node id
+    requires = []   # (node id or None for workspaces, [(name, range)])
+    entry = None
+
+    def finish():
+        if not entry:
+            return
+        if any(spec_range.startswith("workspace:") for _, spec_range in entry["specs"]):
+            requires.append((None, entry["deps"]))
+        elif entry["version"] and entry["specs"]:
+            node = graph.add(entry["specs"][0][0], entry["version"])
+            for name, spec_range in entry["specs"]:
+                specs[f"{name}@{spec_range}"] = node
+            requires.append((node, entry["deps"]))
+
+    in_deps = False
+    for line in _lines(chunks):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        text = line.strip()
+        if indent == 0:
+            finish()
+            entry = None
+            in_deps = False
+            if text.endswith(":") and not text.startswith("__metadata"):
+                entry = {"specs": [_yarn_spec(s) for s in text[:-1].split(",")], "version": None, "deps": []}
+        elif entry is None:
+            continue
+        elif indent == 2:
+            in_deps = text.rstrip(":") in ("dependencies", "optionalDependencies") and text.endswith(":")
+            field, _, value = text.partition(" ")
+            if field.rstrip(":") == "version":
+                entry["version"] = _unquote(value)
+        elif in_deps:
+            if text.startswith('"'):
+                name, _, spec_range = text[1:].partition('"')
+            else:
+                name, _, spec_range = text.partition(" ")
+            entry["deps"].append((name.rstrip(":"), _unquote(spec_range.lstrip(": "))))
+    finish()
+
+    for node, deps in requires:
+        for name, spec_range in deps:
+            graph.link(node, specs.get(f"{name}@{spec_range}", specs.get(f"{name}@npm:{spec_range}")))
+    return graph
+
+
+# --- PyPI: poetry.lock / Pipfile.lock ---
+
+def _normalize(name):
+    return _NAME_NORMALIZE.sub("-", name).lower()
+
+def parse_poetry_lock(chunks):
+    graph = DependencyGraph()
+    by_name = {}
+    requires = []
+    section = None
+    entry = None
+
+    def finish():
+        if entry and entry.get("name") and entry.get("version"):
+            node = graph.add(entry["name"], entry["version"])
+            by_name[_normalize(entry["name"])] = node
+            requires.append((node, entry["deps"]))
+
+    for line in _lines(chunks):
+        text = line.strip()
+        if text.startswith("["):
+            section = text
+            if text == "[[package]]":
+                finish()
+                entry = {"deps": []}
+            elif not text.startswith("[package."):
+                finish()
+                entry = None
+            continue
+        if entry is None or not text or line[0] in " \t" or "=" not in text:
+            continue
+        key, _, value = text.partition("=")
+        key = _unquote(key)
+        if section == "[[package]]" and key in ("name", "version"):
+            entry[key] = _unquote(value)
+        elif section == "[package.dependencies]":
+            entry["deps"].append(_normalize(key))
+    finish()
+
+    for node, deps in requires:
+        for name in deps:
+            graph.link(node, by_name.get(name))
+    return graph
+
+def parse_pipfile_lock(chunks):
+    """Pipfile.lock pins every package (direct or not) under "default" and
+    "develop" without recording edges."""
+    stream = _JsonStream(chunks)
+    graph = DependencyGraph()
+    for key in stream.members():
+        if key not in ("default", "develop"):
+            stream.value()
+            continue
+        for name in stream.members():
+            entry = stream.value()
+            version = entry.get("version", "") if isinstance(entry, dict) else ""
+            if version.startswith("=="):
+                graph.add(name, version[2:])
+    return graph
+
+
+# filename -> (parser, ecosystem)
+LOCKFILE_TYPES = {
+    "package-lock.json": (parse_package_lock, "npm"),
+    "npm-shrinkwrap.json": (parse_package_lock, "npm"),
+    "yarn.lock": (parse_yarn_lock, "npm"),
+    "poetry.lock": (parse_poetry_lock, "pypi"),
+    "Pipfile.lock": (parse_pipfile_lock, "pypi"),
+}
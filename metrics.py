@@ -0,0 +1,216 @@
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; spans cache hits (sub-millisecond) up to slow Gemini calls.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def replace(self, values):
+        """Swap in a full {labels: value} snapshot (used by scrape-time collectors
+        mirroring counters and gauges kept by other modules)."""
+        with self._lock:
+            self._values = dict(values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines += self._samples()
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self):
+        return [f"{self.name}{_labels(self.labels, key)} {_number(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self):
+        return [f"{self.name}{_labels(self.labels, key)} {_number(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+def register_collector(fn):
+    """Call `fn()` before every scrape, to refresh gauges computed from other modules' state."""
+    _collectors.append(fn)
+    return fn
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    for collect in _collectors:
+        collect()
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = Histogram(
+    "blink_stage_duration_seconds", "Latency of instrumented stages.", ["stage"])
+STAGE_ERRORS = Counter(
+    "blink_stage_errors_total", "Instrumented stages that raised.", ["stage"])
+UPSTREAM_REQUESTS = Counter(
+    "blink_upstream_requests_total", "Outbound HTTP requests by host and status.", ["host", "status"])
+UPSTREAM_SECONDS = Histogram(
+    "blink_upstream_request_duration_seconds", "Latency of outbound HTTP requests.", ["host"])
+
+
+# Per-request stage breakdown for ?profile=1; None when the request did not ask for one.
+_profile = contextvars.ContextVar("profile", default=None)
+
+
+class Profile:
+    """Stage timings collected for one request, aggregated by stage name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    def record(self, stage, elapsed, error=False):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed * 1000
+            entry["max_ms"] = max(entry["max_ms"], elapsed * 1000)
+            entry["errors"] += int(error)
+
+    def summary(self):
+        with self._lock:
+            stages = {name: {key: round(value, 2) if isinstance(value, float) else value
+                             for key, value in entry.items()}
+                      for name, entry in sorted(self.stages.items(), key=lambda item: -item[1]["total_ms"])}
+        return {"wall_ms": round((time.perf_counter() - self.started) * 1000, 2), "stages": stages}
+
+
+@contextmanager
+def profiled():
+    """Collect a stage breakdown for everything timed inside the block (and the threads it propagates to)."""
+    profile = Profile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+def propagate(fn):
+    """Wrap `fn` so a worker thread running it records into the caller's profile."""
+    profile = _profile.get()
+    if profile is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _profile.set(profile)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _profile.reset(token)
+    return run
+
+
+@contextmanager
+def timed(stage):
+    """Observe the block's latency under `stage`, counting it as an error if it raises."""
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        STAGE_ERRORS.inc(stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage)
+        profile = _profile.get()
+        if profile is not None:
+            profile.record(stage, elapsed, error)
+
+def instrumented(stage):
+    """Decorator form of `timed`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,91 @@
+import functools
+import hmac
+import os
+import time
+
+from flask import Blueprint, Response, g, jsonify, request
+
+from llm_cache import get_llm_cache
+from metrics import Counter, Histogram, render
+from pipeline import analyses
+from rate_limiter import scheduler
+from report_cache import get_report_cache
+
+# Bearer token for the endpoints that change server state; they are disabled while unset.
+OPS_TOKEN = os.getenv("OPS_TOKEN", "")
+
+ops_bp = Blueprint("ops", __name__)
+
+HTTP_REQUESTS = Counter(
+    "blink_http_requests_total", "Requests served, by route, method and status.", ["route", "method", "status"])
+HTTP_SECONDS = Histogram(
+    "blink_http_request_duration_seconds", "Time to produce a response (first byte for streams).", ["route"])
+
+
+@ops_bp.before_app_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@ops_bp.after_app_request
+def _record_request(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_SECONDS.observe(time.perf_counter() - started, route)
+        HTTP_REQUESTS.inc(route, request.method, str(response.status_code))
+    return response
+
+
+def admin_only(view):
+    """Require `Authorization: Bearer $OPS_TOKEN`; 403 while no OPS_TOKEN is configured."""
+    @functools.wraps(view)
+    def guarded(*args, **kwargs):
+        if not OPS_TOKEN:
+            return jsonify({"error": "Admin endpoints are disabled (OPS_TOKEN is not set)"}), 403
+        supplied = request.headers.get("Authorization", "").encode()
+        if not hmac.compare_digest(supplied, f"Bearer {OPS_TOKEN}".encode()):
+            return jsonify({"error": "Unauthorized"}), 401
+        return view(*args, **kwargs)
+    return guarded
+
+
+@ops_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage latencies, upstream status counters and rate-limit gauges in Prometheus text format."""
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+@ops_bp.route('/rate-limit', methods=['GET'])
+def rate_limit_status():
+    """GitHub scheduler queue depth, wait times and per-token quota."""
+    return jsonify(scheduler.stats()), 200
+
+
+@ops_bp.route('/llm-cache', methods=['GET'])
+def llm_cache_status():
+    """Hit/miss counters and size of the Gemini result cache."""
+    cache = get_llm_cache()
+    return jsonify(cache.stats() if cache else {"enabled": False}), 200
+
+
+@ops_bp.route('/report-cache', methods=['GET'])
+def report_cache_status():
+    """Hit ratio, per-tier hits and background refreshes of the report cache."""
+    cache = get_report_cache()
+    return jsonify(cache.stats() if cache else {"enabled": False}), 200
+
+
+@ops_bp.route('/report-cache/<owner>/<repo>', methods=['DELETE'])
+@admin_only
+def invalidate_report(owner, repo):
+    """Drop the cached reports of one repository so the next /analyze recomputes them.
+    Every worker sharing the scan store stops serving them."""
+    cache = get_report_cache()
+    return jsonify({"invalidated": cache.invalidate(owner, repo) if cache else 0}), 200
+
+
+@ops_bp.route('/coalescing', methods=['GET'])
+def coalescing_status():
+    """Leader/follower counts of /analyze request coalescing."""
+    return jsonify(analyses.stats()), 200
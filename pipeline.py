@@ -0,0 +1,193 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from repo_explorer import deep_scan_repo
+from health_index import calculate_health_index
+from ai_summarizer import (flatten_dependencies, scan_manifests, summarize_combined_ai,
+                           summarize_dependencies_ai, summarize_tech_stack_ai)
+from llm_gateway import LLM_MODE
+from metrics import Counter, Gauge, profiled, propagate, register_collector, timed
+from response_cache import token_scope
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """A named unit of work that runs once all stages in `requires` succeeded
+    and those in `optional` finished either way. `func` is called with the
+    results of both as keyword arguments (None for a failed optional stage)."""
+
+    def __init__(self, name, func, requires=(), optional=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.optional = tuple(optional)
+
+
+def run_stages(stages, on_stage=None):
+    """Run a small DAG of stages, starting each as soon as its inputs are ready.
+    A failing stage only skips the stages that depend on it.
+    `on_stage(name, value, info)` is called as each stage finishes.
+    Returns (results, stage_report) keyed by stage name."""
+    pending = {stage.name: stage for stage in stages}
+    results = {}
+    report = {}
+    running = {}
+
+    def _run(stage, kwargs):
+        started = time.perf_counter()
+        try:
+            with timed(f"pipeline.{stage.name}"):
+                return stage.func(**kwargs), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(len(stages), 1), thread_name_prefix="stage") as pool:
+        while pending or running:
+            changed = True
+            while changed:
+                changed = False
+                for name, stage in list(pending.items()):
+                    if any(report.get(dep, {}).get("status") in ("error", "skipped") for dep in stage.requires):
+                        report[name] = {"status": "skipped", "duration_ms": 0}
+                    elif all(dep in results for dep in stage.requires) \
+                            and all(dep in report for dep in stage.optional):
+                        kwargs = {dep: results.get(dep) for dep in stage.requires + stage.optional}
+                        running[pool.submit(propagate(_run), stage, kwargs)] = name
+                    else:
+                        continue
+                    del pending[name]
+                    changed = True
+
+            if not running:
+                # Whatever is left requires a stage that was never declared.
+                for name in pending:
+                    report[name] = {"status": "skipped", "duration_ms": 0}
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                value, error, elapsed = future.result()
+                report[name] = {"status": "ok" if error is None else "error",
+                                "duration_ms": round(elapsed * 1000, 1)}
+                if error is None:
+                    results[name] = value
+                else:
+                    logger.error("Stage '%s' failed: %s", name, error)
+                    report[name]["error"] = str(error)
+                if on_stage:
+                    on_stage(name, value, report[name])
+
+    return results, report
+
+
+def _scan(owner, repo, token, backend=None):
+    results = deep_scan_repo(owner, repo, token, backend=backend)
+    if not results:
+        raise RuntimeError("Repository scan failed")
+    return results
+
+def analysis_stages(owner, repo, token, backend=None):
+    """Stage graph behind /analyze: the scan and the dependency branch run side by side.
+    With LLM_MODE=combined both summaries come from one Gemini call that waits for both branches;
+    if the dependency branch fails, the tech stack is summarized on its own."""
+    stages = [
+        Stage("scan", lambda: _scan(owner, repo, token, backend)),
+        Stage("health", lambda scan: calculate_health_index(scan), requires=["scan"]),
+        Stage("manifests", lambda: scan_manifests(owner, repo, token)),
+        Stage("dependencies", lambda manifests: flatten_dependencies(manifests["manifests"]), requires=["manifests"]),
+    ]
+    if LLM_MODE == "combined":
+        return stages + [
+            Stage("ai_summaries",
+                  lambda scan, dependencies: summarize_combined_ai(dependencies, scan.get("contents", [])),
+                  requires=["scan", "dependencies"]),
+            Stage("tech_stack",
+                  lambda scan, ai_summaries: ai_summaries["tech_stack_summary"] if ai_summaries is not None
+                  else summarize_tech_stack_ai(scan.get("contents", [])),
+                  requires=["scan"], optional=["ai_summaries"]),
+            Stage("dependency_summary", lambda ai_summaries: ai_summaries["dependency_summary"],
+                  requires=["ai_summaries"]),
+        ]
+    return stages + [
+        Stage("tech_stack", lambda scan: summarize_tech_stack_ai(scan.get("contents", [])), requires=["scan"]),
+        Stage("dependency_summary",
+              lambda dependencies: summarize_dependencies_ai(dependencies) if dependencies else None,
+              requires=["dependencies"]),
+    ]
+
+def run_health_check(owner, repo, token, backend=None):
+    """Scan, health score and dependency versions only (no Gemini calls)."""
+    stages = [s for s in analysis_stages(owner, repo, token, backend)
+              if s.name in ("scan", "health", "manifests", "dependencies")]
+    results, stages = run_stages(stages)
+    manifests = results.get("manifests") or {}
+    return {
+        "health_report": results.get("health"),
+        "dependency_report": {
+            "dependencies": results.get("dependencies"),
+            "manifests": manifests.get("manifests"),
+            "truncated": manifests.get("truncated")
+        },
+        "stages": stages
+    }
+
+def build_report(results, stages):
+    """Assemble the /analyze response from (possibly partial) stage results."""
+    manifests = results.get("manifests") or {}
+    return {
+        "health_report": results.get("health"),
+        "dependency_report": {
+            "ai_summary": results.get("dependency_summary"),
+            "dependencies": results.get("dependencies"),
+            "manifests": manifests.get("manifests"),
+            "truncated": manifests.get("truncated")
+        },
+        "tech_stack_summary": results.get("tech_stack"),
+        "raw_data": results.get("scan"),
+        "stages": stages
+    }
+
+def run_analysis(owner, repo, token, backend=None, on_stage=None):
+    """Run the full analysis pipeline and assemble the /analyze response.
+    `backend` selects the deep_scan_repo backend ("rest" or "graphql")."""
+    results, stages = run_stages(analysis_stages(owner, repo, token, backend), on_stage)
+    return build_report(results, stages)
+
+# Concurrent /analyze requests for the same repository share one pipeline run.
+analyses = SingleFlight()
+
+COALESCED = Counter(
+    "blink_analysis_coalescing_total", "/analyze pipeline runs started (leader) or joined (follower).", ["role"])
+IN_FLIGHT = Gauge("blink_analysis_in_flight", "Coalesced /analyze pipeline runs in flight.")
+
+@register_collector
+def _collect_coalescing():
+    stats = analyses.stats()
+    COALESCED.replace({("leader",): stats["leaders"], ("follower",): stats["followers"]})
+    IN_FLIGHT.set(stats["in_flight"])
+
+def run_analysis_shared(owner, repo, token, backend=None):
+    """run_analysis, coalescing concurrent requests for the same repository.
+    A shared report is only handed to a caller with a different token when the
+    repo is public; otherwise (private repo, or the leader's scan failed) the
+    caller runs its own analysis."""
+    scope = token_scope(token)
+    key = (owner.lower(), repo.lower(), backend)
+    (leader_scope, report), shared = analyses.do(
+        key, lambda: (scope, run_analysis(owner, repo, token, backend)))
+    if shared and leader_scope != scope:
+        metadata = (report["raw_data"] or {}).get("metadata") or {}
+        if not report["raw_data"] or metadata.get("private", True):
+            return run_analysis(owner, repo, token, backend)
+    return dict(report)
+
+def run_analysis_profiled(owner, repo, token, backend=None):
+    """run_analysis with a per-stage timing breakdown under "profile".
+    Never coalesced, so the timings belong to this request alone."""
+    with profiled() as profile:
+        report = run_analysis(owner, repo, token, backend)
+    report["profile"] = profile.summary()
+    return report
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+
+from metrics import Counter, Gauge, Histogram, register_collector
+from response_cache import token_scope
+
+# Extra tokens to rotate onto when the caller's token runs dry. They are only
+# lent out for repositories already confirmed public (see github_client), so
+# whatever private access they have is never exposed to callers.
+GITHUB_TOKEN_POOL = [t.strip() for t in os.getenv("GITHUB_TOKEN_POOL", "").split(",") if t.strip()]
+RATE_LIMIT_RESERVE = int(os.getenv("RATE_LIMIT_RESERVE", "5"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "900"))
+# Below this fraction of the hourly quota, requests are spread evenly over the reset window.
+RATE_LIMIT_PACE_BELOW = float(os.getenv("RATE_LIMIT_PACE_BELOW", "0.1"))
+# Seconds between sweeps that forget callers' tokens whose quota window has passed.
+QUOTA_PRUNE_INTERVAL = 60
+
+
+class _Quota:
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = 0.0
+        self.next_allowed = 0.0
+
+    def expired(self, now):
+        """Nothing known about this quota still applies."""
+        return now >= self.reset and now >= self.next_allowed
+
+    def available(self, now, reserve):
+        if now < self.next_allowed:
+            return False
+        if self.remaining is None or now >= self.reset:
+            return True
+        return self.remaining > reserve
+
+
+class RateLimitScheduler:
+    """Central gate for GitHub requests.
+
+    Tracks X-RateLimit-* / Retry-After per (token, resource), paces requests
+    once quota runs low, rotates onto pool tokens (when the caller allows it)
+    and queues callers while every usable token is exhausted. Callers' tokens
+    are forgotten once their reset time has passed, so the table stays bounded
+    by the tokens active within the last rate-limit window."""
+
+    def __init__(self, pool=(), reserve=RATE_LIMIT_RESERVE, max_wait=RATE_LIMIT_MAX_WAIT,
+                 pace_below=RATE_LIMIT_PACE_BELOW):
+        self.pool = list(pool)
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.pace_below = pace_below
+        self._quotas = {}
+        self._pruned = 0.0
+        self._cond = threading.Condition()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def _quota(self, token, resource):
+        return self._quotas.setdefault((token, resource), _Quota())
+
+    def _candidates(self, token, use_pool):
+        return [token] + [t for t in self.pool if t != token] if use_pool else [token]
+
+    def _prune(self, now):
+        if now - self._pruned < QUOTA_PRUNE_INTERVAL:
+            return
+        self._pruned = now
+        for key in [key for key, q in self._quotas.items() if key[0] not in self.pool and q.expired(now)]:
+            del self._quotas[key]
+
+    def _pick(self, token, resource, now, use_pool):
+        usable = [t for t in self._candidates(token, use_pool)
+                  if self._quota(t, resource).available(now, self.reserve)]
+        if not usable:
+            return None
+        if token in usable:
+            return token
+        return max(usable, key=lambda t: self._quota(t, resource).remaining or 0)
+
+    def _next_change(self, token, resource, now, use_pool):
+        times = []
+        for t in self._candidates(token, use_pool):
+            q = self._quota(t, resource)
+            times.append(max(q.next_allowed, q.reset if q.remaining is not None else 0))
+        return max(min(times) - now, 0.05)
+
+    def acquire(self, token, resource="core", use_pool=False):
+        """Block until a token with quota is available and return it, or None
+        if nothing frees up within max_wait seconds. Pool tokens are only
+        considered with `use_pool`."""
+        with self._cond:
+            started = time.monotonic()
+            queued = False
+            while True:
+                now = time.time()
+                chosen = self._pick(token, resource, now, use_pool)
+                if chosen:
+                    break
+                waited = time.monotonic() - started
+                if waited >= self.max_wait:
+                    self.timeouts += 1
+                    if queued:
+                        self.queue_depth -= 1
+                    return None
+                if not queued:
+                    queued = True
+                    self.queue_depth += 1
+                    self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+                self._cond.wait(min(self._next_change(token, resource, now, use_pool), self.max_wait - waited))
+
+            if queued:
+                waited = time.monotonic() - started
+                WAIT_SECONDS.observe(waited)
+                self.queue_depth -= 1
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            quota = self._quota(chosen, resource)
+            if quota.remaining is not None:
+                quota.remaining -= 1
+            self.acquired += 1
+            return chosen
+
+    def update(self, token, response, resource="core"):
+        """Record the rate-limit headers of a response made with `token`."""
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        now = time.time()
+        with self._cond:
+            quota = self._quota(token, resource)
+            try:
+                if "X-RateLimit-Remaining" in headers:
+                    quota.remaining = int(headers["X-RateLimit-Remaining"])
+                    quota.limit = int(headers.get("X-RateLimit-Limit", quota.limit or 0)) or None
+                    quota.reset = float(headers.get("X-RateLimit-Reset", quota.reset))
+                if "Retry-After" in headers:
+                    quota.next_allowed = now + float(headers["Retry-After"])
+            except ValueError:
+                pass
+
+            if response.status_code in (403, 429) and quota.remaining == 0:
+                quota.next_allowed = max(quota.next_allowed, quota.reset)
+            elif quota.limit and quota.remaining is not None and quota.remaining < quota.limit * self.pace_below:
+                window = max(quota.reset - now, 0)
+                quota.next_allowed = max(quota.next_allowed, now + window / max(quota.remaining, 1))
+            self._prune(now)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Queue and wait-time counters plus the last known quota per token."""
+        with self._cond:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds, 3),
+                "wait_seconds_max": round(self.max_wait_seconds, 3),
+                "timeouts": self.timeouts,
+                "pool_size": len(self.pool),
+                "tokens": [
+                    {"token": token_scope(token), "resource": resource, "pool": token in self.pool,
+                     "limit": q.limit, "remaining": q.remaining, "reset": q.reset}
+                    for (token, resource), q in self._quotas.items()
+                ],
+            }
+
+
+scheduler = RateLimitScheduler(pool=GITHUB_TOKEN_POOL)
+
+
+QUEUE_DEPTH = Gauge("blink_github_scheduler_queue_depth", "Requests waiting for GitHub quota.")
+WAIT_SECONDS = Histogram(
+    "blink_github_scheduler_wait_seconds", "Time requests queued for GitHub quota before being sent.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900))
+TIMEOUTS = Counter("blink_github_scheduler_timeouts_total", "Requests that gave up waiting for GitHub quota.")
+# Per-token series are exported for pool tokens only: callers' tokens would add
+# a label value for every user ever seen.
+QUOTA_LIMIT = Gauge("blink_github_rate_limit_limit", "Last seen rate-limit ceiling per pool token.", ["token", "resource"])
+QUOTA_REMAINING = Gauge("blink_github_rate_limit_remaining", "Last seen remaining quota per pool token.", ["token", "resource"])
+QUOTA_RESET = Gauge("blink_github_rate_limit_reset_timestamp", "Epoch seconds at which a pool token's quota resets.", ["token", "resource"])
+
+@register_collector
+def _collect_quota():
+    stats = scheduler.stats()
+    QUEUE_DEPTH.set(stats["queue_depth"])
+    TIMEOUTS.replace({(): stats["timeouts"]})
+    known = [q for q in stats["tokens"] if q["pool"] and q["limit"] is not None]
+    QUOTA_LIMIT.replace({(q["token"], q["resource"]): q["limit"] for q in known})
+    QUOTA_REMAINING.replace({(q["token"], q["resource"]): q["remaining"] for q in known})
+    QUOTA_RESET.replace({(q["token"], q["resource"]): q["reset"] for q in known})
@@ -0,0 +1,155 @@
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from response_cache import CACHE_DIR
+from sqlite_db import SQLiteDB
+
+REGISTRY_INDEX_PATH = os.getenv("REGISTRY_INDEX_PATH", os.path.join(CACHE_DIR, "registry_index.sqlite3"))
+# Entries older than this are refreshed on demand; until the refresh succeeds the old value is served.
+REGISTRY_INDEX_MAX_AGE = float(os.getenv("REGISTRY_INDEX_MAX_AGE", str(24 * 3600)))
+REGISTRY_SYNC_CONCURRENCY = int(os.getenv("REGISTRY_SYNC_CONCURRENCY", "32"))
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryIndex:
+    """Local (ecosystem, package) -> latest version table with a fetch timestamp per row."""
+
+    def __init__(self, path=REGISTRY_INDEX_PATH, max_age=REGISTRY_INDEX_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._db = SQLiteDB(
+            path,
+            "CREATE TABLE IF NOT EXISTS versions ("
+            " ecosystem TEXT, package TEXT, latest TEXT, fetched REAL,"
+            " PRIMARY KEY (ecosystem, package))",
+        )
+
+    def get(self, ecosystem, package):
+        """Return (latest, fetched_at) or None. `latest` is None for packages the registry does not know."""
+        return self._db.fetchone(
+            "SELECT latest, fetched FROM versions WHERE ecosystem = ? AND package = ?", (ecosystem, package))
+
+    def is_fresh(self, fetched_at, now=None):
+        return ((now or time.time()) - fetched_at) < self.max_age
+
+    def put(self, ecosystem, package, latest):
+        self.put_many(ecosystem, [(package, latest)])
+
+    def put_many(self, ecosystem, rows):
+        now = time.time()
+        with self._db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?)",
+                [(ecosystem, package, latest, now) for package, latest in rows],
+            )
+
+    def stale(self, ecosystem=None, now=None):
+        """Package names (per ecosystem) whose entry is older than max_age."""
+        cutoff = (now or time.time()) - self.max_age
+        query = "SELECT ecosystem, package FROM versions WHERE fetched < ?"
+        params = [cutoff]
+        if ecosystem:
+            query += " AND ecosystem = ?"
+            params.append(ecosystem)
+        rows = self._db.fetchall(query, params)
+        stale = {}
+        for eco, package in rows:
+            stale.setdefault(eco, []).append(package)
+        return stale
+
+    def stats(self):
+        now = time.time()
+        rows = self._db.fetchall(
+            "SELECT ecosystem, COUNT(*), SUM(fetched >= ?) FROM versions GROUP BY ecosystem",
+            (now - self.max_age,),
+        )
+        return {eco: {"entries": total, "fresh": fresh or 0} for eco, total, fresh in rows}
+
+
+def sync(index, ecosystem, packages, fetcher, concurrency=REGISTRY_SYNC_CONCURRENCY):
+    """Fetch the latest version of every package and write them to the index in one batch.
+
+    Packages whose lookup fails (registry unreachable, 5xx) keep their previous row.
+    Returns (updated, failed) counts.
+    """
+    def fetch(package):
+        try:
+            return package, fetcher(package), True
+        except Exception as e:
+            logger.warning("⚠️ %s/%s: %s", ecosystem, package, e)
+            return package, None, False
+
+    packages = sorted(set(packages))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(fetch, packages))
+    rows = [(package, latest) for package, latest, ok in results if ok]
+    index.put_many(ecosystem, rows)
+    return len(rows), len(results) - len(rows)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_registry_index():
+    """Return the process-wide registry index, or None when disabled (REGISTRY_INDEX_PATH empty)."""
+    global _index
+    if not REGISTRY_INDEX_PATH:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RegistryIndex()
+    return _index
+
+
+def main(argv=None):
+    # Imported here: ai_summarizer consults this module, the CLI needs its fetchers.
+    from ai_summarizer import LATEST_VERSION_FETCHERS
+
+    parser = argparse.ArgumentParser(description="Fill the local registry index in bulk.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_cmd = sub.add_parser("sync", help="fetch latest versions for the given packages")
+    sync_cmd.add_argument("ecosystem", choices=sorted(LATEST_VERSION_FETCHERS))
+    sync_cmd.add_argument("packages", nargs="*")
+    sync_cmd.add_argument("--file", help="file with one package name per line")
+    refresh_cmd = sub.add_parser("refresh", help="re-fetch every entry older than REGISTRY_INDEX_MAX_AGE")
+    refresh_cmd.add_argument("ecosystem", nargs="?", choices=sorted(LATEST_VERSION_FETCHERS))
+    sub.add_parser("stats", help="entry counts per ecosystem")
+    parser.add_argument("--concurrency", type=int, default=REGISTRY_SYNC_CONCURRENCY)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    index = RegistryIndex()
+    if args.command == "stats":
+        for eco, counts in sorted(index.stats().items()):
+            print(f"{eco}: {counts['entries']} entries, {counts['fresh']} fresh")
+        return 0
+
+    if args.command == "sync":
+        packages = list(args.packages)
+        if args.file:
+            with open(args.file, encoding="utf-8") as f:
+                packages += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        targets = {args.ecosystem: packages}
+    else:
+        targets = index.stale(args.ecosystem)
+
+    failed_total = 0
+    for eco, packages in targets.items():
+        if eco not in LATEST_VERSION_FETCHERS:
+            continue
+        start = time.time()
+        updated, failed = sync(index, eco, packages, LATEST_VERSION_FETCHERS[eco], args.concurrency)
+        failed_total += failed
+        print(f"{eco}: {updated} updated, {failed} failed in {time.time() - start:.1f}s")
+    return 1 if failed_total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,138 +1,330 @@
-import requests
 import json
+import logging
 import sys
 import os 
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-GITHUB_API = "https://api.github.com"
+from github_client import GITHUB_API, github_get
+from graphql_scan import fetch_repository_graphql
+from history import HISTORY_LISTINGS, SCAN_HISTORY, collect_history
+from metrics import instrumented, propagate
+from response_cache import token_scope
+from scan_store import get_scan_store
+
+SCAN_CONCURRENCY = int(os.getenv("SCAN_CONCURRENCY", "10"))
+SCAN_BACKEND = os.getenv("SCAN_BACKEND", "rest")
+SCAN_BACKENDS = ("rest", "graphql")
+SCAN_INCREMENTAL = os.getenv("SCAN_INCREMENTAL", "1") == "1"
+
+logger = logging.getLogger(__name__)
 
 def get(url, token):
     """Generic GET helper with authentication and error handling."""
-    headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
-    response = requests.get(url, headers=headers)
+    status, data = github_get(url, token)
     
-    if response.status_code == 200:
-        return response.json()
+    if status == 200:
+        return data
     else:
-        print(f"Error {response.status_code} on {url}")
-        error_data = response.json()
-        print(f"   Message: {error_data.get('message', 'No error message')}")
+        error_data = data if isinstance(data, dict) else {}
+        logger.warning("Error %s on %s: %s", status, url, error_data.get('message', 'No error message'))
         
-        if "community/profile" in url and response.status_code == 404:
-            print("   (This repo may not have a community profile.)")
+        if "community/profile" in url and status == 404:
+            logger.info("(This repo may not have a community profile.)")
             return None
-        if "contents" in url and response.status_code == 404:
-            print("   (Repo appears to be empty or contents are not accessible.)")
+        if "contents" in url and status == 404:
+            logger.info("(Repo appears to be empty or contents are not accessible.)")
             return []
             
         return None
 
+@instrumented("github.fetch_repo_metadata")
 def fetch_repo_metadata(owner, repo, token):
     """Fetch basic repository metadata."""
-    print("Fetching metadata...")
+    logger.debug("Fetching metadata...")
     return get(f"{GITHUB_API}/repos/{owner}/{repo}", token)
 
+def _commit_sample(data, limit=5):
+    return [{"sha": c["sha"], "message": c["commit"]["message"], "date": c["commit"]["author"]["date"]}
+            for c in data[:limit]]
+
+def _contributor_sample(data, limit=5):
+    return [{"login": c.get("login", "Anonymous"), "contributions": c.get("contributions")} for c in data[:limit]]
+
+def _issue_sample(data, limit=5):
+    issues = [i for i in data if "pull_request" not in i][:limit]
+    return [{"title": i["title"], "number": i["number"], "user": i["user"]["login"], "created_at": i["created_at"]} for i in issues]
+
+def _release_sample(data, limit=3):
+    return [{"name": r["name"], "tag_name": r["tag_name"], "published_at": r["published_at"]} for r in data[:limit]]
+
+_SAMPLES = {
+    "commits": _commit_sample,
+    "contributors": _contributor_sample,
+    "issues": _issue_sample,
+    "releases": _release_sample,
+}
+
+@instrumented("github.fetch_commits")
 def fetch_commits(owner, repo, token, limit=5):
     """Fetch the latest commits."""
-    print("Fetching commits...")
+    logger.debug("Fetching commits...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/commits?per_page={limit}", token)
     if data:
-        return [{"sha": c["sha"], "message": c["commit"]["message"], "date": c["commit"]["author"]["date"]} for c in data]
+        return _commit_sample(data, limit)
     return []
 
+@instrumented("github.fetch_contributors")
 def fetch_contributors(owner, repo, token, limit=5):
     """Fetch contributors (limited)."""
-    print("Fetching contributors...")
+    logger.debug("Fetching contributors...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/contributors?per_page={limit}&anon=true", token)
     if data:
-        return [{"login": c.get("login", "Anonymous"), "contributions": c.get("contributions")} for c in data]
+        return _contributor_sample(data, limit)
     return []
 
+@instrumented("github.fetch_issues")
 def fetch_issues(owner, repo, token, state="open", limit=5):
     """Fetch open issues."""
-    print("Fetching issues...")
+    logger.debug("Fetching issues...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/issues?state={state}&per_page={limit}", token)
     if data:
-        issues = [i for i in data if "pull_request" not in i]
-        return [{"title": i["title"], "number": i["number"], "user": i["user"]["login"], "created_at": i["created_at"]} for i in issues]
+        return _issue_sample(data, limit)
     return []
 
+@instrumented("github.fetch_pull_requests")
 def fetch_pull_requests(owner, repo, token, state="open", limit=5):
     """Fetch pull requests."""
-    print("Fetching pull requests...")
+    logger.debug("Fetching pull requests...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/pulls?state={state}&per_page={limit}", token)
     if data:
         return [{"title": p["title"], "number": p["number"], "user": p["user"]["login"], "created_at": p["created_at"]} for p in data]
     return []
 
+@instrumented("github.fetch_releases")
 def fetch_releases(owner, repo, token, limit=3):
     """Fetch release info."""
-    print("Fetching releases...")
+    logger.debug("Fetching releases...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/releases?per_page={limit}", token)
     if data:
-        return [{"name": r["name"], "tag_name": r["tag_name"], "published_at": r["published_at"]} for r in data]
+        return _release_sample(data, limit)
     return []
 
+@instrumented("github.fetch_branches")
 def fetch_branches(owner, repo, token, limit=5):
     """Fetch branch info."""
-    print("Fetching branches...")
+    logger.debug("Fetching branches...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/branches?per_page={limit}", token)
     if data:
         return [b["name"] for b in data]
     return []
 
+@instrumented("github.fetch_community_profile")
 def fetch_community_profile(owner, repo, token):
     """Fetch community health files like README, LICENSE, etc."""
-    print("Fetching community profile...")
+    logger.debug("Fetching community profile...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/community/profile", token)
     if data:
         return data.get("files", {})
     return None
 
+@instrumented("github.fetch_head_sha")
+def fetch_head_sha(owner, repo, branch, token):
+    """Fetch the commit SHA a branch points at."""
+    data = get(f"{GITHUB_API}/repos/{owner}/{repo}/git/ref/heads/{branch}", token)
+    if data:
+        return data.get("object", {}).get("sha")
+    return None
+
+@instrumented("github.fetch_repo_contents")
 def fetch_repo_contents(owner, repo, token):
     """Fetch root-level repo contents to infer structure."""
-    print("Fetching repo contents...")
+    logger.debug("Fetching repo contents...")
     data = get(f"{GITHUB_API}/repos/{owner}/{repo}/contents", token)
     if data:
         return [{"name": item["name"], "type": item["type"]} for item in data]
     return []
 
-def deep_scan_repo(owner, repo, token):
-    """Perform a full repo scan and print organized info."""
-    print(f"\n🔍 Scanning repository: {owner}/{repo}")
-    print("-" * 60)
-
-    info = {
-        "metadata": fetch_repo_metadata(owner, repo, token),
-        "commits": fetch_commits(owner, repo, token),
-        "contributors": fetch_contributors(owner, repo, token),
-        "issues": fetch_issues(owner, repo, token),
-        "pull_requests": fetch_pull_requests(owner, repo, token),
-        "releases": fetch_releases(owner, repo, token),
-        "branches": fetch_branches(owner, repo, token),
-        "community_profile": fetch_community_profile(owner, repo, token),
-        "contents": fetch_repo_contents(owner, repo, token),
-    }
-
-    if not info["metadata"]:
-        print(f"\nCRITICAL: Could not fetch main metadata for {owner}/{repo}.")
+def fetch_history(owner, repo, token, listings=HISTORY_LISTINGS, previous=None):
+    """The "activity" section plus the commits, contributors, issues and releases
+    samples of every listing paged, cut from its first history page so they
+    cost no requests of their own. `listings` and the `previous` activity
+    section are passed to collect_history. Returns {"activity": None} when
+    SCAN_HISTORY is off."""
+    activity, first_pages = collect_history(owner, repo, token, listings, previous)
+    sections = {"activity": activity}
+    for name, page in first_pages.items():
+        if name == "commits" and page == []:
+            # Nothing committed within the history window; the latest commits are older.
+            sections[name] = fetch_commits(owner, repo, token)
+        else:
+            sections[name] = _SAMPLES[name](page or [])
+    return sections
+
+SCAN_SECTIONS = {
+    "metadata": fetch_repo_metadata,
+    "commits": fetch_commits,
+    "contributors": fetch_contributors,
+    "issues": fetch_issues,
+    "pull_requests": fetch_pull_requests,
+    "releases": fetch_releases,
+    "branches": fetch_branches,
+    "community_profile": fetch_community_profile,
+    "contents": fetch_repo_contents,
+    "activity": fetch_history,  # returns several sections, see _scan_tasks
+}
+# Sections fetch_history samples from the history listings, instead of their own fetcher.
+HISTORY_SAMPLED = HISTORY_LISTINGS if SCAN_HISTORY else ()
+
+# Sections that only change when the default branch moves.
+HEAD_SECTIONS = ("commits", "contributors", "community_profile", "contents")
+# Sections that change with a push to any branch.
+PUSH_SECTIONS = ("branches",)
+# Sections that change without any push (releases can be published on an existing tag;
+# activity includes open issues, and only its issue and release history is re-paged).
+VOLATILE_SECTIONS = ("issues", "pull_requests", "releases", "activity")
+
+def _single(key):
+    fetcher = SCAN_SECTIONS[key]
+    return lambda owner, repo, token: {key: fetcher(owner, repo, token)}
+
+def _scan_tasks(keys, previous=None):
+    """{task: fn(owner, repo, token) -> {section: value}} fetching the sections in `keys`.
+    History samples come with the "activity" task. Given the `previous` scan,
+    only the history listings in `keys` are paged again."""
+    tasks = {}
+    for key in keys:
+        if key == "activity":
+            listings = [name for name in HISTORY_LISTINGS if name in keys] if previous else HISTORY_LISTINGS
+            tasks[key] = lambda owner, repo, token, listings=listings: fetch_history(
+                owner, repo, token, listings, previous and previous.get("activity"))
+        elif key not in HISTORY_SAMPLED or "activity" not in keys:
+            tasks[key] = _single(key)
+    return tasks
+
+def _sections(results, keys):
+    """Merge task results into {section: value} for `keys`, in that order."""
+    merged = {}
+    for result in results:
+        merged.update(result)
+    return {key: merged[key] for key in keys}
+
+def _scan_sequential(owner, repo, token):
+    """Run every scan section one after another."""
+    metadata = fetch_repo_metadata(owner, repo, token)
+    if not metadata:
         return None
+    tasks = _scan_tasks([key for key in SCAN_SECTIONS if key != "metadata"])
+    return _sections([{"metadata": metadata}] + [task(owner, repo, token) for task in tasks.values()], SCAN_SECTIONS)
+
+def _scan_concurrent(owner, repo, token, concurrency):
+    """Run every scan section on a bounded thread pool.
+    Metadata is awaited first so a missing repo cancels the remaining fetches."""
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scan")
+    try:
+        futures = {key: pool.submit(propagate(task), owner, repo, token)
+                   for key, task in _scan_tasks(SCAN_SECTIONS).items()}
+        if not futures["metadata"].result()["metadata"]:
+            return None
+        return _sections([future.result() for future in futures.values()], SCAN_SECTIONS)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _scan_graphql(owner, repo, token):
+    """One GraphQL round-trip, with REST filling in the sections GraphQL lacks.
+    Falls back to the full REST scan if the GraphQL query fails."""
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scan")
+    rest_keys = ("contributors", "activity")
+    try:
+        rest = [pool.submit(propagate(task), owner, repo, token) for task in _scan_tasks(rest_keys).values()]
+        info = fetch_repository_graphql(owner, repo, token)
+        if info is None:
+            logger.warning("GraphQL scan failed, falling back to REST.")
+            for future in rest:
+                future.cancel()
+            return _scan_concurrent(owner, repo, token, SCAN_CONCURRENCY)
+        info.update(_sections([future.result() for future in rest], rest_keys))
+        return {key: info[key] for key in SCAN_SECTIONS}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _rescan(owner, repo, token, previous, concurrency):
+    """Refresh a stored scan, refetching only the sections that could have changed.
+    Returns None when the default branch moved and a full scan is needed,
+    or {} when the metadata could not be fetched."""
+    metadata = fetch_repo_metadata(owner, repo, token)
+    if not metadata:
+        return {}
+    stored = previous["info"]["metadata"]
+    if metadata.get("default_branch") != stored.get("default_branch"):
+        return None
+
+    if metadata.get("pushed_at") == stored.get("pushed_at"):
+        refresh = VOLATILE_SECTIONS
+    else:
+        head = fetch_head_sha(owner, repo, metadata.get("default_branch"), token)
+        if not head or head != previous["head_sha"]:
+            return None
+        refresh = VOLATILE_SECTIONS + PUSH_SECTIONS
+
+    logger.info("Default branch unchanged, refreshing only: %s", ", ".join(refresh))
+    info = dict(previous["info"], metadata=metadata)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scan") as pool:
+        futures = [pool.submit(propagate(task), owner, repo, token)
+                   for task in _scan_tasks(refresh, previous["info"]).values()]
+        info.update(_sections([future.result() for future in futures], refresh))
+    return info
+
+def deep_scan_repo(owner, repo, token, concurrency=None, backend=None, incremental=None):
+    """Perform a full repo scan and print organized info.
+    Sections are fetched on up to `concurrency` threads (1 = sequential);
+    backend="graphql" fetches almost everything in a single GraphQL query.
+    With `incremental` (default SCAN_INCREMENTAL) the last scan is reused
+    when the default branch head has not moved since."""
+    backend = backend or SCAN_BACKEND
+    if backend not in SCAN_BACKENDS:
+        raise ValueError(f"Unknown scan backend: {backend}")
+    incremental = SCAN_INCREMENTAL if incremental is None else incremental
+
+    logger.info("🔍 Scanning repository: %s/%s", owner, repo)
+
+    concurrency = concurrency or SCAN_CONCURRENCY
+    store = get_scan_store() if incremental else None
+    store_key = f"{owner.lower()}/{repo.lower()}|{backend}|{token_scope(token)}"
+    previous = store.get("scans", store_key) if store else None
+
+    info = _rescan(owner, repo, token, previous[0], concurrency) if previous else None
+    if info is None:
+        if backend == "graphql":
+            info = _scan_graphql(owner, repo, token)
+        elif concurrency <= 1:
+            info = _scan_sequential(owner, repo, token)
+        else:
+            info = _scan_concurrent(owner, repo, token, concurrency)
+
+    if not info:
+        logger.error("CRITICAL: Could not fetch main metadata for %s/%s.", owner, repo)
+        return None
+
+    if store and info["commits"]:
+        # The commits endpoint lists the default branch newest first.
+        store.put("scans", store_key, {"info": info, "head_sha": info["commits"][0]["sha"]})
 
-    print("\n--- General Scan Complete ---")
+    logger.info("--- General Scan Complete ---")
     return info
 def detect_tech_stack(contents):
     """Use Google Gemini to describe the repo's tech stack in natural language
     based on its file names and structure."""
     GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
     if not GEMINI_API_KEY:
-        print("GOOGLE_API_KEY not found. Skipping AI tech stack summary.")
+        logger.warning("GOOGLE_API_KEY not found. Skipping AI tech stack summary.")
         return None
 
     try:
         genai.configure(api_key=GEMINI_API_KEY)
         model = genai.GenerativeModel(GEMINI_MODEL_ID)
     except Exception as e:
-        print(f"Gemini config failed: {e}")
+        logger.error("Gemini config failed: %s", e)
         return None
 
     file_list = "\n".join([item["name"] for item in contents])
@@ -155,10 +347,10 @@ def detect_tech_stack(contents):
     try:
         response = model.generate_content(prompt)
         summary = response.text.strip()
-        print("AI Tech Stack Summary received.")
+        logger.info("AI Tech Stack Summary received.")
         return summary
     except Exception as e:
-        print(f"Gemini AI Error (tech stack): {e}")
+        logger.error("Gemini AI Error (tech stack): %s", e)
         return None
         
 
@@ -166,6 +358,7 @@ def detect_tech_stack(contents):
 
 if __name__ == "__main__":
     """Allows running this script standalone for data gathering."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     load_dotenv()
     token = os.getenv("GITHUB_TOKEN")
 
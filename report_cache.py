@@ -0,0 +1,186 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import Counter, Gauge, register_collector
+from pipeline import run_analysis_shared
+from repo_explorer import SCAN_BACKEND, SCAN_BACKENDS
+from response_cache import token_scope
+from scan_store import get_scan_store
+from ttl_cache import TTLCache
+
+# Finished /analyze reports are served from cache for REPORT_CACHE_TTL seconds,
+# then for REPORT_CACHE_STALE more seconds while a background run refreshes them.
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "300"))
+REPORT_CACHE_STALE = float(os.getenv("REPORT_CACHE_STALE", "3600"))
+REPORT_CACHE_MEMORY_ENTRIES = int(os.getenv("REPORT_CACHE_MEMORY_ENTRIES", "256"))
+REPORT_REFRESH_WORKERS = int(os.getenv("REPORT_REFRESH_WORKERS", "2"))
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_LOOKUPS = Counter(
+    "blink_report_cache_lookups_total",
+    "Report cache lookups: memory or disk hit (fresh), stale hit, or miss.", ["result"])
+REPORT_CACHE_HIT_RATIO = Gauge(
+    "blink_report_cache_hit_ratio", "Share of report cache lookups served from cache (fresh or stale).")
+
+
+def report_key(owner, repo, backend=None):
+    return f"{owner.lower()}/{repo.lower()}|{backend or SCAN_BACKEND}"
+
+def cacheable(report):
+    """Only complete reports are cached: a failed stage is retried on the next request."""
+    return bool(report.get("raw_data")) and bool(report.get("health_report")) \
+        and all(stage["status"] != "error" for stage in report["stages"].values())
+
+
+class ReportCache:
+    """Two tiers of finished reports: an in-memory LRU in front of the scan store
+    (SQLite). Reports of private repositories are only served to callers with
+    the token scope that produced them.
+
+    The store is authoritative: a memory entry is only served while the store
+    still holds the same write of it, so a report invalidated or replaced by
+    another worker is not served from this one's memory."""
+
+    def __init__(self, ttl=REPORT_CACHE_TTL, stale=REPORT_CACHE_STALE,
+                 memory_entries=REPORT_CACHE_MEMORY_ENTRIES, store=None):
+        self.ttl = ttl
+        self.stale = stale
+        self._memory = TTLCache(maxsize=memory_entries, ttl=ttl + stale)
+        self._store = store
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._pool = ThreadPoolExecutor(max_workers=REPORT_REFRESH_WORKERS, thread_name_prefix="report-refresh")
+        self.counts = dict.fromkeys(("memory", "disk", "stale", "miss"), 0)
+        self.refreshes = 0
+
+    def _count(self, result):
+        REPORT_CACHE_LOOKUPS.inc(result)
+        with self._lock:
+            self.counts[result] += 1
+
+    def get(self, key, scope):
+        """Return (report, age_seconds, fresh) or None."""
+        tier = "memory"
+        entry = self._memory.get(key)
+        if entry is not None and self._store and self._store.stored_at("reports", key) != entry["stored"]:
+            self._memory.invalidate(key)
+            entry = None
+        if entry is None and self._store:
+            stored = self._store.get("reports", key)
+            if stored:
+                entry = dict(stored[0], stored=stored[1])
+                tier = "disk"
+        now = time.time()
+        if not entry or now - entry["stored"] > self.ttl + self.stale \
+                or (entry["private"] and entry["scope"] != scope):
+            self._count("miss")
+            return None
+        if tier == "disk":
+            self._memory.set(key, entry)
+        age = now - entry["stored"]
+        fresh = age <= self.ttl
+        self._count(tier if fresh else "stale")
+        return entry["report"], age, fresh
+
+    def put(self, key, scope, report):
+        metadata = report["raw_data"].get("metadata") or {}
+        entry = {"scope": scope, "private": metadata.get("private", True), "report": report}
+        stored = self._store.put("reports", key, entry) if self._store else time.time()
+        self._memory.set(key, dict(entry, stored=stored))
+
+    def invalidate(self, owner, repo):
+        """Drop every cached report of owner/repo (all scan backends), in every
+        worker sharing the store. Returns how many were cached."""
+        dropped = 0
+        for backend in SCAN_BACKENDS:
+            key = report_key(owner, repo, backend)
+            found = self._memory.get(key) is not None
+            self._memory.invalidate(key)
+            if self._store and self._store.get("reports", key):
+                found = True
+                self._store.delete("reports", key)
+            dropped += found
+        return dropped
+
+    def refresh(self, key, run):
+        """Run `run()` in the background and cache its report, once per key at a time."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+
+        def job():
+            try:
+                scope, report = run()
+                if cacheable(report):
+                    self.put(key, scope, report)
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._pool.submit(job)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+            refreshing = len(self._refreshing)
+        lookups = sum(counts.values())
+        return {
+            "enabled": True,
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale,
+            "memory_entries": len(self._memory),
+            "disk_tier": bool(self._store),
+            **counts,
+            "hit_ratio": round((lookups - counts["miss"]) / lookups, 4) if lookups else None,
+            "refreshes": self.refreshes,
+            "refreshing": refreshing,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_report_cache():
+    """Return the process-wide report cache, or None when disabled (REPORT_CACHE_TTL=0)."""
+    global _cache
+    if REPORT_CACHE_TTL <= 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache(store=get_scan_store())
+    return _cache
+
+@register_collector
+def _collect_hit_ratio():
+    if _cache is not None:
+        ratio = _cache.stats()["hit_ratio"]
+        REPORT_CACHE_HIT_RATIO.replace({(): ratio} if ratio is not None else {})
+
+
+def cached_analysis(owner, repo, token, backend=None, refresh=False):
+    """run_analysis_shared behind the report cache. Returns (report, cache_status, age)
+    where cache_status is "hit", "stale" (a refresh was started) or "miss".
+    With refresh=True the cache is bypassed and overwritten."""
+    cache = get_report_cache()
+    scope = token_scope(token)
+    key = report_key(owner, repo, backend)
+    if cache and not refresh:
+        cached = cache.get(key, scope)
+        if cached:
+            report, age, fresh = cached
+            if not fresh:
+                cache.refresh(key, lambda: (scope, run_analysis_shared(owner, repo, token, backend)))
+            return report, "hit" if fresh else "stale", age
+    report = run_analysis_shared(owner, repo, token, backend)
+    if cache and cacheable(report):
+        cache.put(key, scope, report)
+    return report, "miss", 0
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import threading
+import time
+
+from sqlite_db import SQLiteDB, evict_lru
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+GITHUB_CACHE_PATH = os.getenv("GITHUB_CACHE_PATH", os.path.join(CACHE_DIR, "github_responses.sqlite3"))
+GITHUB_CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def token_scope(token):
+    """Stable, non-reversible identifier for a token, used to partition cache keys."""
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """On-disk ETag/Last-Modified response store with size-bounded LRU eviction."""
+
+    def __init__(self, path=GITHUB_CACHE_PATH, max_bytes=GITHUB_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = SQLiteDB(
+            path,
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " body BLOB, size INTEGER, accessed REAL, link TEXT)",
+        )
+        with self._db.transaction() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+            if "link" not in columns:
+                # Caches created before pagination support lack the Link header column.
+                conn.execute("ALTER TABLE responses ADD COLUMN link TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get(self, key):
+        """Return (etag, last_modified, body, link) for key, or None."""
+        with self._db.transaction() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body, link FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            return row
+
+    def put(self, key, etag, last_modified, body, link=None):
+        if len(body) > self.max_bytes:
+            return
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, body, size, accessed, link)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, len(body), time.time(), link),
+            )
+            evict_lru(conn, "responses", self.max_bytes)
+
+    def clear(self):
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide GitHub response cache, or None when disabled."""
+    global _cache
+    if GITHUB_CACHE_MAX_BYTES <= 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,91 @@
+import gzip
+import json
+import os
+
+from flask import Response, request
+
+from metrics import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# "orjson" when it is installed, else the standard library encoder; "json" forces the latter.
+JSON_SERIALIZER = os.getenv("JSON_SERIALIZER", "orjson")
+# Bodies smaller than this are sent uncompressed.
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def parse_fields(value):
+    """Turn "health_report,dependency_report.dependencies" into a selection tree:
+    {"health_report": None, "dependency_report": {"dependencies": None}}, where
+    None selects the whole value. Returns None when nothing is selected."""
+    tree = {}
+    for field in (value or "").split(","):
+        parts = [part for part in field.strip().split(".") if part]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break  # a shorter path already selects all of it
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree or None
+
+def project(value, tree):
+    """Keep only the selected paths of `value`. A path into a list applies to
+    every element; paths that do not exist are left out."""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: project(value[key], sub) for key, sub in tree.items() if key in value}
+
+def shape(report, fields=None, compact=False):
+    """Apply ?fields= projection and ?compact=1 (drop raw_data) to a report."""
+    if compact and "raw_data" in report:
+        report = {key: value for key, value in report.items() if key != "raw_data"}
+    return project(report, parse_fields(fields))
+
+def shape_from_request(report):
+    return shape(report, request.args.get("fields"), request.args.get("compact") == "1")
+
+
+def dumps(data):
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None and JSON_SERIALIZER == "orjson":
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+def json_response(data, status=200):
+    """JSON response serialized with `dumps` and compressed with brotli or gzip
+    when the client accepts it and the body is large enough."""
+    with timed("http.serialize"):
+        body = dumps(data)
+    response = Response(body, status=status, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    encoding = _encoding() if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding:
+        with timed("http.compress"):
+            if encoding == "br":
+                body = brotli.compress(body, quality=BROTLI_QUALITY)
+            else:
+                body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+    return response
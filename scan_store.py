@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import time
+
+from response_cache import CACHE_DIR
+from sqlite_db import SQLiteDB
+
+SCAN_STORE_PATH = os.getenv("SCAN_STORE_PATH", os.path.join(CACHE_DIR, "scans.sqlite3"))
+SCAN_STORE_MAX_ENTRIES = int(os.getenv("SCAN_STORE_MAX_ENTRIES", "5000"))
+
+
+class ScanStore:
+    """Persistent JSON store for the last scan/dependency results of each repo,
+    used to rescan incrementally. Keeps at most `max_entries` per namespace,
+    evicting the least recently written."""
+
+    def __init__(self, path=SCAN_STORE_PATH, max_entries=SCAN_STORE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._db = SQLiteDB(
+            path,
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT, key TEXT, value TEXT, stored REAL,"
+            " PRIMARY KEY (namespace, key))",
+        )
+
+    def get(self, namespace, key):
+        """Return (value, stored_at) or None."""
+        row = self._db.fetchone(
+            "SELECT value, stored FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def stored_at(self, namespace, key):
+        """When the entry was written, or None; cheaper than `get` for large values."""
+        row = self._db.fetchone("SELECT stored FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        return row[0] if row else None
+
+    def put(self, namespace, key, value):
+        """Store `value` and return its stored_at timestamp."""
+        stored = time.time()
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), stored),
+            )
+            conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key NOT IN ("
+                " SELECT key FROM entries WHERE namespace = ? ORDER BY stored DESC LIMIT ?)",
+                (namespace, namespace, self.max_entries),
+            )
+        return stored
+
+    def delete(self, namespace, key):
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_scan_store():
+    """Return the process-wide scan store, or None when disabled."""
+    global _store
+    if SCAN_STORE_MAX_ENTRIES <= 0:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ScanStore()
+    return _store
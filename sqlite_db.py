@@ -0,0 +1,55 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteDB:
+    """One SQLite file used from many threads: a single connection in WAL mode
+    (so other worker processes can read while one writes) behind a lock.
+    `schema` statements are run once, on open."""
+
+    def __init__(self, path, *schema):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in schema:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Hold the lock for a group of statements, committed together (rolled back if one raises)."""
+        with self._lock:
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def fetchone(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+def evict_lru(conn, table, max_bytes):
+    """Delete the least recently accessed rows of `table` (which has key, size
+    and accessed columns) until their sizes add up to at most `max_bytes`.
+    Runs inside the caller's transaction."""
+    total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+    if total <= max_bytes:
+        return
+    evicted = []
+    for key, size in conn.execute(f"SELECT key, size FROM {table} ORDER BY accessed ASC").fetchall():
+        evicted.append((key,))
+        total -= size
+        if total <= max_bytes:
+            break
+    conn.executemany(f"DELETE FROM {table} WHERE key = ?", evicted)
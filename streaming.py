@@ -0,0 +1,96 @@
+import json
+import queue
+import threading
+
+from flask import Response, stream_with_context
+
+from pipeline import run_analysis
+from report_cache import cacheable, get_report_cache, report_key
+from response_cache import token_scope
+
+# Pipeline stage -> event name the client receives for its result.
+# The manifests stage is split in two events (see _stage_events).
+STAGE_EVENTS = {
+    "scan": "raw_data",
+    "health": "health_report",
+    "dependencies": "dependency_report.dependencies",
+    "dependency_summary": "ai_summary",
+    "tech_stack": "tech_stack_summary",
+}
+
+_DONE = object()
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+def _stage_events(name, value):
+    """(event name, data) pairs for a finished stage."""
+    if name == "manifests":
+        return [("dependency_report.manifests", value["manifests"]),
+                ("dependency_report.truncated", value["truncated"])]
+    return [(STAGE_EVENTS[name], value)] if name in STAGE_EVENTS else []
+
+def _report_events(report):
+    """The events a live run would have sent, from a finished report."""
+    sections = {
+        "raw_data": report["raw_data"],
+        "health_report": report["health_report"],
+        "dependency_report.manifests": report["dependency_report"]["manifests"],
+        "dependency_report.truncated": report["dependency_report"].get("truncated"),
+        "dependency_report.dependencies": report["dependency_report"]["dependencies"],
+        "ai_summary": report["dependency_report"]["ai_summary"],
+        "tech_stack_summary": report["tech_stack_summary"],
+    }
+    for name, value in sections.items():
+        if value is not None:
+            yield _event(name, value)
+    yield _event("done", {"stages": report["stages"]})
+
+def stream_analysis(owner, repo, token, backend=None, refresh=False):
+    """Run the analysis pipeline and stream each report section as a
+    Server-Sent Event the moment its stage finishes. A final `done` event
+    carries the per-stage timings. A cached report is replayed at once (a
+    stale one is refreshed in the background) and finished runs are cached."""
+    cache = get_report_cache()
+    scope = token_scope(token)
+    key = report_key(owner, repo, backend)
+    cached = cache.get(key, scope) if cache and not refresh else None
+    if cached:
+        report, _, fresh = cached
+        if not fresh:
+            cache.refresh(key, lambda: (scope, run_analysis(owner, repo, token, backend)))
+        return Response(_report_events(report), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Cache": "HIT" if fresh else "STALE"})
+
+    events = queue.Queue()
+
+    def on_stage(name, value, info):
+        if info["status"] == "ok":
+            for event, data in _stage_events(name, value):
+                events.put(_event(event, data))
+        elif info["status"] == "error":
+            events.put(_event("stage_error", {"stage": name, **info}))
+
+    def run():
+        try:
+            report = run_analysis(owner, repo, token, backend, on_stage=on_stage)
+            events.put(_event("done", {"stages": report["stages"]}))
+            if cache and cacheable(report):
+                cache.put(key, scope, report)
+        except Exception as e:
+            events.put(_event("error", {"error": str(e)}))
+        finally:
+            events.put(_DONE)
+
+    threading.Thread(target=run, name=f"stream-{owner}/{repo}", daemon=True).start()
+
+    def generate():
+        while True:
+            event = events.get()
+            if event is _DONE:
+                return
+            yield event
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Cache": "MISS"})
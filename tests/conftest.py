@@ -0,0 +1,29 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import StubConfig, configure_environment, make_stub_server
+
+# The app modules read their endpoints and cache paths at import time, so the
+# stub upstreams are started (and the environment pointed at them) before any
+# test module is collected.
+STUB_CONFIG = StubConfig(github_latency=0, registry_latency=0, llm_latency=0)
+STUB = make_stub_server(STUB_CONFIG)
+STUB_URL = f"http://127.0.0.1:{STUB.server_address[1]}"
+configure_environment(STUB_URL, tempfile.mkdtemp(prefix="blink-tests-"))
+
+
+@pytest.fixture
+def stub_url():
+    return STUB_URL
+
+
+@pytest.fixture
+def github_calls():
+    """fn() -> GitHub requests the stub has answered since the test started."""
+    start = STUB_CONFIG.snapshot().get("github", 0)
+    return lambda: STUB_CONFIG.snapshot().get("github", 0) - start
@@ -0,0 +1,24 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+@pytest.mark.parametrize("body", [[], ["bench", "x"], "bench/x", 42, None])
+def test_analyze_rejects_non_object_json(client, body):
+    response = client.post("/analyze", json=body)
+
+    assert response.status_code == 400
+    assert "JSON object" in response.get_json()["error"]
+
+
+def test_analyze_rejects_malformed_bodies(client):
+    assert client.post("/analyze", data="{not json", content_type="application/json").status_code == 400
+    assert client.post("/analyze", json={"owner": "bench", "repo": "x"}).status_code == 400
+    assert client.post("/analyze", json={"owner": ["bench"], "repo": "x", "token": "t"}).status_code == 400
+    assert client.post("/analyze", json={"owner": "bench", "repo": "x", "token": "t",
+                                         "scan_backend": "soap"}).status_code == 400
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from app import create_app
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def test_batch_rejects_malformed_items_per_line(client):
+    bad = [{"owner": 5, "repo": "x"}, {"owner": "bench", "repo": ["x"]}, {"owner": "bench"},
+           "no-slash", "a/b/c", " / ", 42, None]
+    response = client.post("/analyze/batch", json={"repos": bad + ["bench/batch-ok"], "token": TOKEN})
+
+    assert response.status_code == 200
+    lines = _lines(response)
+    assert len(lines) == len(bad) + 1
+    errors = [line for line in lines if line["error"] == "Expected 'owner/repo'"]
+    assert [line["repo"] for line in errors] == bad
+    ok = next(line for line in lines if line["repo"] == "bench/batch-ok")
+    assert ok["error"] is None and ok["health_report"]["total_score"] > 0
+
+
+def test_batch_requires_repo_list(client):
+    assert client.post("/analyze/batch", json={"repos": "bench/x", "token": TOKEN}).status_code == 400
+    assert client.post("/analyze/batch", json={"repos": ["bench/x"]}).status_code == 400
+    assert client.post("/analyze/batch", json={"repos": ["bench/x"], "token": ["t"]}).status_code == 400
+    assert client.post("/analyze/batch", json=["bench/x"]).status_code == 400
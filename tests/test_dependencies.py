@@ -0,0 +1,68 @@
+import logging
+
+import ai_summarizer
+from ai_summarizer import analyze_manifests, flatten_dependencies, scan_manifests
+from pipeline import build_report
+from test_lockfiles import PACKAGE_LOCK_V3
+
+
+def _info(version):
+    return {"current_version": version, "latest_version": version, "outdated": False}
+
+
+def test_flatten_keeps_same_name_from_other_ecosystems():
+    manifests = {
+        "requirements.txt": {"ecosystem": "pypi", "dependencies": {"requests": _info("2.31.0"), "flask": _info("3.0.0")}},
+        "web/package.json": {"ecosystem": "npm", "dependencies": {"requests": _info("0.3.0"), "react": _info("18.2.0")}},
+        "svc/requirements.txt": {"ecosystem": "pypi", "dependencies": {"requests": _info("2.0.0")}},
+    }
+
+    assert flatten_dependencies(manifests) == {
+        "requests": _info("2.31.0"),
+        "flask": _info("3.0.0"),
+        "npm:requests": _info("0.3.0"),
+        "react": _info("18.2.0"),
+    }
+
+
+def test_flatten_without_dependencies():
+    assert flatten_dependencies({}) is None
+    assert flatten_dependencies({"pom.xml": {"ecosystem": "maven", "dependencies": {}}}) is None
+
+
+def test_lockfile_report_carries_counts_not_the_graph(monkeypatch):
+    monkeypatch.setattr(ai_summarizer, "_find_manifests",
+                        lambda owner, repo, token: ([{"path": "package-lock.json", "sha": "lock-sha"}], False))
+    monkeypatch.setattr(ai_summarizer, "_parse_blob_stream",
+                        lambda owner, repo, sha, token, parser: parser([PACKAGE_LOCK_V3]))
+
+    manifest = analyze_manifests("bench", "lockfile-report", "test-token")["package-lock.json"]
+
+    assert manifest["graph"] == {"packages": 10, "edges": 6, "direct": 4}
+    assert "locked" not in manifest
+    assert set(manifest["dependencies"]) == {"express", "lodash", "jest", "react"}
+    outdated = {(pkg, ver) for pkg, ver, _ in manifest["transitive_outdated"]}
+    assert outdated and outdated <= {("debug", "2.6.9"), ("ms", "2.0.0"), ("qs", "6.11.0"), ("debug", "4.3.4"),
+                                     ("ms", "2.1.2"), ("loose-envify", "1.4.0"), ("express", "4.18.2"),
+                                     ("lodash", "4.17.21"), ("jest", "29.7.0"), ("react", "18.2.0")}
+
+
+def test_capped_manifests_are_flagged(monkeypatch, caplog):
+    monkeypatch.setattr(ai_summarizer, "MAX_MANIFESTS", 2)
+
+    with caplog.at_level(logging.WARNING, logger="ai_summarizer"):
+        scanned = scan_manifests("bench", "capped-manifests", "test-token")
+
+    assert sorted(scanned["manifests"]) == ["package.json", "pom.xml"]
+    assert scanned["truncated"] is True
+    assert "has 3 dependency files; only the 2 shallowest are analyzed" in caplog.text
+    assert build_report({"manifests": scanned}, {})["dependency_report"]["truncated"] is True
+
+
+def test_complete_manifest_list_is_not_flagged(caplog):
+    with caplog.at_level(logging.WARNING, logger="ai_summarizer"):
+        scanned = scan_manifests("bench", "all-manifests", "test-token")
+
+    assert sorted(scanned["manifests"]) == ["package.json", "pom.xml", "requirements.txt"]
+    assert scanned["truncated"] is False
+    assert "dependency files" not in caplog.text
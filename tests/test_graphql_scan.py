@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from graphql_scan import fetch_repository_graphql, map_repository
+from health_index import calculate_health_index
+from repo_explorer import SCAN_SECTIONS, deep_scan_repo
+
+TOKEN = "test-token"
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+# Metadata fields calculate_health_index reads, with their REST types.
+HEALTH_METADATA = {"full_name": str, "updated_at": str, "has_issues": bool, "license": dict,
+                   "stargazers_count": int, "forks_count": int}
+LIST_SECTIONS = ("commits", "issues", "pull_requests", "releases", "contents")
+
+
+def _shape(items):
+    return {key: type(value) for key, value in items[0].items()}
+
+
+def test_graphql_scan_matches_rest_scan():
+    rest = deep_scan_repo("bench", "parity", TOKEN, backend="rest", incremental=False)
+    graphql = deep_scan_repo("bench", "parity", TOKEN, backend="graphql", incremental=False)
+
+    assert list(graphql) == list(rest) == list(SCAN_SECTIONS)
+    for field, kind in HEALTH_METADATA.items():
+        assert isinstance(rest["metadata"][field], kind), field
+        assert isinstance(graphql["metadata"][field], kind), field
+    assert graphql["metadata"]["default_branch"] == rest["metadata"]["default_branch"]
+    for section in LIST_SECTIONS:
+        assert graphql[section] and _shape(graphql[section]) == _shape(rest[section]), section
+    assert graphql["branches"] == rest["branches"]
+    assert set(graphql["community_profile"]) >= {"readme", "license", "contributing", "code_of_conduct"}
+
+    rest_report = calculate_health_index(rest, now=NOW)
+    graphql_report = calculate_health_index(graphql, now=NOW)
+    assert graphql_report["scores"] == rest_report["scores"]
+    assert graphql_report["total_score"] == rest_report["total_score"]
+
+
+def test_graphql_scan_of_empty_repository():
+    info = fetch_repository_graphql("bench", "empty-repo", TOKEN)
+
+    assert info["metadata"]["default_branch"] is None
+    assert info["commits"] == []
+    assert info["contents"] == []
+    assert info["community_profile"]["readme"] is None
+    # The deleted account behind the oldest issue and pull request.
+    assert info["issues"][-1]["user"] == "ghost"
+    assert info["pull_requests"][-1]["user"] == "ghost"
+    assert calculate_health_index(info, now=NOW)["total_score"] >= 0
+
+
+def test_map_repository_null_fields():
+    info = map_repository({
+        "nameWithOwner": "bench/nulls",
+        "defaultBranchRef": {"name": "main", "target": {"history": {"nodes": [
+            {"oid": "abc", "message": "Initial commit", "author": None}]}}},
+        "issues": {"totalCount": 1, "nodes": [{"title": "t", "number": 1, "createdAt": "2026-01-01T00:00:00Z",
+                                               "author": None}]},
+        "pullRequests": None,
+        "licenseInfo": None,
+        "rootTree": None,
+    })
+
+    assert info["commits"] == [{"sha": "abc", "message": "Initial commit", "date": None}]
+    assert info["issues"][0]["user"] == "ghost"
+    assert info["pull_requests"] == []
+    assert info["metadata"]["license"] is None
+    assert info["metadata"]["open_issues_count"] == 1
+    assert info["contents"] == []
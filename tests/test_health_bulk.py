@@ -0,0 +1,146 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from health_bulk import ranking, score_bulk
+from health_index import (ACTIVE_AUTHOR_LADDER, COMMIT_CADENCE_LADDER, FORK_LADDER, HISTORY_RECENCY_LADDER,
+                          ISSUE_AGE_LADDER, RELEASE_CADENCE_LADDER, STAR_LADDER, UPDATE_RECENCY_LADDER,
+                          calculate_health_index)
+
+NOW = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+RECORDS = 3000
+
+
+def _around(*ladders):
+    """Every threshold, its neighbours on both sides, and 0."""
+    values = {0}
+    for ladder in ladders:
+        for threshold, _, _ in ladder:
+            values |= {threshold - 1, threshold, threshold + 1}
+    return sorted(values)
+
+
+# Each dimension cycles through all of its values across the records (in a
+# shuffled order), so every rung of every ladder and every failure mode is hit.
+DIMENSIONS = {
+    # days since the last update; fractions land on both sides of midnight
+    "days": _around(UPDATE_RECENCY_LADDER, HISTORY_RECENCY_LADDER) + [-1, 5000, None, "not a date"],
+    "day_fraction": [0, 0.01, 0.5, 0.99],
+    "stars": _around(STAR_LADDER) + [None],
+    "forks": _around(FORK_LADDER) + [None],
+    "week_pct": _around(COMMIT_CADENCE_LADDER) + [100],
+    "releases_in_window": _around(RELEASE_CADENCE_LADDER),
+    "authors": _around(ACTIVE_AUTHOR_LADDER),
+    "issue_age": _around(ISSUE_AGE_LADDER) + [4000],
+    "activity": ["none", "empty", "history"],
+    "failed": [(), ("commits",), ("issues",), ("commits", "issues"), ("releases",), ("contributors", "issues")],
+    "has_issues": [True, False, None],
+    "releases": [0, 1, 3],
+    "profile": [None, {}, "readme", "readme,license", "readme,license,contributing,code_of_conduct",
+                "contributing,code_of_conduct", "license"],
+    "metadata_license": [None, {"key": "mit"}],
+}
+
+
+def _columns(rng):
+    columns = {}
+    for name, values in DIMENSIONS.items():
+        column = (values * (RECORDS // len(values) + 1))[:RECORDS]
+        rng.shuffle(column)
+        columns[name] = column
+    return columns
+
+
+def _record(i, v):
+    metadata = {"full_name": f"org/repo-{i}", "license": v["metadata_license"]}
+    if v["days"] is None:
+        pass
+    elif isinstance(v["days"], str):
+        metadata["updated_at"] = v["days"]
+    else:
+        updated = NOW - timedelta(days=v["days"] + v["day_fraction"])
+        metadata["updated_at"] = updated.isoformat().replace("+00:00", "Z")
+    if v["stars"] is not None:
+        metadata["stargazers_count"] = v["stars"]
+    if v["forks"] is not None:
+        metadata["forks_count"] = v["forks"]
+    if v["has_issues"] is not None:
+        metadata["has_issues"] = v["has_issues"]
+
+    profile = v["profile"]
+    if isinstance(profile, str):
+        profile = {name: {"url": f"https://example.com/{name}"} for name in profile.split(",")}
+
+    record = {
+        "metadata": metadata,
+        "commits": [{"sha": "abc", "message": "m", "date": None}],
+        "releases": [{"name": f"v{n}", "tag_name": f"v{n}", "published_at": None} for n in range(v["releases"])],
+        "community_profile": profile,
+    }
+    if v["activity"] == "empty":
+        record["activity"] = {}
+    elif v["activity"] == "history":
+        record["activity"] = {
+            "window_days": 365,
+            "commits": {"commits": v["week_pct"] * 3, "covered_days": 365, "active_weeks": 0,
+                        "active_week_pct": v["week_pct"], "commits_per_week": 0.0, "busiest_week": 0,
+                        "active_authors_90d": v["authors"], "last_commit": None},
+            "contributors": {"contributors": 3, "contributions": 30, "bus_factor": 1},
+            "issues": {"open_issues": 4, "mean_age_days": v["issue_age"], "age_buckets": {}},
+            "releases": {"releases": v["releases_in_window"], "last_release": None},
+            "truncated": [],
+            "failed": list(v["failed"]),
+        }
+    return record
+
+
+def _records():
+    rng = random.Random(16)
+    columns = _columns(rng)
+    records = [_record(i, {name: column[i] for name, column in columns.items()}) for i in range(RECORDS)]
+    # Rejected by calculate_health_index, so left out by score_bulk too.
+    return records + [None, {}, {"metadata": {}}]
+
+
+def test_score_bulk_matches_scalar_scores():
+    records = _records()
+    bulk = score_bulk(records, now=NOW)
+
+    expected = {i: calculate_health_index(r, now=NOW) for i, r in enumerate(records) if r}
+    assert sorted(bulk["index"].tolist()) == sorted(i for i, report in expected.items() if report)
+
+    mismatches = []
+    for row, i in enumerate(bulk["index"]):
+        report = expected[int(i)]
+        got = (int(bulk["activity"][row]), int(bulk["community"][row]), int(bulk["popularity"][row]),
+               int(bulk["total"][row]), bulk["grade"][row], bulk["full_name"][row])
+        want = (report["scores"]["activity"][0], report["scores"]["community"][0],
+                report["scores"]["popularity"][0], report["total_score"], report["grade"], report["full_name"])
+        if got != want:
+            mismatches.append((int(i), got, want))
+    assert mismatches == []
+
+
+def test_every_rung_is_exercised():
+    records = _records()
+    labels = set()
+    for record in records:
+        report = calculate_health_index(record, now=NOW) if record else None
+        for _, _, lines in (report["scores"].values() if report else ()):
+            labels.update(line.split(":", 1)[0] for line in lines)
+    rungs = [(points, label) for ladder in (UPDATE_RECENCY_LADDER, HISTORY_RECENCY_LADDER, STAR_LADDER,
+                                            FORK_LADDER, COMMIT_CADENCE_LADDER, RELEASE_CADENCE_LADDER,
+                                            ACTIVE_AUTHOR_LADDER, ISSUE_AGE_LADDER)
+             for _, points, label in ladder]
+    assert {f"[+{points}] {label}" for points, label in rungs} <= labels
+    assert {"[+0] Poor", "[+0] Could not read open issues.", "[+0] Neutral"} <= labels
+
+
+def test_ranking_orders_by_total():
+    records = _records()[:50]
+    rows = ranking(score_bulk(records, now=NOW))
+
+    totals = [row["total_score"] for row in rows]
+    assert totals == sorted(totals, reverse=True)
+    assert rows[0]["rank"] == 1
+    for row in rows:
+        assert row["rank"] == 1 + sum(total > row["total_score"] for total in totals)
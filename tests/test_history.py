@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import pytest
+
+import history
+from benchmark import STUB_PAGES
+from github_client import GITHUB_API
+from history import CommitCadence, ContributorShare, IssueAges, Pages, ReleaseCadence, collect_history
+
+TOKEN = "test-token"
+NOW = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def _commit(date, login=None, email=None):
+    return {"author": {"login": login} if login else None,
+            "commit": {"author": {"email": email, "date": date.isoformat()}}}
+
+
+@pytest.mark.parametrize("prefetch", [1, 4])
+def test_pages_follow_links(prefetch, github_calls):
+    pages = Pages(f"{GITHUB_API}/repos/bench/paged-list/contributors?per_page=5", TOKEN, prefetch=prefetch)
+
+    logins = [item["login"] for item in pages]
+
+    assert logins == [f"dev{i}" for i in range(5 * STUB_PAGES)]
+    assert [item["login"] for item in pages.first_page] == logins[:5]
+    assert (pages.pages, pages.truncated, pages.error) == (STUB_PAGES, False, None)
+    assert github_calls() == STUB_PAGES
+
+
+@pytest.mark.parametrize("prefetch", [1, 4])
+def test_pages_stop_at_max_pages(prefetch, github_calls):
+    pages = Pages(f"{GITHUB_API}/repos/bench/paged-capped/issues?state=open", TOKEN, max_pages=2, prefetch=prefetch)
+
+    assert len(list(pages)) == 10
+    assert (pages.pages, pages.truncated, pages.error) == (2, True, None)
+    assert github_calls() == 2
+
+
+@pytest.mark.parametrize("prefetch", [1, 4])
+def test_pages_stop_at_a_failed_page(prefetch):
+    pages = Pages(f"{GITHUB_API}/repos/bench/paged-broken-list/releases", TOKEN, prefetch=prefetch)
+
+    assert len(list(pages)) == 3
+    assert (pages.pages, pages.error) == (1, 422)
+
+
+def test_pages_first_page_failure():
+    pages = Pages(f"{GITHUB_API}/repos/bench/missing/unknown-listing", TOKEN)
+
+    assert list(pages) == []
+    assert (pages.pages, pages.error, pages.first_page) == (0, 404, None)
+
+
+def test_commit_cadence():
+    cadence = CommitCadence(NOW)
+    for days, login, email in [(1, "ann", None), (2, None, "bob@example.com"), (10, "ann", None),
+                               (100, "old", None), (200, "old", None)]:
+        cadence.add(_commit(NOW - timedelta(days=days), login, email))
+    cadence.add({"commit": {"author": {"date": None}}})
+
+    result = cadence.result(365)
+    assert result["commits"] == 5
+    assert result["active_authors_90d"] == 2
+    assert result["last_commit"] == (NOW - timedelta(days=1)).isoformat()
+    assert result["active_weeks"] == 4 and result["busiest_week"] == 2
+    assert result["active_week_pct"] == 4 * 100 // 53
+    assert result["commits_per_week"] == round(5 / 53, 2)
+    # A truncated listing is measured over the span it actually covers.
+    assert cadence.result(365, truncated=True)["covered_days"] == 200
+
+
+def test_contributor_share():
+    share = ContributorShare()
+    for count in (50, 30, 10, 10, 0):
+        share.add({"contributions": count})
+    share.add({"login": "anonymous"})
+
+    assert share.result() == {"contributors": 6, "contributions": 100, "bus_factor": 1}
+    assert ContributorShare().result() == {"contributors": 0, "contributions": 0, "bus_factor": 0}
+
+
+def test_issue_ages():
+    ages = IssueAges(NOW)
+    for days in (1, 20, 60, 200, 1000):
+        ages.add({"created_at": (NOW - timedelta(days=days)).isoformat()})
+    ages.add({"created_at": NOW.isoformat(), "pull_request": {}})
+
+    assert ages.result() == {
+        "open_issues": 5,
+        "mean_age_days": (1 + 20 + 60 + 200 + 1000) // 5,
+        "age_buckets": {"week": 1, "month": 1, "quarter": 1, "year": 1, "older": 1},
+    }
+
+
+def test_release_cadence_stops_at_the_window():
+    releases = ReleaseCadence(NOW - timedelta(days=365))
+
+    assert releases.add({"published_at": (NOW - timedelta(days=5)).isoformat(), "draft": True})
+    assert releases.add({"published_at": None})
+    assert releases.add({"published_at": (NOW - timedelta(days=30)).isoformat()})
+    assert releases.add({"published_at": (NOW - timedelta(days=300)).isoformat()})
+    assert releases.add({"published_at": (NOW - timedelta(days=400)).isoformat()}) is False
+    assert releases.result() == {"releases": 2, "last_release": (NOW - timedelta(days=30)).isoformat()}
+
+
+def test_collect_history_aggregates_every_page(github_calls):
+    activity, first_pages = collect_history("bench", "paged-history", TOKEN, now=NOW)
+
+    assert github_calls() == 4 * STUB_PAGES
+    assert activity["commits"]["commits"] == 5 * STUB_PAGES
+    assert activity["commits"]["active_weeks"] == STUB_PAGES
+    assert activity["commits"]["active_authors_90d"] == 3
+    assert activity["contributors"] == {"contributors": 15, "contributions": sum(range(86, 101)), "bus_factor": 8}
+    assert activity["issues"]["open_issues"] == 15
+    assert activity["releases"]["releases"] == 3 * STUB_PAGES
+    assert (activity["truncated"], activity["failed"]) == ([], [])
+    assert {name: len(page) for name, page in first_pages.items()} == {
+        "commits": 5, "contributors": 5, "issues": 5, "releases": 3}
+
+
+def test_collect_history_reports_truncation(monkeypatch):
+    monkeypatch.setattr(history, "Pages", partial(Pages, max_pages=2))
+
+    activity, _ = collect_history("bench", "paged-truncated", TOKEN, now=NOW)
+
+    assert activity["truncated"] == ["commits", "contributors", "issues", "releases"]
+    assert activity["commits"]["commits"] == 10
+    # Two weekly pages reaching back 8 days.
+    assert activity["commits"]["covered_days"] == 8
+    assert activity["commits"]["active_week_pct"] == 100
+    assert activity["contributors"]["contributors"] == 10
+
+
+def test_collect_history_reports_and_retries_failed_pages(github_calls):
+    activity, first_pages = collect_history("bench", "paged-broken-history", TOKEN, now=NOW)
+
+    assert activity["failed"] == ["commits", "contributors", "issues", "releases"]
+    assert activity["issues"]["open_issues"] == 5
+    assert len(first_pages["issues"]) == 5
+
+    calls = github_calls()
+    again, _ = collect_history("bench", "paged-broken-history", TOKEN, listings=(), previous=activity, now=NOW)
+    # Nothing asked for, but every failed listing is paged again: at least its
+    # first and failing pages (page 3 may have been prefetched as well).
+    assert github_calls() - calls >= 4 * 2
+    assert again["failed"] == activity["failed"]
@@ -0,0 +1,20 @@
+import pytest
+
+from jobs import JobQueue, QueueFull
+
+
+def test_closed_queue_refuses_jobs_and_drains():
+    queue = JobQueue(workers=0, maxsize=5)
+    queue.close()
+
+    with pytest.raises(QueueFull):
+        queue.submit("bench", "jobs-closed", "test-token")
+    assert queue.drain(0) is True
+    assert queue.stats() == {"queued": 0, "running": 0, "capacity": 5, "closed": True}
+
+
+def test_drain_reports_unfinished_jobs():
+    queue = JobQueue(workers=0, maxsize=5)
+    queue.submit("bench", "jobs-pending", "test-token")
+
+    assert queue.drain(0.1) is False
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import llm_gateway
+from llm_gateway import generate_combined, set_model_factory
+
+
+class _Model:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        self.calls += 1
+        return llm_gateway._FakeResponse(self.text)
+
+
+@pytest.fixture
+def use_model():
+    def use(text):
+        model = _Model(text)
+        set_model_factory(lambda model_id: model)
+        return model
+    yield use
+    set_model_factory(None)
+
+
+PROMPTS = {"dependency_summary": "Audit these dependencies: a, b", "tech_stack_summary": "Files: app.py"}
+GOOD = json.dumps({"dependency_summary": "Up to date.", "tech_stack_summary": "A Flask API."})
+
+
+@pytest.mark.parametrize("bad", ['{"dependency_summary": "Up to d', "[]", '{"dependency_summary": "Up to date."}'])
+def test_invalid_combined_answers_are_not_cached(use_model, bad):
+    prompts = dict(PROMPTS, tech_stack_summary=f"Files: app.py ({bad!r})")
+    use_model(bad)
+    with pytest.raises(ValueError):
+        generate_combined(prompts)
+
+    good = use_model(GOOD)
+    assert generate_combined(prompts) == json.loads(GOOD)
+    assert generate_combined(prompts) == json.loads(GOOD)
+    assert good.calls == 1
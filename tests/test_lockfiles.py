@@ -0,0 +1,272 @@
+import json
+
+import pytest
+
+from lockfiles import (_JsonStream, parse_package_lock, parse_pipfile_lock, parse_poetry_lock,
+                       parse_yarn_lock)
+
+PACKAGE_LOCK_V3 = """{
+  "name": "app",
+  "version": "1.0.0",
+  "lockfileVersion": 3,
+  "requires": true,
+  "packages": {
+    "": {"name": "app", "version": "1.0.0", "workspaces": ["packages/ui"],
+         "dependencies": {"express": "^4.18.0", "lodash": "^4.17.0"}, "devDependencies": {"jest": "^29.0.0"}},
+    "node_modules/express": {"version": "4.18.2", "dependencies": {"debug": "2.6.9", "qs": "6.11.0"}},
+    "node_modules/debug": {"version": "2.6.9", "dependencies": {"ms": "2.0.0"}},
+    "node_modules/ms": {"version": "2.0.0", "integrity": "sha512-Tpp60P6IUJDTuOq/5Z8cdskzJujfwqfOTkrwIwj7IRISpnkJnT6SyJ4PCPnGMoFjC9ddhal5KVIYtAt97ix05A=="},
+    "node_modules/qs": {"version": "6.11.0", "engines": {"node": ">=0.6"}},
+    "node_modules/lodash": {"version": "4.17.21", "license": "MIT"},
+    "node_modules/jest": {"version": "29.7.0", "dev": true, "dependencies": {"debug": "^4.3.0"}},
+    "node_modules/jest/node_modules/debug": {"version": "4.3.4", "dev": true, "dependencies": {"ms": "2.1.2"}},
+    "node_modules/jest/node_modules/ms": {"version": "2.1.2", "dev": true},
+    "node_modules/ui": {"resolved": "packages/ui", "link": true},
+    "packages/ui": {"name": "ui", "version": "0.1.0", "dependencies": {"react": "^18.0.0"}},
+    "node_modules/react": {"version": "18.2.0", "dependencies": {"loose-envify": "^1.1.0"}},
+    "node_modules/loose-envify": {"version": "1.4.0", "bin": {"loose-envify": "cli.js"}}
+  },
+  "dependencies": {"ignored": {"version": "0.0.1"}}
+}
+"""
+
+PACKAGE_LOCK_V1 = """{
+  "name": "legacy",
+  "version": "1.0.0",
+  "lockfileVersion": 1,
+  "requires": true,
+  "dependencies": {
+    "express": {"version": "4.18.2", "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz",
+                "requires": {"debug": "2.6.9"}},
+    "debug": {"version": "2.6.9", "requires": {"ms": "2.0.0"}},
+    "ms": {"version": "2.0.0"},
+    "jest": {"version": "29.7.0", "dev": true, "requires": {"debug": "^4.3.0"},
+             "dependencies": {
+               "debug": {"version": "4.3.4", "dev": true, "requires": {"ms": "2.1.2"}},
+               "ms": {"version": "2.1.2", "dev": true}
+             }}
+  }
+}
+"""
+
+YARN_CLASSIC = """# THIS IS AN AUTOGENERATED FILE. DO NOT EDIT THIS FILE DIRECTLY.
+# yarn lockfile v1
+
+
+"@babel/code-frame@^7.0.0", "@babel/code-frame@^7.22.13":
+  version "7.22.13"
+  resolved "https://registry.yarnpkg.com/@babel/code-frame/-/code-frame-7.22.13.tgz#abc"
+  integrity sha512-XktuhWlJ5g+3TJXc5upd9Ks1HutSArik6jf2eAjYFyIOf4ej3RN+184cZbzDvbPnuTJIUhPKKJE3cIsYTiAT3w==
+  dependencies:
+    "@babel/highlight" "^7.22.13"
+    chalk "^2.4.2"
+
+"@babel/highlight@^7.22.13":
+  version "7.22.20"
+  dependencies:
+    chalk "^2.4.2"
+
+chalk@^2.4.2:
+  version "2.4.2"
+  dependencies:
+    ansi-styles "^3.2.1"
+
+ansi-styles@^3.2.1:
+  version "3.2.1"
+"""
+
+YARN_BERRY = """# This file is generated by running "yarn install" inside your project.
+# Manual changes might be lost - proceed with caution!
+
+__metadata:
+  version: 6
+  cacheKey: 8
+
+"@types/node@npm:^20.0.0":
+  version: 20.8.0
+  resolution: "@types/node@npm:20.8.0"
+  checksum: 4a5b5d1b6d2c
+  languageName: node
+  linkType: hard
+
+"ansi-styles@npm:^3.2.1":
+  version: 3.2.1
+  resolution: "ansi-styles@npm:3.2.1"
+  languageName: node
+  linkType: hard
+
+"app@workspace:.":
+  version: 0.0.0-use.local
+  resolution: "app@workspace:."
+  dependencies:
+    "@types/node": ^20.0.0
+    chalk: ^2.4.2
+  languageName: unknown
+  linkType: soft
+
+"chalk@npm:^2.4.2":
+  version: 2.4.2
+  resolution: "chalk@npm:2.4.2"
+  dependencies:
+    ansi-styles: ^3.2.1
+  languageName: node
+  linkType: hard
+"""
+
+POETRY_LOCK = """# This file is automatically @generated by Poetry 1.7.0 and should not be changed by hand.
+
+[[package]]
+name = "requests"
+version = "2.31.0"
+description = "Python HTTP for Humans."
+optional = false
+python-versions = ">=3.7"
+files = [
+    {file = "requests-2.31.0-py3-none-any.whl", hash = "sha256:58cd2187c01e70e6e26505bca751777aa9f2ee0b7f4300988b709f44e013003f"},
+]
+
+[package.dependencies]
+certifi = ">=2017.4.17"
+charset-normalizer = ">=2,<4"
+urllib3 = {version = ">=1.21.1,<3", optional = true}
+
+[package.extras]
+socks = ["PySocks (>=1.5.6,!=1.5.7)"]
+
+[[package]]
+name = "certifi"
+version = "2023.7.22"
+optional = false
+
+[[package]]
+name = "charset_normalizer"
+version = "3.3.0"
+optional = false
+
+[[package]]
+name = "urllib3"
+version = "2.0.7"
+optional = false
+
+[metadata]
+lock-version = "2.0"
+python-versions = "^3.11"
+content-hash = "1c1e1f"
+"""
+
+PIPFILE_LOCK = """{
+    "_meta": {"hash": {"sha256": "4e1a"}, "pipfile-spec": 6, "requires": {"python_version": "3.11"},
+              "sources": [{"name": "pypi", "url": "https://pypi.org/simple", "verify_ssl": true}]},
+    "default": {
+        "flask": {"hashes": ["sha256:21128f47e4e3b9d597a3e8521a329bf56909b690fcc3fa3e477725aa81367638"],
+                  "index": "pypi", "version": "==3.0.0"},
+        "werkzeug": {"hashes": [], "markers": "python_version >= '3.8'", "version": "==3.0.1"},
+        "mylib": {"editable": true, "path": "."}
+    },
+    "develop": {
+        "pytest": {"hashes": [], "version": "==7.4.3"}
+    }
+}
+"""
+
+# parser, text, (nodes, edges, top level) with nodes as "name@version"
+SAMPLES = {
+    "package-lock v3": (parse_package_lock, PACKAGE_LOCK_V3, (
+        {"express@4.18.2", "debug@2.6.9", "ms@2.0.0", "qs@6.11.0", "lodash@4.17.21", "jest@29.7.0",
+         "debug@4.3.4", "ms@2.1.2", "react@18.2.0", "loose-envify@1.4.0"},
+        {("express@4.18.2", "debug@2.6.9"), ("express@4.18.2", "qs@6.11.0"), ("debug@2.6.9", "ms@2.0.0"),
+         ("jest@29.7.0", "debug@4.3.4"), ("debug@4.3.4", "ms@2.1.2"), ("react@18.2.0", "loose-envify@1.4.0")},
+        {"express@4.18.2", "lodash@4.17.21", "jest@29.7.0", "react@18.2.0"})),
+    "package-lock v1": (parse_package_lock, PACKAGE_LOCK_V1, (
+        {"express@4.18.2", "debug@2.6.9", "ms@2.0.0", "jest@29.7.0", "debug@4.3.4", "ms@2.1.2"},
+        {("express@4.18.2", "debug@2.6.9"), ("debug@2.6.9", "ms@2.0.0"),
+         ("jest@29.7.0", "debug@4.3.4"), ("debug@4.3.4", "ms@2.1.2")},
+        {"express@4.18.2", "jest@29.7.0"})),
+    "yarn classic": (parse_yarn_lock, YARN_CLASSIC, (
+        {"@babel/code-frame@7.22.13", "@babel/highlight@7.22.20", "chalk@2.4.2", "ansi-styles@3.2.1"},
+        {("@babel/code-frame@7.22.13", "@babel/highlight@7.22.20"), ("@babel/code-frame@7.22.13", "chalk@2.4.2"),
+         ("@babel/highlight@7.22.20", "chalk@2.4.2"), ("chalk@2.4.2", "ansi-styles@3.2.1")},
+        {"@babel/code-frame@7.22.13"})),
+    "yarn berry": (parse_yarn_lock, YARN_BERRY, (
+        {"@types/node@20.8.0", "ansi-styles@3.2.1", "chalk@2.4.2"},
+        {("chalk@2.4.2", "ansi-styles@3.2.1")},
+        {"@types/node@20.8.0", "chalk@2.4.2"})),
+    "poetry.lock": (parse_poetry_lock, POETRY_LOCK, (
+        {"requests@2.31.0", "certifi@2023.7.22", "charset_normalizer@3.3.0", "urllib3@2.0.7"},
+        {("requests@2.31.0", "certifi@2023.7.22"), ("requests@2.31.0", "charset_normalizer@3.3.0"),
+         ("requests@2.31.0", "urllib3@2.0.7")},
+        {"requests@2.31.0"})),
+    "Pipfile.lock": (parse_pipfile_lock, PIPFILE_LOCK, (
+        {"flask@3.0.0", "werkzeug@3.0.1", "pytest@7.4.3"},
+        set(),
+        {"flask@3.0.0", "werkzeug@3.0.1", "pytest@7.4.3"})),
+}
+JSON_SAMPLES = ("package-lock v3", "package-lock v1", "Pipfile.lock")
+
+
+def _chunks(text, size):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+def _named(graph):
+    name = lambda node: "@".join(graph.nodes[node])
+    return ({name(node) for node in range(len(graph.nodes))},
+            {(name(parent), name(child)) for parent, child in graph.edges},
+            {name(node) for node in graph.top_level()})
+
+
+def _exact(graph):
+    return graph.nodes, sorted(graph.edges), graph.top_level()
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_parse_whole_file(sample):
+    parser, text, expected = SAMPLES[sample]
+    assert _named(parser([text])) == expected
+
+
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_every_chunk_size_gives_the_same_graph(sample):
+    parser, text, _ = SAMPLES[sample]
+    whole = _exact(parser([text]))
+    for size in range(1, len(text) + 1):
+        assert _exact(parser(_chunks(text, size))) == whole, size
+
+
+@pytest.mark.parametrize("sample", JSON_SAMPLES)
+def test_truncated_json_lockfile_raises(sample):
+    parser, text, _ = SAMPLES[sample]
+    whole = _exact(parser([text]))
+    for end in range(len(text)):
+        try:
+            graph = parser(_chunks(text[:end], 7))
+        except ValueError:
+            continue
+        # Only a cut after everything the parser reads may succeed.
+        assert _exact(graph) == whole, end
+
+
+@pytest.mark.parametrize("sample", sorted(set(SAMPLES) - set(JSON_SAMPLES)))
+def test_truncated_text_lockfile_keeps_complete_entries(sample):
+    parser, text, _ = SAMPLES[sample]
+    nodes, edges, _ = _named(parser([text]))
+    for end in range(len(text)):
+        graph = parser(_chunks(text[:end], 7))
+        if end == 0 or text[end - 1] == "\n":
+            truncated_nodes, truncated_edges, _ = _named(graph)
+            assert truncated_nodes <= nodes and truncated_edges <= edges, end
+
+
+def test_json_stream_values_across_chunk_boundaries():
+    document = {"n": 1234567, "neg": -1.5e3, "s": "quote \" backslash \\ é \U0001f600",
+                "nested": {"a": [1, {"b": None}], "t": True}, "empty": {}, "last": 0}
+    text = json.dumps(document, ensure_ascii=False, indent=1)
+    for size in range(1, len(text) + 1):
+        stream = _JsonStream(_chunks(text, size))
+        decoded = {}
+        for key in stream.members():
+            if key == "nested":
+                decoded[key] = {inner: stream.value() for inner in stream.members()}
+            else:
+                decoded[key] = stream.value()
+        assert decoded == document, size
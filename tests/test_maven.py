@@ -0,0 +1,152 @@
+import pytest
+
+from ai_summarizer import _maven_version_key, _parse_pom_xml, _read_manifest
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent>
+    <groupId>org.example</groupId>
+    <artifactId>example-parent</artifactId>
+    <version>2.4.1</version>
+  </parent>
+  <artifactId>example-service</artifactId>
+  <properties>
+    <jackson.version>${jackson.base}.1</jackson.version>
+    <jackson.base>${jackson.major}.15</jackson.base>
+    <jackson.major>2</jackson.major>
+    <loop.a>${loop.b}</loop.a>
+    <loop.b>${loop.a}</loop.b>
+  </properties>
+  <dependencyManagement>
+    <dependencies>
+      <dependency>
+        <groupId>com.google.guava</groupId>
+        <artifactId>guava</artifactId>
+        <version>32.1.3-jre</version>
+      </dependency>
+      <dependency>
+        <groupId>org.slf4j</groupId>
+        <artifactId>slf4j-api</artifactId>
+        <version>2.0.9</version>
+      </dependency>
+    </dependencies>
+  </dependencyManagement>
+  <dependencies>
+    <dependency>
+      <groupId>com.fasterxml.jackson.core</groupId>
+      <artifactId>jackson-databind</artifactId>
+      <version>${jackson.version}</version>
+      <exclusions>
+        <exclusion>
+          <groupId>com.fasterxml.jackson.core</groupId>
+          <artifactId>jackson-annotations</artifactId>
+        </exclusion>
+      </exclusions>
+    </dependency>
+    <dependency>
+      <groupId>com.google.guava</groupId>
+      <artifactId>guava</artifactId>
+    </dependency>
+    <dependency>
+      <groupId>${project.groupId}</groupId>
+      <artifactId>example-common</artifactId>
+      <version>${project.version}</version>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>example-api</artifactId>
+      <version>${project.parent.version}</version>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>cycle</artifactId>
+      <version>${loop.a}</version>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>ranged</artifactId>
+      <version>[1.0,2.0)</version>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>from-bom</artifactId>
+    </dependency>
+  </dependencies>
+  <build>
+    <plugins>
+      <plugin>
+        <groupId>org.apache.maven.plugins</groupId>
+        <artifactId>maven-shade-plugin</artifactId>
+        <version>3.5.1</version>
+        <dependencies>
+          <dependency>
+            <groupId>org.ow2.asm</groupId>
+            <artifactId>asm</artifactId>
+            <version>9.6</version>
+          </dependency>
+        </dependencies>
+      </plugin>
+    </plugins>
+  </build>
+</project>
+"""
+
+EXPECTED = {
+    "com.fasterxml.jackson.core:jackson-databind": "2.15.1",
+    "com.google.guava:guava": "32.1.3-jre",
+    "org.example:example-common": "2.4.1",
+    "org.example:example-api": "2.4.1",
+    "org.example:cycle": "any",
+    "org.example:ranged": "any",
+    "org.example:from-bom": "any",
+}
+
+
+def _chunks(text, size):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(POM)])
+def test_pom_dependencies_at_every_chunk_size(size):
+    # Exclusions, plugin dependencies and unused dependencyManagement entries are not reported.
+    assert _parse_pom_xml(_chunks(POM, size)) == EXPECTED
+
+
+def test_pom_accepts_a_whole_string():
+    assert _parse_pom_xml(POM) == EXPECTED
+
+
+def test_module_overrides_parent_coordinates():
+    pom = POM.replace("<artifactId>example-service</artifactId>",
+                      "<groupId>org.other</groupId><artifactId>example-service</artifactId><version>3.0.0</version>")
+    deps = _parse_pom_xml(_chunks(pom, 13))
+    assert deps["org.other:example-common"] == "3.0.0"
+    assert deps["org.example:example-api"] == "2.4.1"
+
+
+def test_malformed_pom():
+    assert _parse_pom_xml(_chunks(POM[:len(POM) // 2], 64)) == {}
+    assert _parse_pom_xml(["<project><dependencies>", "</project>"]) == {}
+
+
+def test_pom_is_streamed_from_github(stub_url, github_calls):
+    manifest = _read_manifest("bench", "maven-stream", {"path": "pom.xml", "sha": "maven"}, "test-token")
+
+    assert manifest["ecosystem"] == "maven"
+    assert "error" not in manifest
+    assert manifest["dependencies"]
+    assert all(key.startswith("bench.maven:") and ver != "any" for key, ver in manifest["dependencies"].items())
+    assert github_calls() == 1
+
+
+def test_maven_version_key_ordering():
+    ordered = ["1.0-alpha1", "1.0-alpha2", "1.0-beta1", "1.0-M1", "1.0-rc1", "1.0-SNAPSHOT", "1.0",
+               "1.0-sp1", "1.0-zeta", "1.0.1", "1.1", "1.10", "2.0-rc1", "2.0"]
+    assert sorted(reversed(ordered), key=_maven_version_key) == ordered
+
+    for left, right in [("1", "1.0"), ("1.0", "1.0.0"), ("1.0-ga", "1.0"), ("1.0.RELEASE", "1.0-final"),
+                        ("1.0-rc1", "1-rc1"), ("1.0-a1", "1.0-alpha1"), ("1.0-CR1", "1.0-RC1")]:
+        assert _maven_version_key(left) == _maven_version_key(right), (left, right)
+
+    assert _maven_version_key("5.3.20.RELEASE") < _maven_version_key("5.3.21")
+    assert _maven_version_key("31.1-jre") < _maven_version_key("32.1.3-jre")
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import jobs
+from jobs import JobQueue
+from llm_cache import get_llm_cache
+from metrics import render
+from pipeline import analyses
+from rate_limiter import RateLimitScheduler
+
+
+def _sample(text, name):
+    """Value of the first sample line starting with `name`."""
+    for line in text.splitlines():
+        if line.startswith(name + " ") or line.startswith(name + "{"):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_coalescing_counters_are_exported():
+    before = analyses.stats()
+    release = threading.Event()
+    leader = threading.Thread(target=analyses.do, args=("metrics-key", release.wait))
+    leader.start()
+    while not analyses.stats()["in_flight"]:
+        time.sleep(0.01)
+    follower = threading.Thread(target=analyses.do, args=("metrics-key", lambda: None))
+    follower.start()
+    while analyses.stats()["followers"] == before["followers"]:
+        time.sleep(0.01)
+
+    text = render()
+    assert _sample(text, 'blink_analysis_in_flight') >= 1
+    release.set()
+    leader.join()
+    follower.join()
+
+    text = render()
+    assert _sample(text, 'blink_analysis_coalescing_total{role="leader"}') == before["leaders"] + 1
+    assert _sample(text, 'blink_analysis_coalescing_total{role="follower"}') == before["followers"] + 1
+
+
+def test_llm_cache_counters_are_exported():
+    cache = get_llm_cache()
+    cache.put("metrics-model", "cached prompt", "text")
+    cache.get("metrics-model", "cached prompt")
+    cache.get("metrics-model", "unknown prompt")
+    stats = cache.stats()
+
+    text = render()
+    assert _sample(text, 'blink_llm_cache_lookups_total{result="hit"}') == stats["hits"]
+    assert _sample(text, 'blink_llm_cache_lookups_total{result="miss"}') == stats["misses"]
+    assert _sample(text, "blink_llm_cache_entries") == stats["entries"] >= 1
+    assert _sample(text, "blink_llm_cache_bytes") == stats["bytes"]
+
+
+def test_scheduler_waits_are_observed():
+    before = _sample(render(), "blink_github_scheduler_wait_seconds_count") or 0
+    scheduler = RateLimitScheduler(max_wait=5)
+    scheduler._quota("metrics-token", "core").next_allowed = time.time() + 0.1
+
+    assert scheduler.acquire("metrics-token") == "metrics-token"
+    assert _sample(render(), "blink_github_scheduler_wait_seconds_count") == before + 1
+
+
+def test_job_queue_depth_is_exported(monkeypatch):
+    queue = JobQueue(workers=0, maxsize=5)
+    monkeypatch.setattr(jobs, "_job_queue", queue)
+    queue.submit("bench", "metrics-a", "test-token")
+    queue.submit("bench", "metrics-b", "test-token")
+
+    text = render()
+    assert _sample(text, "blink_job_queue_depth") == 2
+    assert _sample(text, "blink_jobs_running") == 0
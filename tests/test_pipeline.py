@@ -0,0 +1,60 @@
+import pipeline
+from pipeline import Stage, analysis_stages, run_stages
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+def test_optional_requirement_passes_none_when_it_fails():
+    # Declared before the stages it waits on, so readiness is re-checked after they settle.
+    stages = [
+        Stage("after", lambda base, broken, skipped: (base, broken, skipped),
+              requires=["base"], optional=["broken", "skipped"]),
+        Stage("needs_broken", lambda broken: broken, requires=["broken"]),
+        Stage("skipped", lambda needs_broken: needs_broken, requires=["needs_broken"]),
+        Stage("broken", _fail),
+        Stage("base", lambda: "ok"),
+    ]
+
+    results, report = run_stages(stages)
+
+    assert results["after"] == ("ok", None, None)
+    assert {name: info["status"] for name, info in report.items()} == {
+        "base": "ok", "broken": "error", "needs_broken": "skipped", "skipped": "skipped", "after": "ok"}
+
+
+def test_optional_requirement_passes_its_result():
+    stages = [Stage("a", lambda: 1), Stage("b", lambda a: a + 1, optional=["a"])]
+
+    assert run_stages(stages)[0]["b"] == 2
+
+
+def _combined_stages(monkeypatch, manifests):
+    monkeypatch.setattr(pipeline, "LLM_MODE", "combined")
+    monkeypatch.setattr(pipeline, "_scan", lambda owner, repo, token, backend=None: {"contents": [{"name": "app.py"}]})
+    monkeypatch.setattr(pipeline, "calculate_health_index", lambda scan: {"total_score": 1})
+    monkeypatch.setattr(pipeline, "scan_manifests", manifests)
+    monkeypatch.setattr(pipeline, "summarize_tech_stack_ai", lambda contents: f"standalone: {contents[0]['name']}")
+    monkeypatch.setattr(pipeline, "summarize_combined_ai",
+                        lambda deps, contents: {"tech_stack_summary": "combined", "dependency_summary": "deps"})
+    return analysis_stages("bench", "pipeline", "test-token")
+
+
+def test_combined_mode_summarizes_tech_stack_alone_when_dependencies_fail(monkeypatch):
+    def broken(owner, repo, token):
+        raise RuntimeError("tree listing failed")
+
+    results, report = run_stages(_combined_stages(monkeypatch, broken))
+
+    assert results["tech_stack"] == "standalone: app.py"
+    assert report["tech_stack"]["status"] == "ok"
+    assert report["ai_summaries"]["status"] == "skipped"
+    assert report["dependency_summary"]["status"] == "skipped"
+
+
+def test_combined_mode_uses_one_call_when_dependencies_succeed(monkeypatch):
+    results, _ = run_stages(_combined_stages(monkeypatch, lambda owner, repo, token: {"manifests": {}, "truncated": False}))
+
+    assert results["tech_stack"] == "combined"
+    assert results["dependency_summary"] == "deps"
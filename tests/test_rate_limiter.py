@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+import github_client
+import rate_limiter
+from github_client import GITHUB_API, github_get
+from metrics import render
+from rate_limiter import RateLimitScheduler
+from response_cache import token_scope
+
+
+class _Response:
+    def __init__(self, remaining, reset, status_code=200):
+        self.status_code = status_code
+        self.headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": str(remaining),
+                        "X-RateLimit-Reset": str(reset), "X-RateLimit-Resource": "core"}
+
+
+def _drain(scheduler, token):
+    scheduler.update(token, _Response(0, time.time() + 3600, status_code=403))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = RateLimitScheduler(pool=["pool-token"], max_wait=0.2)
+    monkeypatch.setattr(github_client, "scheduler", scheduler)
+    monkeypatch.setattr(rate_limiter, "scheduler", scheduler)
+    return scheduler
+
+
+def test_pool_tokens_only_when_allowed(scheduler):
+    _drain(scheduler, "user-token")
+
+    assert scheduler.acquire("user-token") is None
+    assert scheduler.acquire("user-token", use_pool=True) == "pool-token"
+
+
+def test_dry_token_only_borrows_pool_for_public_repos(scheduler):
+    _drain(scheduler, "dry-token")
+    # Never seen: the caller's own (dry) token is the only candidate.
+    assert github_get(f"{GITHUB_API}/repos/bench/pool-public/commits", "dry-token")[0] == 429
+
+    assert github_get(f"{GITHUB_API}/repos/bench/pool-public", "other-token")[0] == 200
+    assert github_get(f"{GITHUB_API}/repos/bench/pool-public/commits", "dry-token")[0] == 200
+
+    assert github_get(f"{GITHUB_API}/repos/bench/private-repo", "other-token")[1]["private"] is True
+    assert github_get(f"{GITHUB_API}/repos/bench/private-repo/commits", "dry-token")[0] == 429
+
+
+def test_expired_caller_quotas_are_forgotten(scheduler):
+    now = time.time()
+    scheduler.update("pool-token", _Response(4000, now - 10))
+    scheduler.update("active-user", _Response(4000, now + 3600))
+    scheduler._pruned = 0
+    scheduler.update("expired-user", _Response(4000, now - 10))
+
+    tracked = {q["token"] for q in scheduler.stats()["tokens"]}
+    assert tracked == {token_scope("pool-token"), token_scope("active-user")}
+
+
+def test_metrics_export_pool_tokens_only(scheduler):
+    now = time.time()
+    scheduler.update("pool-token", _Response(4000, now + 3600))
+    scheduler.update("user-token", _Response(4000, now + 3600))
+
+    text = render()
+    assert token_scope("pool-token") in text
+    assert token_scope("user-token") not in text
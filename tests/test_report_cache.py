@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+import pytest
+
+import ops
+import report_cache
+from app import create_app
+from report_cache import ReportCache, report_key
+from scan_store import ScanStore
+
+
+def _report(score):
+    return {"raw_data": {"metadata": {"private": False}}, "health_report": {"total_score": score},
+            "stages": {"scan": {"status": "ok"}}}
+
+
+@pytest.fixture
+def store():
+    return ScanStore(path=os.path.join(tempfile.mkdtemp(prefix="blink-report-cache-"), "scans.sqlite3"))
+
+
+def test_invalidation_reaches_other_workers(store):
+    worker_a, worker_b = ReportCache(store=store), ReportCache(store=store)
+    key = report_key("bench", "shared")
+    worker_a.put(key, "scope", _report(1))
+    assert worker_b.get(key, "scope")[0]["health_report"]["total_score"] == 1
+
+    assert worker_a.invalidate("bench", "shared") == 1
+
+    assert worker_b.get(key, "scope") is None
+    assert worker_b.stats()["miss"] == 1
+
+
+def test_newer_report_from_another_worker_replaces_memory_copy(store):
+    worker_a, worker_b = ReportCache(store=store), ReportCache(store=store)
+    key = report_key("bench", "replaced")
+    worker_b.put(key, "scope", _report(1))
+    worker_a.put(key, "scope", _report(2))
+
+    assert worker_b.get(key, "scope")[0]["health_report"]["total_score"] == 2
+    assert worker_b.stats()["disk"] == 1
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def test_invalidate_endpoint_is_disabled_without_ops_token(client, monkeypatch):
+    monkeypatch.setattr(ops, "OPS_TOKEN", "")
+
+    assert client.delete("/report-cache/bench/x").status_code == 403
+
+
+def test_invalidate_endpoint_requires_ops_token(client, monkeypatch, store):
+    monkeypatch.setattr(ops, "OPS_TOKEN", "s3cret")
+    cache = ReportCache(store=store)
+    monkeypatch.setattr(report_cache, "_cache", cache)
+    cache.put(report_key("bench", "guarded"), "scope", _report(1))
+
+    assert client.delete("/report-cache/bench/guarded").status_code == 401
+    assert client.delete("/report-cache/bench/guarded", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.delete("/report-cache/bench/guarded", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.get_json() == {"invalidated": 1}
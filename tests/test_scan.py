@@ -0,0 +1,82 @@
+import repo_explorer
+from repo_explorer import SCAN_BACKEND, deep_scan_repo, fetch_history
+from response_cache import token_scope
+from scan_store import get_scan_store
+
+TOKEN = "test-token"
+
+
+def test_full_scan_samples_history_pages(github_calls):
+    info = deep_scan_repo("bench", "scan-full", TOKEN, incremental=False)
+
+    # metadata, pulls, branches, community profile, contents + four history listings
+    assert github_calls() == 9
+    assert [c["login"] for c in info["contributors"]] == [f"dev{i}" for i in range(5)]
+    assert len(info["commits"]) == 5 and info["commits"][0]["message"] == "Commit 0"
+    assert len(info["issues"]) == 5 and info["issues"][0]["user"] == "dev"
+    assert [r["tag_name"] for r in info["releases"]] == ["v1.0", "v1.1", "v1.2"]
+    assert info["activity"]["commits"]["commits"] == 5
+    assert info["activity"]["failed"] == []
+
+
+def test_unchanged_rescan_pages_only_issues_and_releases(github_calls):
+    first = deep_scan_repo("bench", "scan-rescan", TOKEN, incremental=True)
+    calls = github_calls()
+    second = deep_scan_repo("bench", "scan-rescan", TOKEN, incremental=True)
+
+    # metadata, pulls, issue history, release history
+    assert github_calls() - calls == 4
+    # Same day, same window: the commit and contributor aggregates are still current.
+    assert second["activity"]["since"] == first["activity"]["since"]
+    assert second["activity"]["commits"] == first["activity"]["commits"]
+    assert second["activity"]["contributors"] == first["activity"]["contributors"]
+
+
+def test_rescan_pages_all_history_once_the_stored_window_is_stale(github_calls):
+    deep_scan_repo("bench", "scan-stale", TOKEN, incremental=True)
+    store = get_scan_store()
+    key = f"bench/scan-stale|{SCAN_BACKEND}|{token_scope(TOKEN)}"
+    stored, _ = store.get("scans", key)
+    activity = stored["info"]["activity"]
+    activity["since"] = "2000-01-01T00:00:00+00:00"
+    activity["commits"] = dict(activity["commits"], active_authors_90d=99, active_week_pct=99)
+    activity["contributors"] = dict(activity["contributors"], contributors=99)
+    store.put("scans", key, stored)
+
+    calls = github_calls()
+    info = deep_scan_repo("bench", "scan-stale", TOKEN, incremental=True)
+
+    # metadata, pulls + all four history listings
+    assert github_calls() - calls == 6
+    fresh = deep_scan_repo("bench", "scan-stale", TOKEN, incremental=False)
+    assert info["activity"] == fresh["activity"]
+    assert info["activity"]["commits"]["active_authors_90d"] != 99
+
+
+def test_commit_sample_falls_back_outside_history_window(monkeypatch, github_calls):
+    activity = {"commits": {"commits": 0}}
+    monkeypatch.setattr(repo_explorer, "collect_history",
+                        lambda owner, repo, token, listings, previous: (activity, {"commits": [], "releases": None}))
+
+    sections = fetch_history("bench", "scan-dormant", TOKEN)
+
+    assert github_calls() == 1
+    assert sections["activity"] is activity
+    assert len(sections["commits"]) == 5
+    assert sections["releases"] == []
+
+
+def test_scan_aggregates_paged_history_and_samples_the_first_page():
+    info = deep_scan_repo("bench", "paged-scan", TOKEN, incremental=False)
+
+    assert info["activity"]["contributors"]["contributors"] == 15
+    assert info["activity"]["issues"]["open_issues"] == 15
+    assert [c["login"] for c in info["contributors"]] == [f"dev{i}" for i in range(5)]
+    assert [r["tag_name"] for r in info["releases"]] == ["v1.0", "v1.1", "v1.2"]
+
+
+def test_scan_reports_failed_history_pages():
+    info = deep_scan_repo("bench", "paged-broken-scan", TOKEN, incremental=False)
+
+    assert info["activity"]["failed"] == ["commits", "contributors", "issues", "releases"]
+    assert len(info["contributors"]) == 5
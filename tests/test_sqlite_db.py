@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+import pytest
+
+from llm_cache import LLMCache
+from response_cache import ResponseCache
+from sqlite_db import SQLiteDB
+
+
+def _path(name):
+    return os.path.join(tempfile.mkdtemp(prefix="blink-sqlite-"), name)
+
+
+def test_transaction_rolls_back_on_error():
+    db = SQLiteDB(_path("db.sqlite3"), "CREATE TABLE items (key TEXT PRIMARY KEY)")
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items VALUES ('lost')")
+            raise RuntimeError
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO items VALUES ('kept')")
+
+    assert db.fetchall("SELECT key FROM items") == [("kept",)]
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(path=_path("responses.sqlite3"), max_bytes=30)
+    for key in ("a", "b", "c"):
+        cache.put(key, f"etag-{key}", None, b"x" * 10)
+    cache.get("a")
+    cache.put("d", "etag-d", None, b"x" * 10)
+
+    assert [key for key in "abcd" if cache.get(key)] == ["a", "c", "d"]
+
+
+def test_llm_cache_evicts_by_size_and_age():
+    cache = LLMCache(path=_path("llm.sqlite3"), max_bytes=20, ttl=3600)
+    cache.put("model", "one", "x" * 10)
+    cache.put("model", "two", "x" * 10)
+    cache.get("model", "one")
+    cache.put("model", "three", "x" * 10)
+
+    assert [p for p in ("one", "two", "three") if cache.get("model", p)] == ["one", "three"]
+    assert cache.stats()["bytes"] == 20
+
+    expired = LLMCache(path=_path("llm.sqlite3"), max_bytes=100, ttl=-1)
+    expired.put("model", "old", "text")
+    assert expired.get("model", "old") is None
@@ -1,6 +1,30 @@
 import { useState } from 'react'
 import './App.css'
 
+// Parse a text/event-stream body, calling onEvent(name, data) per event.
+async function readReportStream(response, onEvent) {
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const chunk = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      let event = 'message'
+      let data = ''
+      for (const line of chunk.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7)
+        else if (line.startsWith('data: ')) data += line.slice(6)
+      }
+      onEvent(event, data ? JSON.parse(data) : null)
+    }
+  }
+}
+
 function App() {
   const [owner, setOwner] = useState('')
   const [repo, setRepo] = useState('')
@@ -26,6 +50,26 @@ function App() {
     setChatAnswer(data.answer || data.error);
   };
 
+  const applyReportEvent = (event, data) => {
+    if (event === 'error' || (event === 'stage_error' && data.stage === 'scan')) {
+      throw new Error(data.error || 'Analysis failed')
+    }
+    setResults(prev => {
+      const next = { ...(prev || {}) }
+      if (event === 'raw_data') next.raw_data = data
+      if (event === 'health_report') next.health_report = data
+      if (event === 'tech_stack_summary') next.tech_stack_summary = data
+      if (event === 'dependency_report.dependencies') {
+        next.dependency_report = { ...next.dependency_report, dependencies: data }
+      }
+      if (event === 'ai_summary') {
+        next.dependency_report = { ...next.dependency_report, ai_summary: data }
+      }
+      if (event === 'done') next.stages = data.stages
+      return next
+    })
+  }
+
   const analyzeRepo = async () => {
     if (!owner || !repo || !githubToken) {
       setError('Please fill in all fields')
@@ -36,8 +80,8 @@ function App() {
     setError(null)
 
     try {
-      // Call your Python backend API
-      const response = await fetch('http://localhost:5000/analyze', {
+      // Call your Python backend API; report sections stream in as Server-Sent Events
+      const response = await fetch('http://localhost:5000/analyze?stream=1', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -53,9 +97,9 @@ function App() {
         throw new Error('Analysis failed')
       }
 
-      const data = await response.json()
-      setResults(data)
+      await readReportStream(response, applyReportEvent)
     } catch (err) {
+      setResults(null)
       setError(err.message)
     } finally {
       setLoading(false)